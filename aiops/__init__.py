@@ -0,0 +1,30 @@
+"""Headless AIOps core: parsing, matching, analysis, notification and the registry
+
+Nothing heavy is imported until it is used, so the monitoring service, the
+ingest API and the Streamlit pages can all share this package cheaply.
+"""
+import importlib
+
+_EXPORTS = {
+    "LogAnalyzer": "aiops.analyzer",
+    "ArchiveWriter": "aiops.archive",
+    "read_events": "aiops.archive",
+    "LogSearchIndex": "aiops.search",
+    "IncidentCorrelator": "aiops.correlation",
+    "ApplicationMonitor": "aiops.application_monitor",
+    "EmailNotifier": "aiops.notifier",
+    "LiveLogMonitor": "aiops.live",
+    "MonitoringService": "aiops.service",
+    "PatternMatcher": "aiops.matcher",
+    "parse_line": "aiops.parser",
+    "load_apps": "aiops.registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'aiops' has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
@@ -0,0 +1,89 @@
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+# Hourly buckets kept per scope, older hours are folded away
+HOURS_KEPT = 168
+
+
+class _Counters:
+    """Counters of one scope (a single app or all apps)"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_severity = Counter()
+        self.by_category = Counter()
+        self.by_hour = OrderedDict()
+        self.last_issue = None
+        self.auto_resolved = 0
+
+    def record(self, severity, category, hour, issue, count=1):
+        self.total += count
+        self.by_severity[severity] += count
+        if category:
+            self.by_category[category] += count
+        if hour in self.by_hour:
+            self.by_hour[hour] += count
+        else:
+            self.by_hour[hour] = count
+            while len(self.by_hour) > HOURS_KEPT:
+                self.by_hour.popitem(last=False)
+        if issue is not None:
+            self.last_issue = issue
+
+    def snapshot(self):
+        return {
+            "total": self.total,
+            "by_severity": dict(self.by_severity),
+            "by_category": dict(self.by_category),
+            "by_hour": dict(self.by_hour),
+            "last_issue": self.last_issue,
+            "auto_resolved": self.auto_resolved
+        }
+
+
+class LogAggregates:
+    """Global and per-app counters maintained as logs are ingested
+
+    Every update touches a constant number of counters, and snapshots copy
+    bounded dicts, so dashboards read overview metrics without scanning apps
+    or log history.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._global = _Counters()
+        self._apps = defaultdict(_Counters)
+        self._active = set()
+
+    def register_app(self, app_id):
+        with self._lock:
+            self._apps[app_id]
+
+    def set_active(self, app_id, active):
+        with self._lock:
+            if active:
+                self._active.add(app_id)
+            else:
+                self._active.discard(app_id)
+
+    def record(self, app_id, severity, category=None, timestamp=None, issue=None, count=1):
+        """Count ``count`` analyzed logs; ``issue`` becomes the latest issue if given"""
+        hour = timestamp[:13] if timestamp else None
+        with self._lock:
+            self._global.record(severity, category, hour, issue, count)
+            self._apps[app_id].record(severity, category, hour, issue, count)
+
+    def record_auto_resolution(self, app_id):
+        with self._lock:
+            self._global.auto_resolved += 1
+            self._apps[app_id].auto_resolved += 1
+
+    def snapshot(self, app_id=None):
+        """Return the current totals of one app, or of all apps"""
+        with self._lock:
+            if app_id is not None:
+                return self._apps[app_id].snapshot()
+            snapshot = self._global.snapshot()
+            snapshot["total_apps"] = len(self._apps)
+            snapshot["active_apps"] = len(self._active)
+            return snapshot
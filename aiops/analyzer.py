@@ -0,0 +1,122 @@
+import logging
+from datetime import datetime
+from aiops.config import GROQ_API_KEY, SIMILARITY_REUSE
+from aiops.rules import resolution_steps
+from aiops.similarity import SimilarAnalysisIndex
+from aiops.tables import shared_tables
+
+AI_ANALYSIS_FAILED = "AI analysis failed"
+
+
+class LogAnalyzer:
+    def __init__(self, tables=None):
+        self.api_key = GROQ_API_KEY
+        self.tables = tables or shared_tables()  # known error patterns, reloaded when their file changes
+        self.similar = SimilarAnalysisIndex() if SIMILARITY_REUSE else None
+
+    @property
+    def error_patterns(self):
+        """The known error patterns and their solutions currently in force"""
+        return self.tables.current.error_patterns
+
+    def classify(self, log_entry, tables=None):
+        """Classify a log entry against the known patterns, without AI analysis
+
+        ``tables`` pins a version of the pattern tables, by default the
+        current one is used.
+        """
+        match = (tables or self.tables.current).error_matcher.match(log_entry)
+        if match:
+            pattern, _, info = match
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "pattern_match": pattern,
+                "severity": info["severity"],
+                "category": info["category"],
+                "automated_actions": info["automated_actions"]
+            }
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "pattern_match": None,
+            "severity": "UNKNOWN",
+            "category": "UNKNOWN",
+            "automated_actions": []
+        }
+
+    def analyze_log(self, log_entry, tables=None):
+        """Analyze a log entry using AI and pattern matching"""
+        try:
+            # First check against known patterns, then get AI analysis either way
+            analysis = self.classify(log_entry, tables)
+            analysis["ai_analysis"] = self.get_ai_analysis(log_entry, analysis["category"])
+            return analysis
+        except Exception as e:
+            logging.error(f"Error analyzing log: {str(e)}")
+            return None
+
+    def get_ai_analysis(self, log_entry, category=None):
+        """Reuse the analysis of a similar past line of the same level and category, or ask the AI"""
+        if not self.similar:
+            return self._get_ai_analysis(log_entry)
+        vector = self.similar.embed(log_entry)
+        partition = self.similar.partition(log_entry, category)
+        match = self.similar.lookup(vector, partition)
+        if match:
+            return match[0]
+        analysis = self._get_ai_analysis(log_entry)
+        # Failures are retried next time rather than reused
+        if analysis != AI_ANALYSIS_FAILED:
+            self.similar.add(vector, analysis, partition)
+        return analysis
+
+    def _get_ai_analysis(self, log_entry):
+        """Get AI analysis using Groq API"""
+        prompt = f"""
+        Analyze this log entry and provide:
+        1. The type of issue (ERROR/WARNING/INFO)
+        2. Root cause analysis
+        3. Recommended automated actions
+        4. Priority level
+        5. Potential impact
+
+        Log entry: {log_entry}
+        """
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": "llama3-70b-8192",
+            "messages": [
+                {"role": "system", "content": "You are an expert log analysis AI assistant."},
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+        try:
+            import requests
+
+            response = requests.post(
+                "https://api.groq.com/openai/v1/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                return response.json()["choices"][0]["message"]["content"]
+            else:
+                logging.error(f"AI API Error: {response.status_code}")
+                return AI_ANALYSIS_FAILED
+        except Exception as e:
+            logging.error(f"Error in AI analysis: {str(e)}")
+            return AI_ANALYSIS_FAILED
+
+    def get_resolution_steps(self, analysis_result):
+        """Generate resolution steps based on analysis"""
+        if not analysis_result:
+            return []
+            
+        return resolution_steps(analysis_result.get("automated_actions", []))
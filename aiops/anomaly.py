@@ -0,0 +1,210 @@
+import threading
+from aiops.config import (
+    ANOMALY_BUCKET_SECONDS, ANOMALY_ALPHA, ANOMALY_SEASON_ALPHA, ANOMALY_THRESHOLD,
+    ANOMALY_MIN_COUNT, ANOMALY_WARMUP_BUCKETS, ANOMALY_MAX_TEMPLATES
+)
+
+# Seasonal baselines are kept per hour of day
+SEASON_SLOTS = 24
+SEASON_SECONDS = 86400 // SEASON_SLOTS
+# Seasonal slots need this many days of history before they replace the level baseline
+SEASON_WARMUP = 3
+# Longest silence replayed bucket by bucket, later buckets are skipped
+MAX_GAP_BUCKETS = 120
+
+# Template index 0 counts every line of an app, so a silent app is a drop
+ALL_LINES = "<all lines>"
+OTHER_TEMPLATES = "<other templates>"
+
+
+class _AppRates:
+    """Rate baselines of every template of one app, one array slot per template"""
+
+    def __init__(self, bucket):
+        import numpy as np
+
+        self.bucket = bucket
+        self.index = {ALL_LINES: 0}
+        self.templates = [ALL_LINES]
+        self.counts = np.zeros(16)
+        self.mean = np.zeros(16)
+        self.var = np.zeros(16)
+        self.age = np.zeros(16, dtype=np.int64)
+        self.season_mean = np.zeros((16, SEASON_SLOTS))
+        self.season_var = np.zeros((16, SEASON_SLOTS))
+        self.season_age = np.zeros((16, SEASON_SLOTS), dtype=np.int64)
+        self.flagged = np.zeros(16, dtype=bool)
+        self.shed = False  # lines were dropped unanalyzed in the current bucket
+
+    def slot(self, name):
+        """Return the array slot of a template, adding it if there is room"""
+        index = self.index.get(name)
+        if index is None:
+            if len(self.templates) >= ANOMALY_MAX_TEMPLATES and name != OTHER_TEMPLATES:
+                return self.slot(OTHER_TEMPLATES)
+            index = len(self.templates)
+            if index == len(self.counts):
+                self._grow()
+            self.index[name] = index
+            self.templates.append(name)
+        return index
+
+    def _grow(self):
+        import numpy as np
+
+        for attr in ("counts", "mean", "var", "age", "season_mean", "season_var", "season_age", "flagged"):
+            array = getattr(self, attr)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, attr, grown)
+
+    def close_bucket(self, bucket_seconds):
+        """Score the finished bucket against the baselines, then fold it in
+
+        Returns (template, kind, count, expected, score) for every template
+        that just turned anomalous. All templates are updated at once.
+        """
+        import numpy as np
+
+        n = len(self.templates)
+        x = self.counts[:n]
+        slot = (self.bucket * bucket_seconds // SEASON_SECONDS) % SEASON_SLOTS
+        # A slot sees this many buckets a day, its weights are spread over them
+        per_day = max(1, SEASON_SECONDS // bucket_seconds)
+        season_alpha = 1 - (1 - ANOMALY_SEASON_ALPHA) ** (1 / per_day)
+        seasonal = self.season_age[:n, slot] >= SEASON_WARMUP * per_day
+        expected = np.where(seasonal, self.season_mean[:n, slot], self.mean[:n])
+        spread = np.where(seasonal, self.season_var[:n, slot], self.var[:n])
+        # Counts are compared on the Anscombe (square root) scale where Poisson
+        # noise has unit variance, widened when the template is burstier than that
+        dispersion = np.sqrt(np.maximum(1.0, spread / np.maximum(expected, 1.0)))
+        root = np.sqrt(expected + 0.375)
+        score = 2 * (np.sqrt(x + 0.375) - root) / dispersion
+
+        warm = self.age[:n] >= ANOMALY_WARMUP_BUCKETS
+        # When lines were shed the template counts are short, only the total is scored and learned
+        frozen = np.zeros(n, dtype=bool)
+        frozen[1:] = self.shed
+        saved = [(array, array[:n].copy()) for array in (
+            self.mean, self.var, self.age, self.season_mean, self.season_var, self.season_age, self.flagged
+        )] if self.shed else []
+        spike = warm & (score > ANOMALY_THRESHOLD) & (x >= ANOMALY_MIN_COUNT)
+        drop = warm & ~frozen & (score < -ANOMALY_THRESHOLD) & (expected >= ANOMALY_MIN_COUNT)
+        anomalous = spike | drop
+        new = np.flatnonzero(anomalous & ~self.flagged[:n])
+        self.flagged[:n] = anomalous
+        found = [
+            (self.templates[i], "spike" if spike[i] else "drop", int(x[i]), float(expected[i]), float(score[i]))
+            for i in new
+        ]
+
+        # Anomalous buckets are clipped to the threshold before the means learn
+        # them and never widen the variances, so a storm or an outage only
+        # becomes the new normal once it persists
+        bound = ANOMALY_THRESHOLD * dispersion / 2
+        low = np.maximum(0.0, root - bound) ** 2 - 0.375
+        x = np.where(anomalous, np.clip(x, low, (root + bound) ** 2 - 0.375), x)
+        delta = x - self.mean[:n]
+        self.mean[:n] += ANOMALY_ALPHA * delta
+        self.var[:n] = np.where(anomalous, self.var[:n],
+                                (1 - ANOMALY_ALPHA) * (self.var[:n] + ANOMALY_ALPHA * delta * delta))
+        self.age[:n] += 1
+        delta = x - self.season_mean[:n, slot]
+        # The first value seen in a slot seeds it instead of being averaged with zero
+        first = self.season_age[:n, slot] == 0
+        self.season_mean[:n, slot] = np.where(first, x, self.season_mean[:n, slot] + season_alpha * delta)
+        self.season_var[:n, slot] = np.where(
+            first, self.var[:n],
+            np.where(anomalous, self.season_var[:n, slot],
+                     (1 - season_alpha) * (self.season_var[:n, slot] + season_alpha * delta * delta))
+        )
+        self.season_age[:n, slot] += 1
+        for array, before in saved:
+            array[1:n] = before[1:]
+        self.counts[:n] = 0
+        self.shed = False
+        self.bucket += 1
+        return found
+
+
+class RateAnomalyDetector:
+    """Flag spikes and drops in per-app, per-template log rates
+
+    Each event only bumps a counter; when a time bucket ends every template of
+    the app is scored against its EWMA baseline (or its hour-of-day baseline
+    once that has enough history) in one vectorized step, so the cost per
+    event stays O(1) however many templates an app has. A template is
+    reported once when it turns anomalous and again only after recovering.
+    """
+
+    def __init__(self, bucket_seconds=ANOMALY_BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._apps = {}
+
+    def observe(self, app_id, template, timestamp, count=1):
+        """Count ``count`` events at a unix timestamp, returning anomalies of buckets they closed
+
+        Events of template ALL_LINES only count towards the app's total rate.
+        """
+        bucket = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            rates = self._apps.get(app_id)
+            if rates is None:
+                rates = self._apps[app_id] = _AppRates(bucket)
+            anomalies = self._advance(app_id, rates, bucket)
+            index = rates.slot(template)
+            rates.counts[0] += count
+            if index:
+                rates.counts[index] += count
+        return anomalies
+
+    def shed(self, app_id, timestamp, count):
+        """Count lines dropped unanalyzed at a unix timestamp, returning anomalies of buckets they closed
+
+        They count towards the app's total rate; the templates of their
+        bucket are neither scored for drops nor learned from.
+        """
+        anomalies = self.observe(app_id, ALL_LINES, timestamp, count)
+        with self._lock:
+            self._apps[app_id].shed = True
+        return anomalies
+
+    def tick(self, timestamp, app_ids=None):
+        """Close the elapsed buckets of every app (or of ``app_ids``), so silent apps are scored too"""
+        bucket = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            return [anomaly for app_id, rates in self._apps.items()
+                    if app_ids is None or app_id in app_ids
+                    for anomaly in self._advance(app_id, rates, bucket)]
+
+    def _advance(self, app_id, rates, bucket):
+        anomalies = []
+        if bucket - rates.bucket > MAX_GAP_BUCKETS:
+            rates.bucket = bucket - MAX_GAP_BUCKETS
+        while rates.bucket < bucket:
+            start = rates.bucket * self.bucket_seconds
+            for template, kind, count, expected, score in rates.close_bucket(self.bucket_seconds):
+                anomalies.append({
+                    "app_id": app_id,
+                    "template": template,
+                    "kind": kind,
+                    "count": count,
+                    "expected": round(expected, 1),
+                    "score": round(score, 1),
+                    "bucket_start": start
+                })
+        return anomalies
+
+
+def describe(anomaly):
+    """Return a one-line description of an anomaly for alerts"""
+    subject = "All log lines" if anomaly["template"] == ALL_LINES else f'"{anomaly["template"]}"'
+    direction = "spiked to" if anomaly["kind"] == "spike" else "dropped to"
+    return (f"{subject} {direction} {anomaly['count']} per bucket "
+            f"(expected {anomaly['expected']}, score {anomaly['score']})")
+
+
+def alert_severity(anomaly):
+    """An app going silent is HIGH, any other rate anomaly MEDIUM"""
+    return "HIGH" if anomaly["template"] == ALL_LINES and anomaly["kind"] == "drop" else "MEDIUM"
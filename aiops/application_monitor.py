@@ -0,0 +1,146 @@
+from collections import deque
+from datetime import datetime
+from aiops.aggregates import LogAggregates
+from aiops.log_index import LogIndex
+from aiops.tables import shared_tables
+
+
+def _analysis_severity(log_data):
+    return log_data["analysis"]["severity"]
+
+
+class ApplicationMonitor:
+    def __init__(self, tables=None):
+        self.applications = {}
+        self.recent_issues = deque(maxlen=50)  # (app_id, log_data) of HIGH severity logs
+        self.aggregates = LogAggregates()
+        self.tables = tables or shared_tables()  # log patterns, reloaded when their file changes
+
+    @property
+    def log_patterns(self):
+        """The pattern categories currently in force"""
+        return self.tables.current.app_log_patterns
+        
+    def register_application(self, app_data):
+        """Register a new application for monitoring"""
+        app_id = f"app_{len(self.applications) + 1}"
+        self.applications[app_id] = {
+            "basic_info": {
+                "name": app_data["name"],
+                "url": app_data["url"],
+                "environment": app_data["environment"],
+                "registration_date": app_data["registration_date"],
+                "status": app_data["status"]
+            },
+            "client_info": app_data["client"],
+            "technical_info": app_data["technical"],
+            "monitoring_config": app_data["monitoring"],
+            "notes": app_data["notes"],
+            "logs": LogIndex(severity_key=_analysis_severity),
+            "metrics": {
+                "uptime": 100.0,
+                "response_time": 0,
+                "error_rate": 0.0,
+                "last_check": datetime.now().isoformat()
+            }
+        }
+        self.aggregates.register_app(app_id)
+        return app_id
+
+    def generate_ai_analysis(self, log_entry, app_id):
+        """Generate AI analysis for a log entry with application context"""
+        app_info = self.applications[app_id]
+        
+        # Enhanced AI analysis based on application context
+        analysis = {
+            "severity": "HIGH" if "error" in log_entry.lower() else "MEDIUM",
+            "analysis": "AI analysis of the log entry",
+            "recommended_actions": ["action1", "action2"],
+            "impact": {
+                "uptime": "High" if "error" in log_entry.lower() else "Low",
+                "performance": "High" if "slow" in log_entry.lower() else "Low",
+                "security": "High" if "security" in log_entry.lower() else "Low"
+            }
+        }
+        
+        # Add SLA compliance check
+        if "error" in log_entry.lower():
+            analysis["sla_compliance"] = "At Risk"
+        else:
+            analysis["sla_compliance"] = "Compliant"
+            
+        return analysis
+
+    def process_log(self, app_id, log_entry):
+        """Process and analyze a log entry with enhanced context"""
+        if app_id not in self.applications:
+            return None
+
+        # Add timestamp and enhanced analysis
+        log_data = {
+            "timestamp": datetime.now().isoformat(),
+            "entry": log_entry,
+            "analysis": self.generate_ai_analysis(log_entry, app_id)
+        }
+
+        # Check for known patterns with application context
+        match = self.tables.current.app_matcher.match(log_entry)
+        if match:
+            category, _, pattern_data = match
+            log_data["category"] = category
+            log_data["severity"] = pattern_data["severity"]
+            log_data["auto_fix"] = pattern_data["auto_fix"]
+
+        # Update application metrics
+        self.update_metrics(app_id, log_data)
+        
+        self.applications[app_id]["logs"].append(log_data)
+        severity = log_data["analysis"]["severity"]
+        if severity == "HIGH":
+            self.recent_issues.append((app_id, log_data))
+        self.aggregates.record(app_id, severity, log_data.get("category"), log_data["timestamp"],
+                               issue=(app_id, log_data) if severity == "HIGH" else None)
+        return log_data
+
+    def update_metrics(self, app_id, log_data):
+        """Update application metrics based on log analysis"""
+        app = self.applications[app_id]
+        
+        # Update error rate
+        if log_data["analysis"]["severity"] == "HIGH":
+            app["metrics"]["error_rate"] = min(100.0, app["metrics"]["error_rate"] + 0.1)
+        
+        # Update uptime
+        if log_data["analysis"]["severity"] == "HIGH":
+            app["metrics"]["uptime"] = max(0.0, app["metrics"]["uptime"] - 0.1)
+            
+        # Update last check time
+        app["metrics"]["last_check"] = datetime.now().isoformat()
+
+    def get_application_status(self, app_id):
+        """Get current status of an application with enhanced metrics"""
+        if app_id not in self.applications:
+            return None
+            
+        app = self.applications[app_id]
+        return {
+            "basic_info": app["basic_info"],
+            "metrics": app["metrics"],
+            "last_log": app["logs"][-1] if app["logs"] else None,
+            "sla_compliance": self.check_sla_compliance(app_id)
+        }
+        
+    def check_sla_compliance(self, app_id):
+        """Check if application is meeting SLA requirements"""
+        app = self.applications[app_id]
+        metrics = app["metrics"]
+        requirements = app["monitoring_config"]["sla"]
+        
+        compliance = {
+            "uptime": metrics["uptime"] >= requirements["uptime"],
+            "response_time": metrics["response_time"] <= requirements["response_time"],
+            "overall": True
+        }
+        
+        compliance["overall"] = all(compliance.values())
+        return compliance
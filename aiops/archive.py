@@ -0,0 +1,213 @@
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time as dtime
+from aiops.config import ARCHIVE_DIR, ARCHIVE_FLUSH_ROWS, ARCHIVE_FLUSH_SECONDS, ARCHIVE_COMPRESSION
+
+# Columns stored in every file, app and date are encoded in the partition path
+ARCHIVE_COLUMNS = ["timestamp", "severity", "category", "pattern_match", "message",
+                   "automated_actions", "analysis"]
+PARTITION_COLUMNS = ["app", "date"]
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("timestamp", pa.timestamp("us")),
+        ("severity", pa.string()),
+        ("category", pa.string()),
+        ("pattern_match", pa.string()),
+        ("message", pa.string()),
+        ("automated_actions", pa.list_(pa.string())),
+        ("analysis", pa.string()),
+    ])
+
+
+def _partition_schema():
+    import pyarrow as pa
+
+    return pa.schema([("app", pa.string()), ("date", pa.string())])
+
+
+def partition_name(app_id):
+    """Return the directory-safe form of an app id used in partition paths"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(app_id))
+
+
+def _to_datetime(value):
+    """Return a naive local datetime for an event timestamp"""
+    if isinstance(value, datetime):
+        timestamp = value
+    else:
+        try:
+            timestamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            return datetime.now()
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+class ArchiveWriter:
+    """Buffer analyzed events and flush them as compressed Parquet files
+
+    Files are laid out as ``<root>/app=<app>/date=<YYYY-MM-DD>/part-*.parquet``
+    so readers can skip whole apps and days without opening them. Events are
+    buffered per partition and written once ``flush_rows`` are pending or
+    ``flush_interval`` seconds have passed; every flush writes new files, so
+    several processes can share one archive.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR, flush_rows=ARCHIVE_FLUSH_ROWS,
+                 flush_interval=ARCHIVE_FLUSH_SECONDS, compression=ARCHIVE_COMPRESSION):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._buffer = defaultdict(list)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def append(self, app_id, event):
+        """Buffer one event, a dict keyed by ARCHIVE_COLUMNS"""
+        timestamp = _to_datetime(event.get("timestamp"))
+        row = {
+            "timestamp": timestamp,
+            "severity": event.get("severity"),
+            "category": event.get("category"),
+            "pattern_match": event.get("pattern_match"),
+            "message": event.get("message"),
+            "automated_actions": list(event.get("automated_actions") or []),
+            "analysis": event.get("analysis"),
+        }
+        with self._lock:
+            self._buffer[(partition_name(app_id), timestamp.date().isoformat())].append(row)
+            self._pending += 1
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush when enough rows are pending or the flush interval has passed"""
+        with self._lock:
+            due = self._pending and (self._pending >= self.flush_rows
+                                     or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write every buffered event, returning the number of rows written"""
+        with self._lock:
+            batch, self._buffer = self._buffer, defaultdict(list)
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        written = 0
+        for (app, day), rows in batch.items():
+            try:
+                self._write(app, day, rows)
+                written += len(rows)
+            except Exception as e:
+                logging.error(f"Error archiving {len(rows)} events for {app}: {str(e)}")
+                # Keep the rows so the next flush retries them
+                with self._lock:
+                    self._buffer[(app, day)][:0] = rows
+                    self._pending += len(rows)
+        return written
+
+    def _write(self, app, day, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = os.path.join(self.root, f"app={app}", f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        table = pa.Table.from_pylist(rows, schema=_schema())
+        pq.write_table(table, path + ".tmp", compression=self.compression)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """Flush what is left before shutting down"""
+        self.flush()
+
+
+def archived_apps(root=ARCHIVE_DIR):
+    """Return the apps that have archived events"""
+    try:
+        entries = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    return sorted(entry[len("app="):] for entry in entries if entry.startswith("app="))
+
+
+def _as_bounds(start, end):
+    """Return (start, end) as datetimes, a bare end date includes that whole day"""
+    if isinstance(start, date) and not isinstance(start, datetime):
+        start = datetime.combine(start, dtime.min)
+    if isinstance(end, date) and not isinstance(end, datetime):
+        end = datetime.combine(end, dtime.max)
+    return start, end
+
+
+def _partition_files(root, app_ids, start, end):
+    """Yield the Parquet files of the partitions overlapping the query"""
+    apps = archived_apps(root) if app_ids is None else [partition_name(a) for a in app_ids]
+    for app in apps:
+        app_dir = os.path.join(root, f"app={app}")
+        try:
+            days = os.listdir(app_dir)
+        except FileNotFoundError:
+            continue
+        for entry in days:
+            if not entry.startswith("date="):
+                continue
+            try:
+                day = date.fromisoformat(entry[len("date="):])
+            except ValueError:
+                continue
+            if (start and day < start.date()) or (end and day > end.date()):
+                continue
+            day_dir = os.path.join(app_dir, entry)
+            for name in os.listdir(day_dir):
+                if name.endswith(".parquet"):
+                    yield os.path.join(day_dir, name)
+
+
+def read_events(app_ids=None, start=None, end=None, severities=None, columns=None, root=ARCHIVE_DIR):
+    """Read archived events as a DataFrame sorted by time
+
+    Only the partitions of ``app_ids`` between ``start`` and ``end`` are
+    opened and only ``columns`` are decoded, e.g. the HIGH events of one app
+    over the last week touch seven small files and never load messages the
+    caller didn't ask for.
+    """
+    import pyarrow.dataset as ds
+
+    start, end = _as_bounds(start, end)
+    columns = list(columns or ARCHIVE_COLUMNS + PARTITION_COLUMNS)
+    if "timestamp" not in columns:
+        columns.append("timestamp")
+    files = list(_partition_files(root, app_ids, start, end))
+    if not files:
+        import pandas as pd
+
+        return pd.DataFrame(columns=columns)
+
+    partitions = _partition_schema()
+    dataset = ds.dataset(files, schema=_schema().append(partitions.field("app")).append(partitions.field("date")),
+                         format="parquet", partitioning=ds.partitioning(partitions, flavor="hive"),
+                         partition_base_dir=root)
+    condition = None
+    for clause in (
+        ds.field("timestamp") >= start if start else None,
+        ds.field("timestamp") <= end if end else None,
+        ds.field("severity").isin(list(severities)) if severities else None,
+    ):
+        if clause is not None:
+            condition = clause if condition is None else condition & clause
+    table = dataset.to_table(columns=columns, filter=condition)
+    return table.to_pandas().sort_values("timestamp", ignore_index=True)
@@ -0,0 +1,261 @@
+import mmap
+import os
+import time
+from collections import Counter, deque
+from datetime import datetime
+from aiops.config import BACKFILL_WORKERS, BACKFILL_CHUNK_MB, CORRELATION_WINDOW
+from aiops.parser import LEVELS, parse_level, parse_message, parse_timestamp, template
+from aiops.segments import is_compressed, open_segment
+
+# Distinct messages whose templates a worker remembers
+TEMPLATE_CACHE_SIZE = 100000
+
+# Tables of the backfill in each worker process, built once by _init_worker
+_tables = None
+
+
+def chunk_ranges(path, chunk_bytes=BACKFILL_CHUNK_MB * 1024 * 1024):
+    """Split a file into (start, end) byte ranges that each end on a line boundary"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                newline = mm.find(b"\n", end - 1)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _init_worker(error_patterns, app_log_patterns, remediation_rules):
+    """Compile the tables once per worker process"""
+    from aiops.tables import Tables
+
+    global _tables
+    _tables = Tables(error_patterns, app_log_patterns, remediation_rules)
+
+
+def _most_severe(a, b):
+    if a is None or b is None:
+        return a or b
+    return a if LEVELS.index(a) <= LEVELS.index(b) else b
+
+
+def _unix_time(text):
+    try:
+        return datetime.fromisoformat(text.replace(",", ".").replace(" ", "T")).timestamp()
+    except ValueError:
+        return None
+
+
+def scan_chunk(path, start, end, window=CORRELATION_WINDOW):
+    """Analyze the lines of one byte range of a file
+
+    Returns the line counts per level, template, matched error pattern and
+    remediation rule, plus the incidents of the range as [first, last,
+    events] spans per incident key, split where a key stays quiet longer than
+    ``window`` seconds. Templates are cached per distinct message and
+    classification, which only looks at a line's level and template, per
+    (level, template), so most lines only cost the prefix regexes and a few
+    dict lookups.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8", "replace")
+    return scan_lines(text.splitlines(), window)
+
+
+def scan_lines(lines, window=CORRELATION_WINDOW):
+    """Analyze a sequence of log lines, see scan_chunk"""
+    tables = _tables
+    levels, templates, patterns, rules = Counter(), Counter(), Counter(), Counter()
+    incidents = {}
+    messages = {}
+    decisions = {}
+    timestamp = None
+    for line in lines:
+        if not line.strip():
+            continue
+        message = parse_message(line)
+        cached = messages.get(message)
+        if cached is None:
+            if len(messages) >= TEMPLATE_CACHE_SIZE:
+                messages.clear()
+            cached = messages[message] = (template(message), parse_level(message))
+        log_template, message_level = cached
+        # Only the short prefix is searched for a level, the message's is cached
+        prefix = line[:line.find(message)] if message else line
+        level = _most_severe(parse_level(prefix), message_level) or "INFO"
+        levels[level] += 1
+        templates[log_template] += 1
+
+        key = (level, log_template)
+        decided = decisions.get(key)
+        if decided is None:
+            match = tables.error_matcher.match(log_template)
+            category = match[2]["category"] if match else None
+            decision = tables.rules.evaluate(level, log_template, category)
+            incident_key = None
+            if decision:
+                # Known problems are one incident whatever their wording, others go by template
+                incident_key = decision["rule"] if decision["auto_resolve"] else f"{decision['rule']}: {log_template}"
+            decided = decisions[key] = (match[0] if match else None, decision["rule"] if decision else None,
+                                        incident_key)
+        pattern, rule, incident_key = decided
+        if pattern:
+            patterns[pattern] += 1
+        if rule is None:
+            continue
+        rules[rule] += 1
+
+        # Lines without a timestamp take the previous one
+        stamp = parse_timestamp(prefix)
+        if stamp:
+            timestamp = _unix_time(stamp) or timestamp
+        if timestamp is None:
+            continue
+        spans = incidents.setdefault(incident_key, [])
+        if spans and timestamp - spans[-1][1] <= window:
+            spans[-1][1] = max(spans[-1][1], timestamp)
+            spans[-1][2] += 1
+        else:
+            spans.append([timestamp, timestamp, 1])
+    return {
+        "lines": sum(levels.values()),
+        "levels": levels,
+        "templates": templates,
+        "patterns": patterns,
+        "rules": rules,
+        "incidents": incidents
+    }
+
+
+def merge_results(results, window=CORRELATION_WINDOW):
+    """Merge per-chunk results, given in file order, into one
+
+    Incident spans of one key are joined across chunk boundaries when the
+    gap between them is at most ``window`` seconds.
+    """
+    merged = {"lines": 0, "levels": Counter(), "templates": Counter(), "patterns": Counter(),
+              "rules": Counter(), "incidents": {}}
+    for result in results:
+        merged["lines"] += result["lines"]
+        for field in ("levels", "templates", "patterns", "rules"):
+            merged[field].update(result[field])
+        for key, spans in result["incidents"].items():
+            joined = merged["incidents"].setdefault(key, [])
+            for first, last, events in spans:
+                if joined and first - joined[-1][1] <= window:
+                    joined[-1][1] = max(joined[-1][1], last)
+                    joined[-1][2] += events
+                else:
+                    joined.append([first, last, events])
+    return merged
+
+
+def compressed_chunks(path, chunk_bytes=BACKFILL_CHUNK_MB * 1024 * 1024):
+    """Yield newline-aligned blocks of about ``chunk_bytes`` of a compressed segment, decompressed"""
+    with open_segment(path) as f:
+        pending = b""
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = pending + data
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            if cut:
+                yield data[:cut]
+        if pending:
+            yield pending
+
+
+def scan_task(task, window=CORRELATION_WINDOW):
+    """Scan a (path, start, end) range of a plain file or a decompressed block of lines"""
+    if isinstance(task, bytes):
+        return scan_lines(task.decode("utf-8", "replace").splitlines(), window)
+    return scan_chunk(*task, window)
+
+
+def _tasks(paths, chunk_bytes):
+    for path in paths:
+        if is_compressed(path):
+            # Compressed segments cannot be mapped, they are decompressed as a stream here
+            yield from compressed_chunks(path, chunk_bytes)
+        else:
+            for start, end in chunk_ranges(path, chunk_bytes):
+                yield path, start, end
+
+
+def backfill(paths, tables=None, workers=BACKFILL_WORKERS, chunk_bytes=BACKFILL_CHUNK_MB * 1024 * 1024,
+             window=CORRELATION_WINDOW, top=20):
+    """Analyze existing log files in parallel and return one report
+
+    ``paths`` is a file or a list of files in the order they were written,
+    such as a log's rotated segments followed by the live file. Plain files
+    are memory-mapped and split into newline-aligned chunks, gzip and zstd
+    segments are decompressed as a stream into blocks; a process pool scans
+    them with the same compiled tables, so the interpreter is not the
+    bottleneck on multi-GB files, and results are merged in file order at
+    the end. ``tables`` defaults to the current shared pattern and rule
+    tables.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    if tables is None:
+        from aiops.tables import shared_tables
+
+        tables = shared_tables().current
+    table_args = (tables.error_patterns, tables.app_log_patterns, tables.remediation_rules)
+    started = time.perf_counter()
+    size = sum(os.path.getsize(path) for path in paths)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and not any(map(is_compressed, paths)):
+        workers = min(workers, sum(len(chunk_ranges(path, chunk_bytes)) for path in paths)) or 1
+
+    results = []
+    if workers == 1:
+        _init_worker(*table_args)
+        results = [scan_task(task, window) for task in _tasks(paths, chunk_bytes)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=table_args) as pool:
+            # A few tasks per worker in flight, so decompressed blocks do not pile up in memory
+            pending = deque()
+            for task in _tasks(paths, chunk_bytes):
+                pending.append(pool.submit(scan_task, task, window))
+                if len(pending) >= 2 * workers:
+                    results.append(pending.popleft().result())
+            results.extend(future.result() for future in pending)
+    merged = merge_results(results, window)
+    elapsed = time.perf_counter() - started
+    return report(merged, size, elapsed, workers, len(results), top)
+
+
+def report(merged, size, elapsed, workers, chunks, top=20):
+    """Summarize merged backfill results"""
+    incidents = sorted(
+        ({"key": key, "first_seen": datetime.fromtimestamp(first).isoformat(),
+          "last_seen": datetime.fromtimestamp(last).isoformat(), "events": events}
+         for key, spans in merged["incidents"].items() for first, last, events in spans),
+        key=lambda incident: incident["first_seen"]
+    )
+    return {
+        "lines": merged["lines"],
+        "bytes": size,
+        "chunks": chunks,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "mb_per_second": round(size / elapsed / 1e6, 1) if elapsed else None,
+        "by_level": dict(merged["levels"]),
+        "templates": len(merged["templates"]),
+        "top_templates": [{"template": t, "count": c} for t, c in merged["templates"].most_common(top)],
+        "patterns": dict(merged["patterns"]),
+        "rules": dict(merged["rules"]),
+        "incidents": incidents
+    }
@@ -0,0 +1,114 @@
+import logging
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# API Keys and Credentials
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
+EMAIL_USERNAME = os.getenv("EMAIL_USERNAME")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+
+# Application Settings
+LOG_CHECK_INTERVAL = int(os.getenv("LOG_CHECK_INTERVAL", "60"))  # seconds
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+ALERT_THRESHOLD = int(os.getenv("ALERT_THRESHOLD", "5"))  # number of errors before alerting
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))  # fraction of each app's interval
+MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", "4"))  # concurrent app polls
+MAX_FETCH_PAGES = int(os.getenv("MAX_FETCH_PAGES", "100"))  # pages followed per poll
+STREAM_LOGS = os.getenv("STREAM_LOGS", "true").lower() == "true"  # decode fetched logs incrementally
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))  # logs handed to the analyzer at once
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # worker processes, 0 means one per core
+SHARD_REPORT_INTERVAL = int(os.getenv("SHARD_REPORT_INTERVAL", "5"))  # seconds between metric merges
+REGISTRY_POLL_INTERVAL = int(os.getenv("REGISTRY_POLL_INTERVAL", "10"))  # seconds between registry checks
+LIVE_BUFFER_SIZE = int(os.getenv("LIVE_BUFFER_SIZE", "10000"))  # lines kept for live readers
+LIVE_STREAM_LINES = int(os.getenv("LIVE_STREAM_LINES", "200"))  # lines shown in the live stream view
+LIVE_REFRESH_SECONDS = float(os.getenv("LIVE_REFRESH_SECONDS", "2"))  # live stream refresh period
+LANE_MAX_LAG = int(os.getenv("LANE_MAX_LAG", "5000"))  # lines waiting for analysis before shedding starts
+LANE_SAMPLE_EVERY = int(os.getenv("LANE_SAMPLE_EVERY", "10"))  # one in N lines kept from a sampled lane
+LANE_BATCH_SIZE = int(os.getenv("LANE_BATCH_SIZE", "500"))  # lines analyzed between intake rounds
+SKETCH_BUCKET_SECONDS = int(os.getenv("SKETCH_BUCKET_SECONDS", "3600"))  # time bucket of template sketches
+SKETCH_BUCKETS_KEPT = int(os.getenv("SKETCH_BUCKETS_KEPT", "25"))  # sketch buckets kept per app, a day and an hour
+SKETCH_WIDTH = int(os.getenv("SKETCH_WIDTH", "512"))  # count-min counters per row
+SKETCH_DEPTH = int(os.getenv("SKETCH_DEPTH", "4"))  # count-min rows
+SKETCH_HLL_PRECISION = int(os.getenv("SKETCH_HLL_PRECISION", "10"))  # HyperLogLog registers are 2^p bytes
+SKETCH_TOP_TEMPLATES = int(os.getenv("SKETCH_TOP_TEMPLATES", "20"))  # frequent templates listed per bucket
+SUMMARY_REPORTS = os.getenv("SUMMARY_REPORTS", "daily,weekly")  # summaries emailed to clients, empty for none
+SUMMARY_TOP_K = int(os.getenv("SUMMARY_TOP_K", "50"))  # error templates tracked per app and day
+SUMMARY_TOP_ISSUES = int(os.getenv("SUMMARY_TOP_ISSUES", "5"))  # top issues listed in a summary
+SUMMARY_DAYS_KEPT = int(os.getenv("SUMMARY_DAYS_KEPT", "8"))  # daily rollups kept per app
+SUMMARY_CHECK_SECONDS = int(os.getenv("SUMMARY_CHECK_SECONDS", "60"))  # how often ended periods are looked for
+JOURNAL_LINES = os.getenv("JOURNAL_LINES", "true").lower() == "true"  # queue tailed lines durably until analyzed
+JOURNAL_SEGMENT_MB = int(os.getenv("JOURNAL_SEGMENT_MB", "64"))  # size of a line journal segment file
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))  # pushed batches waiting for analysis
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))  # threads analyzing pushed batches
+INGEST_MAX_BYTES = int(os.getenv("INGEST_MAX_BYTES", str(16 * 1024 * 1024)))  # pushed batch limit, sent and decompressed
+INGEST_RETRY_AFTER = int(os.getenv("INGEST_RETRY_AFTER", "1"))  # seconds clients back off when saturated
+PROMETHEUS_APP_LABEL = os.getenv("PROMETHEUS_APP_LABEL", "job")  # label identifying an app's series
+PROMETHEUS_BATCH_SIZE = int(os.getenv("PROMETHEUS_BATCH_SIZE", "200"))  # apps per batched query
+ARCHIVE_EVENTS = os.getenv("ARCHIVE_EVENTS", "true").lower() == "true"  # keep analyzed events on disk
+ARCHIVE_FLUSH_ROWS = int(os.getenv("ARCHIVE_FLUSH_ROWS", "5000"))  # buffered events per flush
+ARCHIVE_FLUSH_SECONDS = int(os.getenv("ARCHIVE_FLUSH_SECONDS", "300"))  # longest an event stays buffered
+ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "zstd")  # Parquet codec
+SEARCH_INDEX = os.getenv("SEARCH_INDEX", "true").lower() == "true"  # full-text index analyzed logs
+SEARCH_RETENTION_DAYS = int(os.getenv("SEARCH_RETENTION_DAYS", "31"))  # days of logs kept searchable
+SEARCH_API_TOKEN = os.getenv("SEARCH_API_TOKEN")  # bearer token required by /search, local clients only when unset
+ANOMALY_DETECTION = os.getenv("ANOMALY_DETECTION", "true").lower() == "true"  # alert on log rate anomalies
+ANOMALY_BUCKET_SECONDS = int(os.getenv("ANOMALY_BUCKET_SECONDS", "60"))  # rate measurement window
+ANOMALY_ALPHA = float(os.getenv("ANOMALY_ALPHA", "0.1"))  # EWMA weight of the latest bucket
+ANOMALY_SEASON_ALPHA = float(os.getenv("ANOMALY_SEASON_ALPHA", "0.3"))  # weight of the latest day per hour slot
+ANOMALY_THRESHOLD = float(os.getenv("ANOMALY_THRESHOLD", "4"))  # deviations from the baseline to alert at
+ANOMALY_MIN_COUNT = int(os.getenv("ANOMALY_MIN_COUNT", "5"))  # lines per bucket below which rates are noise
+ANOMALY_WARMUP_BUCKETS = int(os.getenv("ANOMALY_WARMUP_BUCKETS", "30"))  # buckets observed before alerting
+ANOMALY_MAX_TEMPLATES = int(os.getenv("ANOMALY_MAX_TEMPLATES", "1000"))  # tracked templates per app
+CORRELATE_INCIDENTS = os.getenv("CORRELATE_INCIDENTS", "true").lower() == "true"  # one analysis per incident
+CORRELATION_WINDOW = int(os.getenv("CORRELATION_WINDOW", "300"))  # quiet seconds that close an incident
+CORRELATION_MAX_SECONDS = int(os.getenv("CORRELATION_MAX_SECONDS", "3600"))  # incidents reopen after this long
+SIMILARITY_REUSE = os.getenv("SIMILARITY_REUSE", "true").lower() == "true"  # reuse analyses of similar lines
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.85"))  # cosine similarity needed for reuse
+SIMILARITY_CAPACITY = int(os.getenv("SIMILARITY_CAPACITY", "5000"))  # past analyses kept
+SIMILARITY_DIMENSIONS = int(os.getenv("SIMILARITY_DIMENSIONS", "1024"))  # hashed embedding size
+TABLES_HOT_RELOAD = os.getenv("TABLES_HOT_RELOAD", "true").lower() == "true"  # watch pattern and rule files
+TABLES_POLL_SECONDS = float(os.getenv("TABLES_POLL_SECONDS", "2"))  # how often table files are checked
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "0"))  # backfill processes, 0 means one per core
+BACKFILL_CHUNK_MB = int(os.getenv("BACKFILL_CHUNK_MB", "64"))  # file slice scanned per backfill task
+REMEDIATION_COOLDOWN = int(os.getenv("REMEDIATION_COOLDOWN", "300"))  # seconds an app's action is not repeated
+REMEDIATION_FAILURE_THRESHOLD = int(os.getenv("REMEDIATION_FAILURE_THRESHOLD", "3"))  # failures opening a breaker
+REMEDIATION_BREAKER_SECONDS = int(os.getenv("REMEDIATION_BREAKER_SECONDS", "900"))  # how long a breaker stays open
+
+# File Paths
+CONFIG_PATH = "registered_apps.json"
+LOG_DIR = "logs"
+CURSOR_DIR = f"{LOG_DIR}/fetch_cursors"
+TAIL_CURSOR_DIR = f"{LOG_DIR}/tail_cursors"
+JOURNAL_DIR = f"{LOG_DIR}/journal"
+ARCHIVE_DIR = f"{LOG_DIR}/archive"
+SEARCH_DB_PATH = f"{LOG_DIR}/search.db"
+# Pattern and rule tables committed with the code, not resolved against the working directory
+TABLES_DIR = os.getenv("TABLES_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tables"))
+
+
+def ensure_log_dir():
+    """Create the logs directory if it doesn't exist"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+
+def setup_logging(filename=None, console=False):
+    """Configure process-wide logging, called by entry points only"""
+    handlers = []
+    if filename:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handlers.append(logging.FileHandler(filename))
+    if console or not handlers:
+        handlers.append(logging.StreamHandler())
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+ 
\ No newline at end of file
@@ -0,0 +1,109 @@
+import itertools
+import threading
+from collections import Counter
+from aiops.config import CORRELATION_WINDOW, CORRELATION_MAX_SECONDS
+from aiops.registry import get_databases
+
+# Analysis categories caused by a dependency, and the registry field listing it
+DEPENDENCY_CATEGORIES = {"Database": "Databases"}
+
+
+def correlation_keys(app, category, template):
+    """Return the keys an event is correlated on
+
+    Errors in a dependency's category are keyed by every instance of that
+    dependency the app uses (per environment), so apps sharing a database
+    land in one incident whatever they log; any other event is keyed by its
+    template.
+    """
+    if DEPENDENCY_CATEGORIES.get(category) == "Databases":
+        environment = app.get("Environment", "")
+        keys = [("Databases", environment, database) for database in get_databases(app)]
+        if keys:
+            return keys
+    return [("template", template)]
+
+
+class Incident:
+    """Events correlated into one incident, analyzed and remediated once"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, keys, timestamp, event):
+        self.id = next(self._ids)
+        self.keys = set(keys)
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.event = event  # the first event, which gets analyzed
+        self.apps = Counter()
+        self.events = 0
+        self.analysis = None
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "keys": sorted(map(list, self.keys)),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "events": self.events,
+            "apps": dict(self.apps)
+        }
+
+
+class IncidentCorrelator:
+    """Cluster events into incidents over sliding time windows
+
+    An event joins the open incident sharing one of its keys if that
+    incident saw an event less than ``window`` seconds before; otherwise it
+    opens a new one. Incidents are also cut after ``max_duration`` so a
+    never-ending storm is re-reported periodically. Lookups are per key, so
+    each event costs O(keys).
+    """
+
+    def __init__(self, window=CORRELATION_WINDOW, max_duration=CORRELATION_MAX_SECONDS):
+        self.window = window
+        self.max_duration = max_duration
+        self._lock = threading.Lock()
+        self._open = {}
+        self._closed = []
+
+    def add(self, app_id, keys, timestamp, event):
+        """Correlate an event, returning (incident, is_new)"""
+        with self._lock:
+            incident = None
+            for key in keys:
+                candidate = self._open.get(key)
+                if candidate is None:
+                    continue
+                if self._expired(candidate, timestamp):
+                    self._close(candidate)
+                elif incident is None:
+                    incident = candidate
+            is_new = incident is None
+            if is_new:
+                incident = Incident(keys, timestamp, event)
+            incident.keys.update(keys)
+            for key in keys:
+                self._open[key] = incident
+            incident.last_seen = max(incident.last_seen, timestamp)
+            incident.apps[app_id] += 1
+            incident.events += 1
+            return incident, is_new
+
+    def expire(self, now):
+        """Close every incident that has gone quiet, returning all closed since the last call"""
+        with self._lock:
+            for incident in {id(i): i for i in self._open.values()}.values():
+                if self._expired(incident, now):
+                    self._close(incident)
+            closed, self._closed = self._closed, []
+            return closed
+
+    def _expired(self, incident, now):
+        return now - incident.last_seen > self.window or now - incident.first_seen > self.max_duration
+
+    def _close(self, incident):
+        for key in incident.keys:
+            if self._open.get(key) is incident:
+                del self._open[key]
+        self._closed.append(incident)
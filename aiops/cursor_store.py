@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+import re
+import threading
+
+
+class CursorStore:
+    """Persist per-app high-watermark fetch cursors between runs
+
+    A cursor is a small dict holding the highest sequence id (``after``) and/or
+    timestamp (``since``) seen for an app, plus the keys of the entries sitting
+    exactly on the watermark so they can be dropped when the source returns
+    them again. New cursors are staged while a batch is processed and only
+    committed once it is done, so a crash re-fetches instead of losing logs.
+    Each app's cursor is its own file, so committing is O(1) and several
+    processes can share the directory.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._staged = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, app_id):
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]", "_", app_id) + ".json")
+
+    def get(self, app_id):
+        """Return the committed cursor of an app"""
+        try:
+            with open(self._path(app_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"Error loading fetch cursor for {app_id}: {str(e)}")
+            return {}
+
+    def stage(self, app_id, cursor):
+        """Remember a cursor to commit once its logs are processed"""
+        with self._lock:
+            self._staged[app_id] = cursor
+
+    def commit(self, app_id):
+        """Persist the staged cursor of an app"""
+        with self._lock:
+            cursor = self._staged.pop(app_id, None)
+        if cursor is None:
+            return
+        path = self._path(app_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(cursor, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.error(f"Error saving fetch cursor for {app_id}: {str(e)}")
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import queue
+import threading
+import zlib
+from aiops.config import CONFIG_PATH, INGEST_QUEUE_SIZE, INGEST_WORKERS, INGEST_MAX_BYTES
+from aiops.log_stream import envelope_entries, iter_ndjson
+from aiops.registry import load_apps, get_app_id, get_app_name, is_push_app
+
+
+class BatchTooLarge(ValueError):
+    """Raised when a pushed batch is sent or decompresses beyond INGEST_MAX_BYTES"""
+
+
+class PushRegistry:
+    """Registered push apps by id, reloaded when the registry file changes"""
+
+    def __init__(self, path=CONFIG_PATH):
+        self.path = path
+        self._mtime = None
+        self._apps = {}
+        self._lock = threading.Lock()
+
+    def _reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self._apps = {get_app_id(app): app for app in load_apps(self.path) if is_push_app(app)}
+            self._mtime = mtime
+
+    def get(self, app_id):
+        """Return the registered push app with this id, or None"""
+        with self._lock:
+            self._reload()
+            return self._apps.get(app_id)
+
+    def apps(self):
+        """Return every registered push app"""
+        with self._lock:
+            self._reload()
+            return list(self._apps.values())
+
+
+class IngestPipeline:
+    """Bounded hand-off between the HTTP endpoint and the analysis workers"""
+
+    def __init__(self, process, workers=INGEST_WORKERS, maxsize=INGEST_QUEUE_SIZE):
+        self.process = process
+        self.workers = workers
+        self.batches = queue.Queue(maxsize=maxsize)
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"ingest-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self.batches.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, app, events):
+        """Queue a batch for analysis, returning False when saturated"""
+        try:
+            self.batches.put_nowait((app, events))
+            return True
+        except queue.Full:
+            return False
+
+    def _work(self):
+        while True:
+            item = self.batches.get()
+            if item is None:
+                return
+            app, events = item
+            try:
+                self.process(app, events)
+            except Exception as e:
+                logging.error(f"Error analyzing pushed logs for {get_app_name(app)}: {str(e)}")
+
+
+async def read_body(chunks, content_length=None, limit=INGEST_MAX_BYTES):
+    """Read a request body from an async iterator of chunks, refusing more than ``limit`` bytes
+
+    A declared Content-Length over the limit is refused before reading;
+    chunked bodies are refused as soon as they pass it.
+    """
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise BatchTooLarge("Batch too large")
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > limit:
+            raise BatchTooLarge("Batch too large")
+    return bytes(body)
+
+
+def decode_batch(body, content_encoding, content_type):
+    """Decompress and decode a pushed batch into log events"""
+    if "gzip" in content_encoding.lower():
+        # Bound the decompressed size so a small body cannot expand without limit
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body = decompressor.decompress(body, INGEST_MAX_BYTES + 1)
+        if len(body) > INGEST_MAX_BYTES or decompressor.unconsumed_tail:
+            raise BatchTooLarge("Decompressed batch too large")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return list(iter_ndjson(body.splitlines()))
+    try:
+        return list(envelope_entries(json.loads(body)))
+    except (json.JSONDecodeError, AttributeError):
+        raise ValueError("Body must be a JSON array, envelope or NDJSON")
@@ -0,0 +1,172 @@
+import bisect
+import json
+import logging
+import os
+import threading
+from aiops.config import JOURNAL_SEGMENT_MB
+
+# Bytes read from the journal per call
+READ_BYTES = 1024 * 1024
+
+
+class LineJournal:
+    """Durable append-only queue of the lines waiting for analysis
+
+    Lines are appended, newline-terminated, to segment files named after
+    the journal offset they start at, so an offset is a byte position across
+    every segment. ``append`` only writes; ``sync`` makes everything written
+    so far durable with one fsync shared by every caller waiting on it
+    (group commit), and readers only see synced lines. The analyzer
+    acknowledges the offset everything before which has been handled; a
+    restart resumes reading there, so a crash re-analyzes lines instead of
+    losing them, and segments entirely before it are deleted.
+    """
+
+    def __init__(self, directory, segment_bytes=JOURNAL_SEGMENT_MB * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._cond = threading.Condition()
+        self._syncing = False
+        os.makedirs(directory, exist_ok=True)
+        self._bases = sorted(int(name[:-4]) for name in os.listdir(directory)
+                             if name.endswith(".log") and name[:-4].isdigit()) or [0]
+        self._file = open(self._path(self._bases[-1]), "ab")
+        self._recover()
+        self._written = self._bases[-1] + self._file.tell()
+        self._durable = self._written
+        self.acked = max(self._load_ack(), self._bases[0])
+
+    def _path(self, base):
+        return os.path.join(self.directory, f"{base:020d}.log")
+
+    def _recover(self):
+        """Cut a line torn by a crash off the end of the last segment"""
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        with open(self._path(self._bases[-1]), "rb") as f:
+            f.seek(max(0, size - READ_BYTES))
+            tail = f.read()
+        keep = size - len(tail) + tail.rfind(b"\n") + 1 if b"\n" in tail else max(0, size - len(tail))
+        if keep < size:
+            logging.warning(f"Dropping {size - keep} bytes of a torn line from the journal in {self.directory}")
+            self._file.truncate(keep)
+            self._file.seek(keep)
+
+    def _load_ack(self):
+        try:
+            with open(os.path.join(self.directory, "ack.json"), 'r') as f:
+                return json.load(f)["offset"]
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logging.error(f"Error loading journal acknowledgement: {str(e)}")
+            return 0
+
+    def append(self, lines):
+        """Write lines to the journal and return the offset after them; call ``sync`` to make them durable"""
+        data = "".join(f"{line}\n" for line in lines).encode("utf-8", "replace")
+        with self._cond:
+            if self._written - self._bases[-1] >= self.segment_bytes:
+                self._roll()
+            self._file.write(data)
+            self._written += len(data)
+            return self._written
+
+    def _roll(self):
+        """Seal the active segment and start a new one, holding the lock"""
+        while self._syncing:
+            self._cond.wait()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._durable = self._written
+        self._bases.append(self._written)
+        self._file = open(self._path(self._written), "ab")
+        # The new segment's directory entry must survive a crash too
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._cond.notify_all()
+
+    def sync(self, offset=None):
+        """Make the journal durable up to ``offset``, everything written if None
+
+        While one caller runs fsync the others wait, and a single fsync
+        covers everything written before it started.
+        """
+        with self._cond:
+            offset = self._written if offset is None else offset
+            while self._durable < offset:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target = self._written
+                self._file.flush()
+                fd = self._file.fileno()
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._cond.notify_all()
+                self._durable = max(self._durable, target)
+            return self._durable
+
+    def read(self, offset, timeout=None):
+        """Return (records, next_offset) for the durable lines from an offset
+
+        Each record is (offset, line). Blocks for up to ``timeout`` seconds
+        when nothing new is durable.
+        """
+        with self._cond:
+            if timeout and offset >= self._durable:
+                self._cond.wait(timeout)
+            end = self._durable
+            offset = max(offset, self._bases[0])
+            base = self._bases[bisect.bisect_right(self._bases, offset) - 1]
+        if offset >= end:
+            return [], offset
+        with open(self._path(base), "rb") as f:
+            f.seek(offset - base)
+            data = f.read(min(end - offset, READ_BYTES))
+            if b"\n" not in data:
+                # A line longer than one read; durable data always ends with a whole line
+                data += f.readline()
+        data = data[:data.rfind(b"\n") + 1]
+        records = []
+        for raw in data.split(b"\n")[:-1]:
+            records.append((offset, raw.decode("utf-8", "replace")))
+            offset += len(raw) + 1
+        return records, offset
+
+    def ack(self, offset):
+        """Record that every line before ``offset`` has been analyzed, and drop the segments it covers"""
+        with self._cond:
+            if offset <= self.acked:
+                return
+            self.acked = offset
+            sealed = [base for base, next_base in zip(self._bases, self._bases[1:]) if next_base <= offset]
+            del self._bases[:len(sealed)]
+        path = os.path.join(self.directory, "ack.json")
+        try:
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump({"offset": offset}, f)
+            os.replace(f"{path}.tmp", path)
+            for base in sealed:
+                os.remove(self._path(base))
+        except Exception as e:
+            logging.error(f"Error saving journal acknowledgement: {str(e)}")
+
+    def close(self):
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
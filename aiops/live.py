@@ -0,0 +1,349 @@
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from aiops.aggregates import LogAggregates
+from aiops.anomaly import RateAnomalyDetector, alert_severity, describe
+from aiops.config import (
+    LIVE_BUFFER_SIZE, LANE_BATCH_SIZE, ANOMALY_DETECTION, CORRELATE_INCIDENTS, TAIL_CURSOR_DIR, JOURNAL_LINES, JOURNAL_DIR
+)
+from aiops.correlation import IncidentCorrelator
+from aiops.cursor_store import CursorStore
+from aiops.journal import LineJournal
+from aiops.log_buffer import BroadcastBuffer, PriorityLanes
+from aiops.matcher import UNKNOWN_ERROR
+from aiops.remediation import EXECUTED, RemediationCoordinator
+from aiops.parser import identifiers, parse_message, template
+from aiops.rules import ACTIONS, describe_action
+from aiops.sketches import TemplateSketches
+from aiops.tables import shared_tables
+
+
+class LiveLogMonitor:
+    def __init__(self, now=datetime.now, tables=None):
+        self.now = now  # clock stamping processed logs, replays pass a virtual one
+        self.log_buffer = BroadcastBuffer(LIVE_BUFFER_SIZE)
+        self.lanes = PriorityLanes()  # lines waiting for analysis, errors first
+        self.journal = None  # durable copy of the tailed lines until they are analyzed
+        self.observer = None
+        self.monitoring_thread = None
+        self.is_monitoring = False
+        self.applications = {}
+        self.monitored_app_id = None
+        self.aggregates = LogAggregates()
+        self.sketches = TemplateSketches()  # approximate per-template counts, sampled lines included
+        self.tables = tables or shared_tables()  # remediation rules, reloaded when their file changes
+        self.remediation = RemediationCoordinator(clock=lambda: self.now().timestamp())
+        self.detector = RateAnomalyDetector() if ANOMALY_DETECTION else None
+        self.correlator = IncidentCorrelator() if CORRELATE_INCIDENTS else None
+        
+    def register_application(self, app_data):
+        """Register a new application for monitoring"""
+        app_id = f"app_{len(self.applications) + 1}"
+        self.applications[app_id] = {
+            "name": app_data["name"],
+            "log_path": app_data["log_path"],
+            "environment": app_data["environment"],
+            "status": "inactive",
+            "last_check": datetime.now().isoformat(),
+            "customer": {
+                "name": app_data["customer_name"],
+                "email": app_data["customer_email"],
+                "phone": app_data["customer_phone"],
+                "company": app_data["customer_company"]
+            },
+            "api_credentials": {
+                "api_key": app_data["api_key"],
+                "api_secret": app_data["api_secret"],
+                "endpoint": app_data["api_endpoint"]
+            },
+            "configuration": {
+                "alert_threshold": app_data["alert_threshold"],
+                "retry_attempts": app_data["retry_attempts"],
+                "check_interval": app_data["check_interval"],
+                "auto_resolve": app_data["auto_resolve"],
+                "notifications": app_data["notifications"]
+            },
+            "metrics": {
+                "error_count": 0,
+                "warning_count": 0,
+                "uptime": 100.0
+            }
+        }
+        self.aggregates.register_app(app_id)
+        return app_id
+        
+    def start_monitoring(self, app_id):
+        """Start monitoring an application's logs"""
+        if app_id not in self.applications:
+            return False
+            
+        app = self.applications[app_id]
+        log_path = app["log_path"]
+        
+        if not os.path.exists(log_path):
+            logging.error(f"Log path does not exist: {log_path}")
+            return False
+            
+        # Start file observer
+        from watchdog.observers import Observer
+        from aiops.tailer import LogEventHandler
+
+        # A single file is followed by watching its directory, where rotations happen
+        single_file = os.path.isfile(log_path)
+        if JOURNAL_LINES:
+            # Lines read but not yet analyzed survive a crash; analysis resumes at the last acknowledged one
+            journal_name = re.sub(r"[^A-Za-z0-9_.-]", "_", os.path.abspath(log_path))
+            self.journal = LineJournal(os.path.join(JOURNAL_DIR, journal_name))
+        event_handler = LogEventHandler(self.log_buffer, cursors=CursorStore(TAIL_CURSOR_DIR),
+                                        path=log_path if single_file else None, journal=self.journal)
+        self.observer = Observer()
+        self.observer.schedule(event_handler, path=os.path.dirname(os.path.abspath(log_path)) if single_file else log_path,
+                               recursive=False)
+        self.observer.start()
+        
+        # Start monitoring thread
+        self.is_monitoring = True
+        self.monitored_app_id = app_id
+        app["status"] = "active"
+        self.aggregates.set_active(app_id, True)
+        self.monitoring_thread = threading.Thread(target=self.monitor_logs, args=(app_id, self.journal.acked if self.journal else self.log_buffer.head))
+        self.monitoring_thread.start()
+        if single_file:
+            # Catch up on what was logged, and rotated away, while not monitoring
+            threading.Thread(target=event_handler.catch_up, args=(log_path,), daemon=True).start()
+        
+        return True
+        
+    def stop_monitoring(self):
+        """Stop monitoring logs"""
+        self.is_monitoring = False
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+        if self.monitoring_thread:
+            self.monitoring_thread.join()
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.monitored_app_id:
+            self.applications[self.monitored_app_id]["status"] = "inactive"
+            self.aggregates.set_active(self.monitored_app_id, False)
+            self.monitored_app_id = None
+            
+    def monitor_logs(self, app_id, cursor=None):
+        """Monitor logs in real-time
+
+        With a journal ``cursor`` is a journal offset, otherwise a position
+        in the shared buffer.
+        """
+        # The analyzer reads the journal or the shared buffer with its own cursor
+        if cursor is None:
+            cursor = self.journal.acked if self.journal else self.log_buffer.head
+        while self.is_monitoring:
+            try:
+                # Move new log entries into the priority lanes, waiting briefly only when idle
+                if self.journal:
+                    records, cursor = self.journal.read(cursor, timeout=0 if self.lanes else 0.5)
+                    self.lanes.extend([line for _, line in records], [offset for offset, _ in records])
+                else:
+                    log_entries, cursor, dropped = self.log_buffer.read(cursor, timeout=0 if self.lanes else 0.5)
+                    if dropped:
+                        logging.warning(f"Analyzer fell behind, {dropped} log entries were overwritten")
+                    self.lanes.extend(log_entries)
+                log_entries = self.lanes.take(LANE_BATCH_SIZE)
+                for log_entry, weight in log_entries:
+                    self.process_log(app_id, log_entry, weight)
+                self.record_shed(app_id)
+                if self.journal:
+                    # Everything before the oldest line still queued is analyzed or shed
+                    oldest = self.lanes.oldest_offset()
+                    self.journal.ack(cursor if oldest is None else oldest)
+                    
+                # Update metrics
+                if log_entries:
+                    self.update_metrics(app_id)
+                # Score rate buckets even while the app is silent
+                if self.detector:
+                    self.report_anomalies(self.detector.tick(self.now().timestamp()))
+                # Forget incidents that have gone quiet
+                if self.correlator:
+                    self.correlator.expire(self.now().timestamp())
+                
+            except Exception as e:
+                logging.error(f"Error in monitoring thread: {e}")
+                
+    def process_log(self, app_id, log_entry, weight=1):
+        """Process and analyze a log entry with enhanced error handling
+
+        ``weight`` is how many lines the entry stands for when it was kept
+        by sampling.
+        """
+        app = self.applications[app_id]
+        
+        # Basic log analysis
+        now = self.now()
+        timestamp = now.isoformat()
+        message = parse_message(log_entry)
+        log_template = template(message)
+        self.sketches.add(app_id, log_template, now.timestamp(), identifiers(message), weight)
+        if "ERROR" in log_entry:
+            app["metrics"]["error_count"] += 1
+            analysis = self.analyze_error(log_entry)
+            self.aggregates.record(app_id, "ERROR", analysis["error_type"], timestamp,
+                                   issue={"app_id": app_id, "timestamp": timestamp, "error": log_entry})
+            
+            # Known errors are one incident whatever their wording, others go by template
+            key = ("error", app_id, analysis["error_type"]) if analysis["can_auto_resolve"] else ("template", log_template)
+            if analysis["can_auto_resolve"] and self.correlate(app_id, key, now):
+                # Add to recent issues
+                app["recent_issues"] = app.get("recent_issues", [])
+                app["recent_issues"].append({
+                    "timestamp": timestamp,
+                    "error": log_entry,
+                    "resolution": "Auto-resolved",
+                    "resolution_time": analysis["resolution_time"]
+                })
+                
+                # Keep only last 5 issues
+                if len(app["recent_issues"]) > 5:
+                    app["recent_issues"] = app["recent_issues"][-5:]
+                
+                # Attempt auto-resolution
+                self.auto_resolve(app_id, analysis["resolution_steps"])
+                
+        elif "WARNING" in log_entry:
+            app["metrics"]["warning_count"] += 1
+            self.aggregates.record(app_id, "WARNING", None, timestamp)
+            if self.correlate(app_id, ("template", log_template), now):
+                self.handle_warning(app_id, log_entry)
+        else:
+            self.aggregates.record(app_id, "INFO", None, timestamp)
+            
+        # Track the rate of this line's template, a sampled line standing for those shed with it
+        if self.detector:
+            self.report_anomalies(self.detector.observe(app_id, log_template, now.timestamp(), weight))
+        
+        # Update last check time
+        app["last_check"] = timestamp
+        
+    def record_shed(self, app_id):
+        """Count the lines shed under load, so level totals and the app's rate stay exact"""
+        shed = self.lanes.drain_shed()
+        # Lines sampled out are already counted by the weight of the lines kept in their place
+        unweighted = sum(shed.values()) - self.lanes.drain_sampled_out()
+        if not shed:
+            return
+        app = self.applications[app_id]
+        now = self.now()
+        logging.warning(f"Analyzer overloaded, shed {dict(shed)} log entries of {app['name']}")
+        for level, count in shed.items():
+            if level == "ERROR":
+                app["metrics"]["error_count"] += count
+            elif level == "WARNING":
+                app["metrics"]["warning_count"] += count
+            self.aggregates.record(app_id, level, None, now.isoformat(), count=count)
+        if self.detector and unweighted:
+            self.report_anomalies(self.detector.shed(app_id, now.timestamp(), unweighted))
+        
+    def correlate(self, app_id, key, now):
+        """Add an event to its incident, returning True if it opened a new one and should be acted on"""
+        if not self.correlator:
+            return True
+        _, is_new = self.correlator.add(app_id, [key], now.timestamp(), None)
+        return is_new
+        
+    def handle_error(self, app_id, log_entry):
+        """Handle error log entries"""
+        app = self.applications[app_id]
+        
+        # AI Analysis (placeholder for actual AI implementation)
+        analysis = self.analyze_error(log_entry)
+        
+        # Automated resolution
+        if analysis["can_auto_resolve"]:
+            self.auto_resolve(app_id, analysis["resolution_steps"])
+            
+    def handle_warning(self, app_id, log_entry):
+        """Handle warning log entries"""
+        app = self.applications[app_id]
+        
+        # AI Analysis (placeholder for actual AI implementation)
+        analysis = self.analyze_warning(log_entry)
+        
+        # Send alert if needed
+        if analysis["needs_attention"]:
+            self.send_alert(app_id, log_entry, analysis)
+            
+    def analyze_error(self, log_entry):
+        """Analyze error log entry and determine resolution steps"""
+        decision = self.tables.current.rules.evaluate("ERROR", template(parse_message(log_entry)))
+        if decision is None:
+            return UNKNOWN_ERROR
+        return {
+            "can_auto_resolve": decision["auto_resolve"],
+            "resolution_steps": list(decision["actions"]) if decision["auto_resolve"] else [],
+            "severity": decision["severity"],
+            "error_type": decision["rule"],
+            "resolution_time": decision["resolution_time"]
+        }
+        
+    def analyze_warning(self, log_entry):
+        """Analyze warning log entry (placeholder for AI implementation)"""
+        # This would be replaced with actual AI analysis
+        return {
+            "needs_attention": True,
+            "recommendations": ["monitor_resource_usage", "optimize_performance"],
+            "severity": "MEDIUM"
+        }
+        
+    def auto_resolve(self, app_id, steps):
+        """Automatically resolve issues with simulated actions"""
+        app = self.applications[app_id]
+        
+        # Steps already running, just done or failing for this app are skipped
+        outcomes = [
+            self.remediation.run(app_id, step, lambda step=step: self.run_remediation_step(app, step) is not False)
+            for step in steps
+        ]
+        if EXECUTED not in outcomes:
+            return
+                
+        logging.info(f"Auto-resolution completed for {app['name']}")
+        app["metrics"]["auto_resolved_issues"] = app["metrics"].get("auto_resolved_issues", 0) + 1
+        self.aggregates.record_auto_resolution(app_id)
+        
+    def run_remediation_step(self, app, step):
+        """Execute one remediation step (simulated)"""
+        if step in ACTIONS:
+            logging.info(f"Executing: {describe_action(step)} for {app['name']}")
+            time.sleep(ACTIONS[step]["duration"])  # Simulate the action
+        
+    def report_anomalies(self, anomalies):
+        """Raise an alert for every rate anomaly, with the actions the rules recommend"""
+        for anomaly in anomalies:
+            decision = self.tables.current.rules.evaluate(template=anomaly["template"], rate=anomaly["kind"])
+            actions = list(decision["actions"]) if decision else []
+            self.send_alert(anomaly["app_id"], f"Rate anomaly: {describe(anomaly)}",
+                            {"severity": alert_severity(anomaly), "anomaly": anomaly, "recommendations": actions})
+            if decision and decision["auto_resolve"]:
+                self.auto_resolve(anomaly["app_id"], actions)
+        
+    def send_alert(self, app_id, log_entry, analysis):
+        """Send alert for issues that need attention"""
+        app = self.applications[app_id]
+        
+        # Simulate sending alert
+        logging.info(f"Alert sent for {app['name']}: {log_entry}")
+        
+    def update_metrics(self, app_id):
+        """Update application metrics"""
+        app = self.applications[app_id]
+        
+        # Update uptime based on error count
+        total_checks = app["metrics"]["error_count"] + app["metrics"]["warning_count"]
+        if total_checks > 0:
+            error_rate = app["metrics"]["error_count"] / total_checks
+            app["metrics"]["uptime"] = max(0, 100 - (error_rate * 100))
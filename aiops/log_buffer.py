@@ -0,0 +1,163 @@
+import threading
+from collections import Counter, deque
+from aiops.config import LANE_MAX_LAG, LANE_SAMPLE_EVERY
+
+# Priority lanes, most urgent first
+LANES = ("ERROR", "WARNING", "INFO")
+
+
+class BroadcastBuffer:
+    """Fixed-size ring buffer that every reader consumes independently
+
+    Writers never wait for readers: each reader keeps its own cursor (the
+    sequence number of the next item it wants) and a reader that falls more
+    than ``capacity`` items behind skips ahead and is told how many items it
+    missed. Any number of readers see every item still in the buffer.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0  # sequence number of the next item written
+        self._cond = threading.Condition()
+
+    @property
+    def head(self):
+        """Cursor positioned after the newest item"""
+        return self._head
+
+    def append(self, item):
+        """Publish an item to every reader"""
+        with self._cond:
+            self._items[self._head % self.capacity] = item
+            self._head += 1
+            self._cond.notify_all()
+
+    def extend(self, items):
+        """Publish several items at once"""
+        with self._cond:
+            for item in items:
+                self._items[self._head % self.capacity] = item
+                self._head += 1
+            self._cond.notify_all()
+
+    def read(self, cursor, max_items=None, timeout=None):
+        """Return (items, next_cursor, dropped) for the items after a cursor
+
+        Blocks for up to ``timeout`` seconds when nothing new is available.
+        ``dropped`` counts items overwritten before this reader got to them.
+        """
+        with self._cond:
+            if timeout and cursor >= self._head:
+                self._cond.wait(timeout)
+            oldest = max(0, self._head - self.capacity)
+            start = max(cursor, oldest)
+            end = self._head if max_items is None else min(self._head, start + max_items)
+            items = [self._items[seq % self.capacity] for seq in range(start, end)]
+            return items, end, start - cursor if start > cursor else 0
+
+
+def lane_of(line):
+    """Cheap level pre-classification: 0 for errors, 1 for warnings, 2 for everything else"""
+    if "ERROR" in line or "CRITICAL" in line or "FATAL" in line:
+        return 0
+    if "WARN" in line:
+        return 1
+    return 2
+
+
+class PriorityLanes:
+    """Lines waiting for analysis, errors first, shedding the least urgent under load
+
+    Lines are taken from the most urgent non-empty lane. Once ``max_lag``
+    lines are waiting, new INFO/DEBUG lines are sampled (one in
+    ``sample_every`` is kept); past twice that they are all dropped and
+    warnings are sampled; past three times warnings are dropped too. Errors
+    are only dropped past ten times ``max_lag``, to bound memory. Every
+    dropped line is counted per lane, and lines are taken as (line, weight)
+    where a sampled line weighs ``sample_every``.
+    """
+
+    def __init__(self, max_lag=LANE_MAX_LAG, sample_every=LANE_SAMPLE_EVERY):
+        self.max_lag = max_lag
+        self.sample_every = sample_every
+        self._lanes = [deque() for _ in LANES]
+        self._offered = [0] * len(LANES)  # lines offered to each lane while it is sampled
+        self._size = 0
+        self._lock = threading.Lock()
+        self._shed = Counter()
+        self._sampled_out = 0  # shed lines that a sampled line's weight stands for
+        self.total_shed = Counter()
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, lines, offsets=None):
+        """Queue lines in their lanes, dropping what the current lag sheds
+
+        ``offsets`` are the lines' journal offsets, see ``oldest_offset``.
+        """
+        with self._lock:
+            for line, offset in zip(lines, offsets or [None] * len(lines)):
+                lane = lane_of(line)
+                weight = self._admit(lane)
+                if weight:
+                    self._lanes[lane].append((line, weight, offset))
+                    self._size += 1
+                else:
+                    self._shed[LANES[lane]] += 1
+                    self.total_shed[LANES[lane]] += 1
+
+    def _admit(self, lane):
+        """Return the weight a new line of a lane is queued with, 0 if it is shed"""
+        pressure = self._size // self.max_lag if self.max_lag else 0
+        if lane == 0:
+            return 1 if pressure < 10 else 0
+        # INFO is sampled from pressure 1 and dropped from 2, WARNING one step later
+        shed_from = 2 if lane == 2 else 3
+        if pressure >= shed_from:
+            return 0
+        if pressure == shed_from - 1 and self.sample_every > 1:
+            self._offered[lane] += 1
+            if self._offered[lane] % self.sample_every == 1:
+                return self.sample_every
+            self._sampled_out += 1
+            return 0
+        return 1
+
+    def take(self, max_items):
+        """Remove and return up to ``max_items`` (line, weight) pairs, most urgent lanes first"""
+        items = []
+        with self._lock:
+            for lane in self._lanes:
+                while lane and len(items) < max_items:
+                    items.append(lane.popleft()[:2])
+            self._size -= len(items)
+        return items
+
+    def oldest_offset(self):
+        """Journal offset of the oldest line still queued, None if none is
+
+        Every line before it has been taken or shed, whatever its lane.
+        """
+        with self._lock:
+            return min((lane[0][2] for lane in self._lanes if lane), default=None)
+
+    def drain_shed(self):
+        """Return the lines dropped per lane since the last call"""
+        with self._lock:
+            shed, self._shed = self._shed, Counter()
+        return shed
+
+    def drain_sampled_out(self):
+        """Return how many of the dropped lines since the last call are counted by sampled lines' weights"""
+        with self._lock:
+            sampled_out, self._sampled_out = self._sampled_out, 0
+        return sampled_out
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": {name: len(lane) for name, lane in zip(LANES, self._lanes)},
+                "shed": dict(self.total_shed)
+            }
@@ -0,0 +1,89 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+
+class LogIndex:
+    """Append-only store of analyzed log entries with secondary indexes
+
+    Entries arrive in time order, so positions double as a time index and the
+    per-severity and per-category position lists stay sorted. Filtered queries
+    bisect those lists and only materialize the requested page. Indexing and
+    slicing behave like the plain list it replaces.
+    """
+
+    def __init__(self, severity_key=None, category_key=None):
+        self._entries = []
+        self._timestamps = []
+        self._by_severity = defaultdict(list)
+        self._by_category = defaultdict(list)
+        self._severity_key = severity_key or (lambda entry: entry.get("severity", "UNKNOWN"))
+        self._category_key = category_key or (lambda entry: entry.get("category", "uncategorized"))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __reversed__(self):
+        return reversed(self._entries)
+
+    def append(self, entry):
+        """Add an entry, indexing it by time, severity and category"""
+        position = len(self._entries)
+        self._entries.append(entry)
+        self._timestamps.append(entry["timestamp"])
+        self._by_severity[self._severity_key(entry)].append(position)
+        self._by_category[self._category_key(entry)].append(position)
+        return position
+
+    def severities(self):
+        return sorted(self._by_severity)
+
+    def categories(self):
+        return sorted(self._by_category)
+
+    def query(self, severity=None, category=None, start=None, end=None, search=None,
+              offset=0, limit=20, newest_first=True):
+        """Return (page, total) for the entries matching every filter
+
+        ``start``/``end`` bound the timestamp (ISO strings compare in time
+        order), ``search`` is a case-insensitive substring of the entry text.
+        """
+        lo = bisect_left(self._timestamps, start) if start else 0
+        hi = bisect_right(self._timestamps, end) if end else len(self._entries)
+
+        # Start from the most selective index and check the rest per entry
+        candidates = []
+        if severity:
+            candidates.append(self._slice(self._by_severity.get(severity, []), lo, hi))
+        if category:
+            candidates.append(self._slice(self._by_category.get(category, []), lo, hi))
+        if candidates:
+            positions = min(candidates, key=len)
+            if severity and category:
+                positions = [
+                    p for p in positions
+                    if self._severity_key(self._entries[p]) == severity
+                    and self._category_key(self._entries[p]) == category
+                ]
+        else:
+            positions = range(lo, hi)
+
+        if search:
+            needle = search.lower()
+            positions = [p for p in positions if needle in self._entries[p].get("entry", "").lower()]
+
+        total = len(positions)
+        if newest_first:
+            page_positions = positions[max(0, total - offset - limit):max(0, total - offset)][::-1]
+        else:
+            page_positions = positions[offset:offset + limit]
+        return [self._entries[p] for p in page_positions], total
+
+    @staticmethod
+    def _slice(positions, lo, hi):
+        return positions[bisect_left(positions, lo):bisect_left(positions, hi)]
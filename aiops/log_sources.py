@@ -0,0 +1,189 @@
+import logging
+import re
+from datetime import datetime, timezone
+from aiops.config import PROMETHEUS_APP_LABEL, PROMETHEUS_BATCH_SIZE
+
+# RE2 metacharacters, escaped so app names match literally
+_REGEX_META_RE = re.compile(r"([\\.+*?()|\[\]{}^$])")
+
+# Queries evaluated for every Prometheus-backed app. ``{matcher}`` is replaced
+# with a label matcher selecting a whole batch of apps, so each query costs one
+# request per server and batch rather than one per app.
+PROMETHEUS_QUERIES = [
+    {
+        "name": "up",
+        "expr": "up{{{matcher}}}",
+        "below": 1,
+        "level": "ERROR",
+        "message": "API service unavailable. Target {instance} is down"
+    },
+    {
+        "name": "error_rate",
+        "expr": 'sum by ({label}, instance) (rate(http_requests_total{{status=~"5..",{matcher}}}[5m]))',
+        "above": 0.05,
+        "level": "ERROR",
+        "message": "HTTP 5xx rate at {value:.2f}/s on {instance}"
+    },
+    {
+        "name": "latency",
+        "expr": 'histogram_quantile(0.95, sum by ({label}, instance, le) (rate(http_request_duration_seconds_bucket{{{matcher}}}[5m])))',
+        "above": 0.8,
+        "level": "WARNING",
+        "message": "API response time above 800ms on {instance} (p95 {value:.3f}s)"
+    }
+]
+
+DATADOG_SEARCH_URL = "https://api.datadoghq.com/api/v2/logs/events/search"
+
+
+def _pooled_session(pool_size=32):
+    """Create a session keeping connections to each server alive"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class PrometheusSource:
+    """Fetch alerting samples for many apps with batched PromQL queries"""
+
+    def __init__(self, queries=PROMETHEUS_QUERIES, label=PROMETHEUS_APP_LABEL,
+                 batch_size=PROMETHEUS_BATCH_SIZE, session=None):
+        self.queries = queries
+        self.label = label
+        self.batch_size = batch_size
+        self.session = session or _pooled_session()
+
+    @staticmethod
+    def label_value(app):
+        """Return the label value identifying an app's series"""
+        return app.get("prometheus_job") or app.get("name") or app.get("App Name")
+
+    def fetch(self, prometheus_url, apps):
+        """Evaluate every query at the current time for a group of apps"""
+        events = []
+        for batch in self._batches(apps):
+            by_label = {self.label_value(app): app for app in batch}
+            for spec in self.queries:
+                data = self._request(prometheus_url, "query", {"query": self._expr(spec, by_label)})
+                for series in data.get("result", []) if data else []:
+                    timestamp, value = series["value"]
+                    events.extend(self._events(spec, series["metric"], [(timestamp, value)], by_label))
+        return events
+
+    def fetch_range(self, prometheus_url, apps, start, end, step=60):
+        """Evaluate every query over a time range, e.g. to catch up after downtime"""
+        events = []
+        for batch in self._batches(apps):
+            by_label = {self.label_value(app): app for app in batch}
+            for spec in self.queries:
+                params = {"query": self._expr(spec, by_label), "start": start, "end": end, "step": step}
+                data = self._request(prometheus_url, "query_range", params)
+                for series in data.get("result", []) if data else []:
+                    events.extend(self._events(spec, series["metric"], series["values"], by_label))
+        return events
+
+    def _batches(self, apps):
+        for i in range(0, len(apps), self.batch_size):
+            yield apps[i:i + self.batch_size]
+
+    @staticmethod
+    def _quote_regex(values):
+        """Return a PromQL double-quoted string holding a regex matching exactly these values
+
+        Only RE2 metacharacters are escaped, then backslashes and quotes are
+        escaped again for the string literal, where an escape like ``\\-``
+        (as ``re.escape`` produces) is rejected by Prometheus.
+        """
+        regex = "|".join(_REGEX_META_RE.sub(r"\\\1", value) for value in values)
+        return '"' + regex.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def _expr(self, spec, by_label):
+        matcher = f"{self.label}=~{self._quote_regex(by_label)}"
+        return spec["expr"].format(matcher=matcher, label=self.label)
+
+    def _request(self, prometheus_url, endpoint, params):
+        """POST a query so large label matchers are not limited by URL length"""
+        try:
+            response = self.session.post(f"{prometheus_url.rstrip('/')}/api/v1/{endpoint}", data=params, timeout=10)
+            body = response.json()
+            if response.status_code != 200 or body.get("status") != "success":
+                logging.error(f"Prometheus {endpoint} failed on {prometheus_url}: {body.get('error', response.status_code)}")
+                return None
+            return body["data"]
+        except Exception as e:
+            logging.error(f"Exception querying Prometheus at {prometheus_url}: {str(e)}")
+            return None
+
+    def _events(self, spec, metric, samples, by_label):
+        """Turn the breaching samples of one series into pipeline events"""
+        app = by_label.get(metric.get(self.label))
+        if app is None:
+            return []
+        events = []
+        for timestamp, raw_value in samples:
+            value = float(raw_value)
+            if "below" in spec and not value < spec["below"]:
+                continue
+            if "above" in spec and not value > spec["above"]:
+                continue
+            message = spec["message"].format(value=value, instance=metric.get("instance", "unknown"))
+            events.append({
+                "app_name": self.label_value(app),
+                "timestamp": datetime.fromtimestamp(float(timestamp), timezone.utc).isoformat(),
+                "level": spec["level"],
+                "message": f"{spec['level']}: {message}",
+                "query": spec["name"],
+                "metric": metric,
+                "value": value
+            })
+        return events
+
+
+_prometheus_source = None
+
+
+def fetch_prometheus_logs(prometheus_url, apps):
+    """Fetch events for all apps scraped by one Prometheus server"""
+    global _prometheus_source
+    if _prometheus_source is None:
+        _prometheus_source = PrometheusSource()
+    return _prometheus_source.fetch(prometheus_url, apps)
+
+
+def fetch_datadog_logs(api_key, app_key, app_name=None, window="now-1m"):
+    """Fetch recent warning and error logs from the Datadog logs API"""
+    import requests
+
+    headers = {
+        "DD-API-KEY": api_key,
+        "DD-APPLICATION-KEY": app_key,
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "filter": {"from": window, "to": "now", "query": "status:(error OR warn)"},
+        "page": {"limit": 1000}
+    }
+    try:
+        response = requests.post(DATADOG_SEARCH_URL, headers=headers, json=payload, timeout=10)
+        if response.status_code != 200:
+            logging.error(f"Datadog API Error: {response.status_code}")
+            return []
+        events = []
+        for item in response.json().get("data", []):
+            attributes = item.get("attributes", {})
+            level = "ERROR" if attributes.get("status") == "error" else "WARNING"
+            events.append({
+                "app_name": app_name or attributes.get("service"),
+                "timestamp": attributes.get("timestamp", datetime.now(timezone.utc).isoformat()),
+                "level": level,
+                "message": f"{level}: {attributes.get('message', '')}"
+            })
+        return events
+    except Exception as e:
+        logging.error(f"Exception fetching Datadog logs: {str(e)}")
+        return []
@@ -0,0 +1,111 @@
+import codecs
+import json
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq", "text/plain")
+
+
+def batched(iterable, size):
+    """Yield lists of at most ``size`` items from an iterable"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_ndjson(lines):
+    """Decode newline-delimited JSON, passing through plain text lines"""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip().lstrip("\x1e")
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line
+
+
+def iter_json_array(chunks, meta=None, entries_key=("logs", "data")):
+    """Incrementally decode the items of a JSON array split across chunks
+
+    Only the undecoded tail of the body is buffered, so memory stays bounded
+    by the chunk size plus the largest single entry. Bodies that are a JSON
+    object (paginated envelopes) are decoded whole; their entries are yielded
+    and the remaining keys are copied into ``meta``.
+    """
+    decoder = json.JSONDecoder()
+    # Multi-byte characters may be split across chunk boundaries
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = (text_decoder.decode(c) if isinstance(c, bytes) else c for c in chunks)
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        buffer += chunk
+        if not started:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            if buffer[0] != "[":
+                body = json.loads(buffer + "".join(chunks))
+                yield from envelope_entries(body, meta, entries_key)
+                return
+            buffer = buffer[1:]
+            started = True
+        buffer, done = yield from _drain(decoder, buffer, final=False)
+        if done:
+            return
+    if started:
+        yield from _drain(decoder, buffer, final=True)
+
+
+def _drain(decoder, buffer, final):
+    """Yield every complete array item in the buffer, return the rest"""
+    pos = 0
+    length = len(buffer)
+    while True:
+        while pos < length and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length:
+            return "", False
+        if buffer[pos] == "]":
+            return "", True
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return buffer[pos:], False
+        # A bare number at the end of the buffer may continue in the next chunk
+        if end == length and not final and not isinstance(value, (dict, list, str)):
+            return buffer[pos:], False
+        yield value
+        pos = end
+
+
+def envelope_entries(body, meta=None, entries_key=("logs", "data")):
+    """Yield the entries of a decoded body, copying envelope keys into meta"""
+    if isinstance(body, list):
+        yield from body
+        return
+    for key in entries_key:
+        if key in body:
+            entries = body[key]
+            break
+    else:
+        entries = []
+    if meta is not None:
+        meta.update({k: v for k, v in body.items() if k not in entries_key})
+    yield from entries
+
+
+def iter_response_entries(response, meta=None, chunk_size=65536):
+    """Yield log entries from a streamed HTTP response as they arrive"""
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        return iter_ndjson(response.iter_lines(chunk_size=chunk_size))
+    return iter_json_array(response.iter_content(chunk_size=chunk_size), meta)
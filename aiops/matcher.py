@@ -0,0 +1,86 @@
+# Known error patterns and their solutions used by LogAnalyzer
+ERROR_PATTERNS = {
+    "database connection": {
+        "type": "ERROR",
+        "category": "Database",
+        "severity": "HIGH",
+        "automated_actions": ["restart_database", "check_connection"]
+    },
+    "memory usage": {
+        "type": "WARNING",
+        "category": "Resources",
+        "severity": "MEDIUM",
+        "automated_actions": ["clear_cache", "scale_resources"]
+    },
+    "cpu high": {
+        "type": "WARNING",
+        "category": "Resources",
+        "severity": "MEDIUM",
+        "automated_actions": ["optimize_processes", "scale_resources"]
+    }
+}
+
+# Pattern categories used by ApplicationMonitor
+APP_LOG_PATTERNS = {
+    "database": {
+        "patterns": ["connection failed", "timeout", "deadlock"],
+        "severity": "HIGH",
+        "auto_fix": ["restart_database", "check_connection"]
+    },
+    "memory": {
+        "patterns": ["out of memory", "memory limit exceeded"],
+        "severity": "HIGH",
+        "auto_fix": ["clear_cache", "scale_resources"]
+    },
+    "performance": {
+        "patterns": ["slow response", "high latency"],
+        "severity": "MEDIUM",
+        "auto_fix": ["optimize_query", "scale_resources"]
+    }
+}
+
+# What LiveLogMonitor reports for errors no remediation rule matches
+UNKNOWN_ERROR = {
+    "can_auto_resolve": False,
+    "resolution_steps": [],
+    "severity": "UNKNOWN",
+    "error_type": "unknown",
+    "resolution_time": "N/A"
+}
+
+
+class PatternMatcher:
+    """Match text against an ordered table of substring patterns
+
+    ``table`` maps a key to its info; ``patterns_of`` returns the substrings
+    of an entry (by default the key itself). The first entry, in table order,
+    with a pattern found in the text wins.
+    """
+
+    def __init__(self, table, patterns_of=None, ignore_case=True):
+        self.table = table
+        self.ignore_case = ignore_case
+        patterns_of = patterns_of or (lambda key, info: [key])
+        self._patterns = [
+            (pattern.lower() if ignore_case else pattern, key)
+            for key, info in table.items()
+            for pattern in patterns_of(key, info)
+        ]
+
+    def match(self, text):
+        """Return (key, pattern, info) of the first matching entry, or None"""
+        if self.ignore_case:
+            text = text.lower()
+        for pattern, key in self._patterns:
+            if pattern in text:
+                return key, pattern, self.table[key]
+        return None
+
+
+def error_pattern_matcher(table=ERROR_PATTERNS):
+    return PatternMatcher(table)
+
+
+def app_pattern_matcher(table=APP_LOG_PATTERNS):
+    return PatternMatcher(table, patterns_of=lambda key, info: info["patterns"])
+
@@ -1,8 +1,6 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import logging
-from config import EMAIL_HOST, EMAIL_PORT, EMAIL_USERNAME, EMAIL_PASSWORD, LOG_DIR
+from aiops.config import EMAIL_HOST, EMAIL_PORT, EMAIL_USERNAME, EMAIL_PASSWORD
+
 
 class EmailNotifier:
     def __init__(self):
@@ -10,17 +8,22 @@ class EmailNotifier:
         self.port = EMAIL_PORT
         self.username = EMAIL_USERNAME
         self.password = EMAIL_PASSWORD
-        
-        # Configure logging
-        logging.basicConfig(
-            filename=f"{LOG_DIR}/notifications.log",
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+
+    def _send(self, msg):
+        """Send a message through the configured SMTP server"""
+        import smtplib
+
+        with smtplib.SMTP(self.host, self.port) as server:
+            server.starttls()
+            server.login(self.username, self.password)
+            server.send_message(msg)
 
     def send_alert(self, app, subject, body):
         """Send email alert"""
         try:
+            from email.mime.multipart import MIMEMultipart
+            from email.mime.text import MIMEText
+
             msg = MIMEMultipart()
             msg['From'] = self.username
             msg['To'] = app.get('Client Email', self.username)  # Fallback to admin email
@@ -43,10 +46,7 @@ class EmailNotifier:
             msg.attach(MIMEText(html_body, 'html'))
 
             # Connect to SMTP server and send email
-            with smtplib.SMTP(self.host, self.port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            self._send(msg)
 
             logging.info(f"Alert sent successfully to {msg['To']}")
             return True
@@ -58,11 +58,25 @@ class EmailNotifier:
     def send_summary(self, app, summary_data):
         """Send daily/weekly summary"""
         try:
+            from email.mime.multipart import MIMEMultipart
+            from email.mime.text import MIMEText
+
             msg = MIMEMultipart()
             msg['From'] = self.username
             msg['To'] = app.get('Client Email', self.username)
             msg['Subject'] = f"[{app['App Name']}] Monitoring Summary Report"
 
+            # Template counts and distinct sources, when the sketches cover the period
+            sketched = ""
+            if "top_templates" in summary_data:
+                sketched = f"""
+                    <h4>Most Frequent Log Templates (all levels, approximate):</h4>
+                    <ul>
+                        {''.join([f"<li>{name}</li>" for name in summary_data['top_templates']])}
+                    </ul>
+                    <p>Distinct sources (IPs, request IDs): ~{summary_data['distinct_sources']}</p>
+                """
+
             # Create HTML summary
             html_body = f"""
             <html>
@@ -87,6 +101,7 @@ class EmailNotifier:
                     <ul>
                         {''.join([f"<li>{rec}</li>" for rec in summary_data['recommendations']])}
                     </ul>
+                    {sketched}
                     
                     <hr>
                     <p>This is an automated summary from your AI Log Monitor.</p>
@@ -97,10 +112,7 @@ class EmailNotifier:
             msg.attach(MIMEText(html_body, 'html'))
 
             # Send email
-            with smtplib.SMTP(self.host, self.port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            self._send(msg)
 
             logging.info(f"Summary sent successfully to {msg['To']}")
             return True
@@ -0,0 +1,68 @@
+import re
+
+# Most severe first, a line mentioning several levels takes the most severe
+LEVELS = ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG")
+LEVEL_ALIASES = {"FATAL": "CRITICAL", "WARN": "WARNING"}
+
+_LEVEL_RE = re.compile(r"\b(CRITICAL|FATAL|ERROR|WARNING|WARN|INFO|DEBUG)\b")
+_TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?")
+# Leading timestamps and [LEVEL] / LEVEL: prefixes, possibly repeated when an
+# app logs through another logger (see app.log)
+_PREFIX_RE = re.compile(
+    r"^(?:\s*(?:" + _TIMESTAMP_RE.pattern + r"|\[?(?:CRITICAL|FATAL|ERROR|WARNING|WARN|INFO|DEBUG)\]?:?|-))+\s*"
+)
+
+# Variable parts masked when reducing a message to its template
+_TEMPLATE_RULES = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<UUID>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<IP>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b", re.I), "<HEX>"),
+    (re.compile(r"\"[^\"]*\"|'[^']*'"), "<STR>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<NUM>"),
+]
+# UUIDs and IP addresses, the sources and IDs counted distinctly
+_IDENTIFIER_RE = re.compile(f"{_TEMPLATE_RULES[0][0].pattern}|{_TEMPLATE_RULES[1][0].pattern}", re.I)
+
+
+def parse_level(line):
+    """Return the most severe log level mentioned in a line, or None"""
+    found = {LEVEL_ALIASES.get(level, level) for level in _LEVEL_RE.findall(line)}
+    for level in LEVELS:
+        if level in found:
+            return level
+    return None
+
+
+def parse_timestamp(line):
+    """Return the first timestamp in a line, or None"""
+    match = _TIMESTAMP_RE.search(line)
+    return match.group(0) if match else None
+
+
+def parse_message(line):
+    """Strip leading timestamps and level markers from a line"""
+    return _PREFIX_RE.sub("", line, count=1).strip()
+
+
+def template(message):
+    """Reduce a message to its template by masking variable parts"""
+    for pattern, placeholder in _TEMPLATE_RULES:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def identifiers(message):
+    """Return the UUIDs and IP addresses mentioned in a message"""
+    return _IDENTIFIER_RE.findall(message)
+
+
+def parse_line(line):
+    """Parse a raw log line into its level, timestamp, message and template"""
+    message = parse_message(line)
+    return {
+        "raw": line,
+        "level": parse_level(line) or "INFO",
+        "timestamp": parse_timestamp(line),
+        "message": message,
+        "template": template(message)
+    }
@@ -0,0 +1,79 @@
+import json
+import logging
+import re
+from aiops.config import CONFIG_PATH, LOG_CHECK_INTERVAL
+
+# Bounds enforced by the registration form (app_registration.py)
+MIN_FREQUENCY = 30
+MAX_FREQUENCY = 3600
+
+# Apps using this log source push their logs to ingest_service.py
+PUSH_LOG_SOURCE = "Push API"
+
+
+def load_apps(path=CONFIG_PATH):
+    """Load registered apps from the registry file
+
+    Entries registered before apps had an "App ID" are given one from their
+    name and environment, with their registry index added when another
+    entry already has that id, so every loaded app has a unique id.
+    """
+    try:
+        with open(path, 'r') as f:
+            apps = json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading apps: {str(e)}")
+        return []
+    seen = set()
+    for index, app in enumerate(apps):
+        if not app.get("App ID"):
+            app_id = get_app_id(app)
+            app["App ID"] = f"{app_id}-{index}" if app_id in seen else app_id
+        elif app["App ID"] in seen:
+            logging.error(f"Duplicate App ID {app['App ID']} in {path}, only one of its apps is monitored")
+        seen.add(app["App ID"])
+    return apps
+
+
+def get_app_name(app):
+    """Return the display name of a registered app"""
+    return app.get("App Name") or app.get("name") or "Unknown Application"
+
+
+def get_app_id(app):
+    """Return a stable identifier for a registered app"""
+    if app.get("App ID"):
+        return app["App ID"]
+    key = f"{get_app_name(app)} {app.get('Environment', '')}"
+    return re.sub(r"[^a-z0-9]+", "-", key.lower()).strip("-")
+
+
+def get_frequency(app):
+    """Return the polling interval of an app in seconds"""
+    frequency = app.get("Monitoring", {}).get("Frequency", LOG_CHECK_INTERVAL)
+    try:
+        frequency = int(frequency)
+    except (TypeError, ValueError):
+        return LOG_CHECK_INTERVAL
+    return min(MAX_FREQUENCY, max(MIN_FREQUENCY, frequency))
+
+
+def get_log_source(app):
+    """Return where an app's logs come from"""
+    return app.get("Monitoring", {}).get("Log Source") or app.get("Log Source") or app.get("log_source")
+
+
+def is_push_app(app):
+    """Return True if an app pushes its logs instead of being polled"""
+    return get_log_source(app) == PUSH_LOG_SOURCE
+
+
+def get_ingest_token(app):
+    """Return the token an app authenticates its pushed batches with"""
+    return app.get("API Credentials", {}).get("ingest", {}).get("token")
+
+
+def get_databases(app):
+    """Return the databases an app depends on"""
+    databases = app.get("Technical", {}).get("Databases") or []
+    return [databases] if isinstance(databases, str) else list(databases)
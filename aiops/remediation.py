@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from collections import Counter
+from aiops.config import REMEDIATION_COOLDOWN, REMEDIATION_FAILURE_THRESHOLD, REMEDIATION_BREAKER_SECONDS
+
+# Outcomes of a remediation request
+EXECUTED = "executed"
+FAILED = "failed"
+COALESCED = "coalesced"  # the same action was already running for the app
+COOLDOWN = "cooldown"  # the same action succeeded for the app moments ago
+OPEN = "open"  # the action kept failing for the app, its circuit breaker is open
+
+
+class _ActionState:
+    def __init__(self):
+        self.running = False
+        self.attached = 0
+        self.last_success = None
+        self.failures = 0
+        self.open_until = None
+
+
+class RemediationCoordinator:
+    """Run each remediation action at most once at a time per app, and not too often
+
+    A request for an action already running for the app attaches to that
+    run instead of queuing another. After a success the action is skipped
+    for ``cooldown`` seconds. After ``failure_threshold`` failures in a row
+    its circuit breaker opens for ``breaker_seconds``; then a single trial
+    run is let through, which closes the breaker on success or reopens it.
+    Actions run on the caller's thread; ``clock`` returns seconds, replays
+    pass their virtual clock.
+    """
+
+    def __init__(self, cooldown=REMEDIATION_COOLDOWN, failure_threshold=REMEDIATION_FAILURE_THRESHOLD,
+                 breaker_seconds=REMEDIATION_BREAKER_SECONDS, clock=time.monotonic):
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self.breaker_seconds = breaker_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._states = {}
+        self.outcomes = Counter()
+
+    def run(self, app_id, action, execute):
+        """Run ``execute()`` for an app's action unless it is running, cooling down or broken
+
+        ``execute`` returns a falsy value or raises on failure. Returns the
+        outcome: EXECUTED, FAILED, COALESCED, COOLDOWN or OPEN.
+        """
+        key = (app_id, action)
+        with self._lock:
+            state = self._states.setdefault(key, _ActionState())
+            now = self.clock()
+            outcome = self._admit(state, now)
+            if outcome:
+                self.outcomes[outcome] += 1
+                return outcome
+            state.running = True
+
+        try:
+            succeeded = bool(execute())
+        except Exception as e:
+            logging.error(f"Error executing {action} for {app_id}: {str(e)}")
+            succeeded = False
+
+        with self._lock:
+            state.running = False
+            if state.attached:
+                logging.info(f"{state.attached} requests for {action} on {app_id} were handled by one run")
+                state.attached = 0
+            if succeeded:
+                state.last_success = self.clock()
+                state.failures = 0
+                state.open_until = None
+            else:
+                state.failures += 1
+                if state.failures >= self.failure_threshold:
+                    state.open_until = self.clock() + self.breaker_seconds
+                    logging.warning(f"Circuit breaker opened for {action} on {app_id} "
+                                    f"after {state.failures} failures")
+            outcome = EXECUTED if succeeded else FAILED
+            self.outcomes[outcome] += 1
+            return outcome
+
+    def _admit(self, state, now):
+        """Return why a request may not run now, or None if it may"""
+        if state.running:
+            state.attached += 1
+            return COALESCED
+        if state.open_until is not None:
+            if now < state.open_until:
+                return OPEN
+            # Half-open: this request is the trial, another failure reopens at once
+            state.failures = self.failure_threshold - 1
+            state.open_until = None
+        if state.last_success is not None and now - state.last_success < self.cooldown:
+            return COOLDOWN
+        return None
+
+    def stats(self):
+        """Return how many requests had each outcome"""
+        with self._lock:
+            return dict(self.outcomes)
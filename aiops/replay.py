@@ -0,0 +1,132 @@
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from aiops.live import LiveLogMonitor
+from aiops.parser import parse_timestamp
+from aiops.segments import read_lines
+
+
+def _event_time(value):
+    """Return a naive local datetime for a timestamp, or None"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value if value.tzinfo is None else value.astimezone().replace(tzinfo=None)
+
+
+def iter_log_file(path):
+    """Yield (timestamp, line) for every line of an app.log-style file, plain, .gz or .zst"""
+    for lines, _ in read_lines(path):
+        for line in lines:
+            yield _event_time(parse_timestamp(line)), line
+
+
+def iter_archive(app_ids=None, start=None, end=None):
+    """Yield (timestamp, message) for archived events in time order"""
+    from aiops.archive import read_events
+
+    events = read_events(app_ids, start, end, columns=["timestamp", "message"])
+    for timestamp, message in zip(events["timestamp"], events["message"]):
+        if message:
+            yield timestamp.to_pydatetime(), message
+
+
+class ReplayMonitor(LiveLogMonitor):
+    """A LiveLogMonitor whose alerts and remediations are recorded, not executed
+
+    Logs go through the unchanged ``process_log`` path, but its clock is the
+    replayed log time, so aggregates and recorded actions carry the time they
+    would have happened at.
+    """
+
+    def __init__(self):
+        self.virtual_time = None
+        super().__init__(now=lambda: self.virtual_time or datetime.now())
+        self.alerts = []
+        self.remediations = []
+
+    def register_replay(self, name, log_path=""):
+        """Register an app for replay without any customer or API details"""
+        return self.register_application({
+            "name": name,
+            "log_path": log_path,
+            "environment": "replay",
+            "customer_name": "",
+            "customer_email": "",
+            "customer_phone": "",
+            "customer_company": "",
+            "api_key": "",
+            "api_secret": "",
+            "api_endpoint": "",
+            "alert_threshold": 0,
+            "retry_attempts": 0,
+            "check_interval": 0,
+            "auto_resolve": True,
+            "notifications": []
+        })
+
+    def run_remediation_step(self, app, step):
+        self.remediations.append({"timestamp": self.now().isoformat(), "app": app["name"], "step": step})
+
+    def send_alert(self, app_id, log_entry, analysis):
+        self.alerts.append({
+            "timestamp": self.now().isoformat(),
+            "app": self.applications[app_id]["name"],
+            "severity": analysis["severity"],
+            "log": log_entry
+        })
+
+
+def replay(monitor, app_id, events, speed=None, sleep=time.sleep):
+    """Stream (timestamp, line) events through ``monitor.process_log``
+
+    With ``speed`` None events are processed as fast as possible, otherwise
+    they are paced at ``speed`` times the rate they were logged at. Lines
+    without a timestamp inherit the previous one. Returns a report of what
+    the monitor would have done and how fast it got there.
+    """
+    first_event = last_event = None
+    lines = 0
+    started = time.perf_counter()
+    for timestamp, line in events:
+        if timestamp is not None:
+            if speed and first_event is not None:
+                # Wait until this event is due on the accelerated clock
+                due = (timestamp - first_event).total_seconds() / speed
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    sleep(delay)
+            first_event = first_event or timestamp
+            last_event = timestamp
+            monitor.virtual_time = timestamp
+        try:
+            monitor.process_log(app_id, line)
+        except Exception as e:
+            logging.error(f"Error replaying log line: {str(e)}")
+        lines += 1
+    elapsed = time.perf_counter() - started
+    # Close every incident still open to count them
+    incidents = len(monitor.correlator.expire(float("inf"))) if monitor.correlator else None
+
+    span = (last_event - first_event).total_seconds() if first_event else 0.0
+    stats = monitor.aggregates.snapshot(app_id)
+    return {
+        "lines": lines,
+        "elapsed_seconds": round(elapsed, 3),
+        "lines_per_second": round(lines / elapsed, 1) if elapsed else None,
+        "first_event": first_event.isoformat() if first_event else None,
+        "last_event": last_event.isoformat() if last_event else None,
+        "speedup": round(span / elapsed, 1) if elapsed else None,
+        "by_severity": stats["by_severity"],
+        "incidents": incidents,
+        "alerts": len(monitor.alerts),
+        "remediations": len(monitor.remediations),
+        "remediation_steps": dict(Counter(step["step"] for step in monitor.remediations)),
+        "remediation_outcomes": monitor.remediation.stats(),
+        "auto_resolved": stats["auto_resolved"]
+    }
@@ -0,0 +1,187 @@
+import re
+from aiops.anomaly import ALL_LINES
+
+# Remediation actions every executor knows, with what they do and how long they take
+ACTIONS = {
+    "restart_database_service": {"description": "Restart the database service", "priority": "HIGH", "duration": 2},
+    "verify_connection": {"description": "Verify the database connection", "priority": "HIGH", "duration": 1},
+    "clear_connection_pool": {"description": "Clear the connection pool", "priority": "HIGH", "duration": 1},
+    "restart_database": {"description": "Automatically restart the database service", "priority": "HIGH", "duration": 2},
+    "check_connection": {"description": "Check the database connection", "priority": "HIGH", "duration": 1},
+    "clear_memory_cache": {"description": "Clear the memory cache", "priority": "HIGH", "duration": 1},
+    "release_unused_resources": {"description": "Release unused resources", "priority": "HIGH", "duration": 1},
+    "restart_memory_manager": {"description": "Restart the memory manager", "priority": "HIGH", "duration": 2},
+    "restart_api_service": {"description": "Restart the API service", "priority": "HIGH", "duration": 2},
+    "reset_load_balancer": {"description": "Reset the load balancer", "priority": "HIGH", "duration": 1},
+    "verify_endpoints": {"description": "Verify the API endpoints", "priority": "HIGH", "duration": 1},
+    "clear_cache": {"description": "Clear system cache to free up memory", "priority": "MEDIUM", "duration": 1},
+    "scale_resources": {"description": "Increase allocated resources", "priority": "MEDIUM", "duration": 2},
+    "optimize_processes": {"description": "Optimize running processes", "priority": "MEDIUM", "duration": 1},
+    "restart_service": {"description": "Restart the service", "priority": "HIGH", "duration": 2},
+    "rollback_deployment": {"description": "Roll back the last deployment", "priority": "HIGH", "duration": 2},
+    "scale_service": {"description": "Scale out the service", "priority": "MEDIUM", "duration": 2},
+}
+
+# Remediation rules, first match wins. ``when`` conditions are all optional
+# and must all hold: ``level`` and ``category`` list accepted values,
+# ``template`` substrings of which one must appear in the line's template
+# (case-insensitive) and ``rate`` the anomaly kinds (spike/drop) a rule
+# reacts to. Rules with a ``rate`` only see rate anomalies, the others only
+# log lines. Actions of ``auto_resolve`` rules are executed, the others are
+# recommended.
+REMEDIATION_RULES = [
+    {
+        "name": "database_connection",
+        "when": {"level": ["CRITICAL", "ERROR"], "template": ["database connection failed"]},
+        "actions": ["restart_database_service", "verify_connection", "clear_connection_pool"],
+        "severity": "HIGH",
+        "auto_resolve": True,
+        "resolution_time": "2 minutes"
+    },
+    {
+        "name": "memory_error",
+        "when": {"level": ["CRITICAL", "ERROR"], "template": ["memory allocation failed"]},
+        "actions": ["clear_memory_cache", "release_unused_resources", "restart_memory_manager"],
+        "severity": "HIGH",
+        "auto_resolve": True,
+        "resolution_time": "1 minute"
+    },
+    {
+        "name": "api_error",
+        "when": {"level": ["CRITICAL", "ERROR"], "template": ["api service unavailable"]},
+        "actions": ["restart_api_service", "reset_load_balancer", "verify_endpoints"],
+        "severity": "HIGH",
+        "auto_resolve": True,
+        "resolution_time": "3 minutes"
+    },
+    {
+        "name": "database_error",
+        "when": {"level": ["CRITICAL", "ERROR"], "category": ["Database"]},
+        "actions": ["restart_database", "check_connection"],
+        "severity": "HIGH",
+        "auto_resolve": True,
+        "resolution_time": "2 minutes"
+    },
+    {
+        "name": "resource_pressure",
+        "when": {"level": ["WARNING"], "category": ["Resources"]},
+        "actions": ["clear_cache", "scale_resources"],
+        "severity": "MEDIUM",
+        "auto_resolve": False
+    },
+    {
+        "name": "app_silent",
+        "when": {"rate": ["drop"], "template": [ALL_LINES]},
+        "actions": ["restart_service"],
+        "severity": "HIGH",
+        "auto_resolve": False
+    },
+    {
+        "name": "log_storm",
+        "when": {"rate": ["spike"]},
+        "actions": ["scale_service"],
+        "severity": "MEDIUM",
+        "auto_resolve": False
+    },
+    {
+        "name": "unknown_error",
+        "when": {"level": ["CRITICAL", "ERROR"]},
+        "actions": ["restart_service"],
+        "severity": "MEDIUM",
+        "auto_resolve": False
+    },
+    {
+        "name": "warning",
+        "when": {"level": ["WARNING"]},
+        "actions": ["scale_service"],
+        "severity": "MEDIUM",
+        "auto_resolve": False
+    },
+]
+
+# Distinct (level, category, rate) combinations remembered before the table starts over
+MAX_DISPATCH_KEYS = 4096
+
+
+def describe_action(action):
+    """Return what an action does, or its name if it is not a known action"""
+    return ACTIONS.get(action, {}).get("description", action)
+
+
+def resolution_steps(actions):
+    """Return the {action, description, priority} steps of a list of actions"""
+    return [
+        {"action": action, "description": describe_action(action),
+         "priority": ACTIONS.get(action, {}).get("priority", "MEDIUM")}
+        for action in actions
+    ]
+
+
+class _CompiledRule:
+    """One rule with its conditions as sets and one regex, and its decision built once"""
+
+    def __init__(self, rule):
+        when = rule.get("when", {})
+        unknown = set(when) - {"level", "category", "template", "rate"}
+        if unknown:
+            raise ValueError(f"Rule {rule['name']} has unknown conditions: {', '.join(sorted(unknown))}")
+        missing = [action for action in rule["actions"] if action not in ACTIONS]
+        if missing:
+            raise ValueError(f"Rule {rule['name']} has unknown actions: {', '.join(missing)}")
+        self.levels = frozenset(when["level"]) if "level" in when else None
+        self.categories = frozenset(when["category"]) if "category" in when else None
+        self.rates = frozenset(when["rate"]) if "rate" in when else None
+        patterns = when.get("template")
+        self.pattern = re.compile("|".join(map(re.escape, patterns)), re.I) if patterns else None
+        self.decision = {
+            "rule": rule["name"],
+            "actions": tuple(rule["actions"]),
+            "severity": rule.get("severity", "MEDIUM"),
+            "auto_resolve": bool(rule.get("auto_resolve", False)),
+            "resolution_time": rule.get("resolution_time", "N/A")
+        }
+
+    def accepts(self, level, category, rate):
+        """Whether the rule applies to events of this level, category and anomaly kind"""
+        if (self.rates is None) != (rate is None):
+            return False
+        return ((self.levels is None or level in self.levels)
+                and (self.categories is None or category in self.categories)
+                and (self.rates is None or rate in self.rates))
+
+
+class RuleEngine:
+    """Decide remediation actions from a rule table without asking the AI
+
+    Rules are compiled once: their conditions become sets and their template
+    substrings one case-insensitive regex each. Evaluation looks the
+    event's (level, category, rate) up in a dispatch table holding, in rule
+    order, only the rules that can apply to it, so only template regexes
+    are left to run and the first that matches decides.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = [_CompiledRule(rule) for rule in (REMEDIATION_RULES if rules is None else rules)]
+        self._dispatch = {}
+
+    def candidates(self, level, category=None, rate=None):
+        """Return the rules that apply to events of this level, category and anomaly kind"""
+        key = (level, category, rate)
+        rules = self._dispatch.get(key)
+        if rules is None:
+            if len(self._dispatch) >= MAX_DISPATCH_KEYS:
+                self._dispatch = {}
+            rules = self._dispatch[key] = tuple(rule for rule in self.rules if rule.accepts(level, category, rate))
+        return rules
+
+    def evaluate(self, level=None, template="", category=None, rate=None):
+        """Return the decision of the first matching rule, or None
+
+        A decision holds the rule name, its actions, severity, whether to
+        auto-resolve and the expected resolution time. It is shared, do not
+        modify it.
+        """
+        for rule in self.candidates(level, category, rate):
+            if rule.pattern is None or rule.pattern.search(template):
+                return rule.decision
+        return None
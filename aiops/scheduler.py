@@ -0,0 +1,168 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AppScheduler:
+    """Heap-based scheduler running each app on its own interval
+
+    Every app owns a single heap entry holding its next due time, so adding,
+    rescheduling and popping an app are O(log n). Removed or replaced apps are
+    invalidated lazily through a generation counter; an app whose job is
+    running has no heap entry until it is rescheduled. Start times are spread
+    over the first interval and every run gets a small random offset so apps
+    sharing an interval do not fire on the same tick.
+    """
+
+    def __init__(self, job, jitter=0.1, workers=1):
+        self.job = job
+        self.jitter = jitter
+        self.workers = workers
+        self._heap = []  # (due, generation, app_id)
+        self._entries = {}  # app_id -> {"app", "interval", "generation", "queued"}
+        self._generation = 0
+        self._stale = 0  # heap entries of removed or replaced apps
+        self._cond = threading.Condition()
+        self._running = False
+        self._executor = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_app(self, app_id, app, interval, replace=False):
+        """Schedule an app, returning False if the id is taken
+
+        With ``replace`` an app already scheduled under the id is updated
+        instead, e.g. after its registry entry changed.
+        """
+        with self._cond:
+            if app_id in self._entries:
+                if not replace:
+                    logging.error(f"App ID {app_id} is already scheduled, not scheduling it twice")
+                    return False
+                if self._entries[app_id]["queued"]:
+                    self._stale += 1
+            self._generation += 1
+            self._entries[app_id] = {
+                "app": app,
+                "interval": interval,
+                "generation": self._generation,
+                "queued": True
+            }
+            # Spread first runs over one interval to avoid a thundering herd
+            due = time.monotonic() + random.uniform(0, interval)
+            heapq.heappush(self._heap, (due, self._generation, app_id))
+            self._compact()
+            self._cond.notify()
+            return True
+
+    def apps(self):
+        """Return the scheduled apps"""
+        with self._cond:
+            return [entry["app"] for entry in self._entries.values()]
+
+    def remove_app(self, app_id):
+        """Stop scheduling an app"""
+        with self._cond:
+            entry = self._entries.pop(app_id, None)
+            if entry is not None and entry["queued"]:
+                self._stale += 1
+                self._compact()
+                self._cond.notify()
+
+    def next_due(self):
+        """Return seconds until the next job is due, or None if idle"""
+        with self._cond:
+            self._drop_stale_head()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def run_forever(self):
+        """Run due jobs until stop() is called"""
+        self._running = True
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while self._running:
+                for app_id, entry, due in self._pop_due():
+                    if self._executor:
+                        self._executor.submit(self._run_job, app_id, entry, due)
+                    else:
+                        self._run_job(app_id, entry, due)
+        finally:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def stop(self):
+        """Stop the scheduler loop"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _pop_due(self):
+        """Sleep until at least one job is due and pop every due job"""
+        with self._cond:
+            while self._running:
+                self._drop_stale_head()
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    break
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(timeout)
+
+            due_jobs = []
+            now = time.monotonic()
+            while self._running and self._heap and self._heap[0][0] <= now:
+                due, generation, app_id = heapq.heappop(self._heap)
+                entry = self._entries.get(app_id)
+                if entry is None or entry["generation"] != generation:
+                    self._stale -= 1
+                    continue
+                entry["queued"] = False
+                due_jobs.append((app_id, entry, due))
+            return due_jobs
+
+    def _run_job(self, app_id, entry, due):
+        try:
+            self.job(entry["app"])
+        except Exception as e:
+            logging.error(f"Scheduled job failed for {app_id}: {str(e)}")
+        finally:
+            self._reschedule(app_id, entry, due)
+
+    def _reschedule(self, app_id, entry, due):
+        with self._cond:
+            # The app may have been removed or replaced while its job ran
+            if self._entries.get(app_id) is not entry:
+                return
+            interval = entry["interval"]
+            offset = random.uniform(-self.jitter, self.jitter) * interval
+            # Keep a fixed rate, but never queue up missed runs
+            next_due = max(due + interval, time.monotonic()) + offset
+            heapq.heappush(self._heap, (next_due, entry["generation"], app_id))
+            entry["queued"] = True
+            self._cond.notify()
+
+    def _drop_stale_head(self):
+        while self._heap:
+            _, generation, app_id = self._heap[0]
+            entry = self._entries.get(app_id)
+            if entry is not None and entry["generation"] == generation:
+                return
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def _compact(self):
+        # Rebuild once stale entries outnumber live ones to bound heap size
+        if self._stale > len(self._entries):
+            self._heap = [
+                item for item in self._heap
+                if item[2] in self._entries and self._entries[item[2]]["generation"] == item[1]
+            ]
+            heapq.heapify(self._heap)
+            self._stale = 0
@@ -0,0 +1,159 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, time as dtime
+from aiops.config import SEARCH_DB_PATH, SEARCH_RETENTION_DAYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    severity TEXT,
+    category TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_app_ts ON logs (app, ts);
+CREATE INDEX IF NOT EXISTS logs_ts ON logs (ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5 (
+    message, content='logs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS logs_ai AFTER INSERT ON logs BEGIN
+    INSERT INTO logs_fts (rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS logs_ad AFTER DELETE ON logs BEGIN
+    INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+"""
+
+# How often old rows are pruned while indexing
+PRUNE_INTERVAL = 3600
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every term
+
+    Terms are quoted so punctuation is taken literally ("DB-4821" matches
+    the adjacent tokens db and 4821), a trailing * keeps prefix matching.
+    """
+    terms = []
+    for term in text.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _bound(value, end=False):
+    """Return a timestamp bound as ISO text, a bare end date includes that day"""
+    if value is None or isinstance(value, str):
+        return value
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, dtime.max if end else dtime.min)
+    return value.isoformat()
+
+
+class LogSearchIndex:
+    """Full-text index of analyzed logs in SQLite FTS5
+
+    Logs are added a batch per transaction; the database runs in WAL mode so
+    dashboards and the query API read while the ingestion path writes, from
+    this or another process.
+    """
+
+    def __init__(self, path=SEARCH_DB_PATH, retention_days=SEARCH_RETENTION_DAYS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add(self, rows):
+        """Index a batch of (app, timestamp, severity, category, message) rows"""
+        rows = [row for row in rows if row[4]]
+        if not rows:
+            return 0
+        try:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "INSERT INTO logs (app, ts, severity, category, message) VALUES (?, ?, ?, ?, ?)", rows
+                )
+        except Exception as e:
+            logging.error(f"Error indexing {len(rows)} logs: {str(e)}")
+            return 0
+        if self.retention_days and time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+            self.prune(datetime.now() - timedelta(days=self.retention_days))
+        return len(rows)
+
+    def prune(self, before):
+        """Drop logs older than ``before``"""
+        self._last_prune = time.monotonic()
+        try:
+            with self._lock, self.conn:
+                return self.conn.execute("DELETE FROM logs WHERE ts < ?", (_bound(before),)).rowcount
+        except Exception as e:
+            logging.error(f"Error pruning the search index: {str(e)}")
+            return 0
+
+    def search(self, text="", apps=None, severities=None, start=None, end=None,
+               limit=50, highlight=("**", "**")):
+        """Return matching logs as dicts, best match first
+
+        Without search text the filtered logs are returned newest first.
+        Each result carries a snippet of the message with the matched terms
+        wrapped in ``highlight``.
+        """
+        clauses, params = [], []
+        for column, values in (("l.app", apps), ("l.severity", severities)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if start is not None:
+            clauses.append("l.ts >= ?")
+            params.append(_bound(start))
+        if end is not None:
+            clauses.append("l.ts <= ?")
+            params.append(_bound(end, end=True))
+
+        query = fts_query(text or "")
+        if query:
+            sql = (
+                "SELECT l.app, l.ts, l.severity, l.category, l.message, "
+                "snippet(logs_fts, 0, ?, ?, '…', 16), bm25(logs_fts) AS rank "
+                "FROM logs_fts JOIN logs l ON l.id = logs_fts.rowid "
+                "WHERE logs_fts MATCH ?" + "".join(f" AND {c}" for c in clauses) +
+                " ORDER BY rank LIMIT ?"
+            )
+            params = [highlight[0], highlight[1], query] + params + [limit]
+        else:
+            sql = (
+                "SELECT l.app, l.ts, l.severity, l.category, l.message, l.message, 0 "
+                "FROM logs l" + (" WHERE " + " AND ".join(clauses) if clauses else "") +
+                " ORDER BY l.ts DESC LIMIT ?"
+            )
+            params = params + [limit]
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [
+            {"app": app, "timestamp": ts, "severity": severity, "category": category,
+             "message": message, "snippet": snippet, "rank": rank}
+            for app, ts, severity, category, message, snippet, rank in rows
+        ]
+
+    def apps(self):
+        """Return the apps that have indexed logs"""
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT app FROM logs ORDER BY app")]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
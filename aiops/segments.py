@@ -0,0 +1,168 @@
+import gzip
+import os
+import re
+
+COMPRESSED_SUFFIXES = (".gz", ".zst", ".zstd")
+# Leading bytes identifying a log file across renames and compression
+FINGERPRINT_BYTES = 256
+# Decompressed bytes read at a time
+READ_BYTES = 1024 * 1024
+# Lines handed over at a time while catching up
+BATCH_LINES = 10000
+
+_NUMBERED_RE = re.compile(r"\.(\d+)")
+_DATED_RE = re.compile(r"[-.](\d{8,14})")
+
+
+def is_compressed(path):
+    return path.endswith(COMPRESSED_SUFFIXES)
+
+
+def open_segment(path):
+    """Open a log segment for binary reading, decompressing .gz and .zst on the fly"""
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rb')
+    if path.endswith((".zst", ".zstd")):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+
+def _rotation(name, base):
+    """Return the sort key of a rotated segment of ``base``, or None if it is not one"""
+    if not name.startswith(base) or name == base:
+        return None
+    rest = name[len(base):]
+    compressed = is_compressed(rest)
+    if compressed:
+        rest = rest[:rest.rindex(".")]
+    match = _NUMBERED_RE.fullmatch(rest)
+    if match:
+        # app.log.1 is the newest numbered segment
+        return (1, -int(match.group(1)), compressed)
+    match = _DATED_RE.fullmatch(rest)
+    if match:
+        return (0, match.group(1), compressed)
+    return None
+
+
+def live_path(path):
+    """Return the live log file a rotated segment belongs to, or the path itself"""
+    directory, name = os.path.split(path)
+    stem = name
+    if is_compressed(stem):
+        stem = stem[:stem.rindex(".")]
+    match = re.search(r"(?:\.\d+|[-.]\d{8,14})$", stem)
+    return os.path.join(directory, stem[:match.start()]) if match else path
+
+
+def rotated_segments(path):
+    """Return the rotated predecessors of a live log file, oldest first
+
+    Both numbered (app.log.2.gz, app.log.1) and dated (app.log-20240101.gz)
+    rotation are recognized. While logrotate is compressing a segment both
+    the plain and compressed copies exist, the plain one is used.
+    """
+    directory, base = os.path.split(path)
+    try:
+        names = os.listdir(directory or ".")
+    except OSError:
+        return []
+    segments = {}
+    for name in names:
+        key = _rotation(name, base)
+        if key is None:
+            continue
+        order, compressed = key[:2], key[2]
+        if order not in segments or not compressed:
+            segments[order] = name
+    return [os.path.join(directory, segments[order]) for order in sorted(segments)]
+
+
+def fingerprint(path, length=FINGERPRINT_BYTES):
+    """Return the first ``length`` (decompressed) bytes of a segment"""
+    try:
+        with open_segment(path) as f:
+            return f.read(length)
+    except Exception:
+        return b""
+
+
+def _skip(f, offset):
+    """Advance a (possibly decompressing) stream by ``offset`` bytes, returning False at end of file"""
+    while offset > 0:
+        data = f.read(min(offset, READ_BYTES))
+        if not data:
+            return False
+        offset -= len(data)
+    return True
+
+
+def read_lines(path, offset=0, final=True):
+    """Yield (lines, end_offset) batches of a segment from a decompressed byte offset
+
+    Unless ``final``, a last line without its newline is still being
+    written and is left for the next read.
+    """
+    with open_segment(path) as f:
+        if not _skip(f, offset):
+            return
+        pending = b""
+        lines = []
+        while True:
+            data = f.read(READ_BYTES)
+            if not data:
+                break
+            data = pending + data
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            offset += cut
+            lines.extend(line.decode("utf-8", "replace").strip() for line in data[:cut].split(b"\n")[:-1])
+            if len(lines) >= BATCH_LINES:
+                yield [line for line in lines if line], offset
+                lines = []
+        if final and pending:
+            lines.append(pending.decode("utf-8", "replace").strip())
+            offset += len(pending)
+        if lines:
+            yield [line for line in lines if line], offset
+
+
+def follow(path, cursor=None):
+    """Yield (lines, cursor) batches of everything logged to ``path`` since ``cursor``
+
+    A cursor is the fingerprint of the segment being read and the
+    decompressed offset reached in it. When the live file has been rotated
+    since, the cursor's segment is found among the rotated predecessors by
+    fingerprint (compressed or not) and reading resumes there, then carries
+    on through every newer segment up to the live file. If the segment is
+    gone altogether every remaining segment is newer and is read. Without a
+    cursor the live file is read from its start.
+    """
+    segments = rotated_segments(path) + [path]
+    start, offset = len(segments) - 1, 0
+    if cursor and cursor.get("fingerprint"):
+        known = bytes.fromhex(cursor["fingerprint"])
+        start = 0
+        for index in range(len(segments) - 1, -1, -1):
+            segment = segments[index]
+            if not is_compressed(segment) and os.path.getsize(segment) < cursor["offset"]:
+                continue  # truncated or a different file with the same first bytes
+            if fingerprint(segment, len(known)) == known:
+                start, offset = index, cursor["offset"]
+                break
+    elif cursor:
+        offset = cursor.get("offset", 0)
+
+    for index in range(start, len(segments)):
+        segment = segments[index]
+        final = index < len(segments) - 1
+        head = fingerprint(segment)
+        position = offset
+        for lines, position in read_lines(segment, offset, final):
+            yield lines, {"fingerprint": head[:position].hex(), "offset": position}
+        if not final:
+            # Record the position in the live file even when nothing new was read
+            yield [], {"fingerprint": head[:position].hex(), "offset": position}
+        offset = 0
@@ -0,0 +1,402 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from aiops.config import (
+    CONFIG_PATH, CURSOR_DIR, SCHEDULER_JITTER, MONITOR_WORKERS, MAX_FETCH_PAGES,
+    STREAM_LOGS, STREAM_BATCH_SIZE, ARCHIVE_EVENTS, SEARCH_INDEX, ANOMALY_DETECTION, CORRELATE_INCIDENTS
+)
+from aiops.analyzer import LogAnalyzer
+from aiops.anomaly import RateAnomalyDetector, alert_severity, describe
+from aiops.archive import ArchiveWriter
+from aiops.correlation import IncidentCorrelator, correlation_keys
+from aiops.cursor_store import CursorStore
+from aiops.log_stream import batched, envelope_entries, iter_response_entries
+from aiops.notifier import EmailNotifier
+from aiops.parser import identifiers, parse_level, parse_message, parse_timestamp, template
+from aiops.registry import load_apps, get_app_id, get_frequency, get_log_source, is_push_app
+from aiops.remediation import EXECUTED, RemediationCoordinator
+from aiops.rules import ACTIONS, resolution_steps
+from aiops.scheduler import AppScheduler
+from aiops.search import LogSearchIndex
+from aiops.sketches import TemplateSketches
+from aiops.summary import IssueRollups, SummaryJob
+from aiops.tables import shared_tables
+
+
+class MonitoringService:
+    def __init__(self):
+        import requests
+
+        self.log_analyzer = LogAnalyzer()
+        self.email_notifier = EmailNotifier()
+        self.apps = self._load_apps()
+        self.session = requests.Session()
+        self.cursors = CursorStore(CURSOR_DIR)
+        self.scheduler = AppScheduler(self.monitor_app, jitter=SCHEDULER_JITTER, workers=MONITOR_WORKERS)
+        self.archive = ArchiveWriter() if ARCHIVE_EVENTS else None
+        self.search_index = LogSearchIndex() if SEARCH_INDEX else None
+        self.detector = RateAnomalyDetector() if ANOMALY_DETECTION else None
+        self.correlator = IncidentCorrelator() if CORRELATE_INCIDENTS else None
+        self.tables = shared_tables()
+        self.remediation = RemediationCoordinator()
+        self.sketches = TemplateSketches()
+        self.rollups = IssueRollups()
+        self.summaries = SummaryJob(self.rollups, self.email_notifier, self.tables, sketches=self.sketches)
+        self.metrics = Counter()
+        self._metrics_lock = threading.Lock()
+
+    def _load_apps(self):
+        """Load registered apps from configuration"""
+        return load_apps(CONFIG_PATH)
+
+    def fetch_logs(self, app):
+        """Fetch logs from the application"""
+        return [log for batch in self.fetch_log_batches(app) for log in batch]
+
+    def fetch_log_batches(self, app):
+        """Fetch logs from the application in batches of STREAM_BATCH_SIZE"""
+        try:
+            log_source = get_log_source(app)
+            if log_source == "Datadog":
+                yield from batched(self._fetch_datadog_logs(app) or [], STREAM_BATCH_SIZE)
+            elif log_source in ("ELK", "ELK Stack"):
+                yield from batched(self._fetch_elk_logs(app) or [], STREAM_BATCH_SIZE)
+            else:
+                yield from self._fetch_custom_logs(app)
+        except Exception as e:
+            logging.error(f"Error fetching logs for {app['App Name']}: {str(e)}")
+
+    def _fetch_datadog_logs(self, app):
+        # Implement Datadog log fetching
+        pass
+
+    def _fetch_elk_logs(self, app):
+        # Implement ELK log fetching
+        pass
+
+    def _fetch_custom_logs(self, app):
+        """Fetch new logs from custom API endpoint since the app's cursor
+
+        Batches are yielded while the response is still downloading when
+        STREAM_LOGS is enabled, so the first analysis does not wait for the
+        whole body and memory stays bounded by the batch size.
+        """
+        app_id = get_app_id(app)
+        cursor = self.cursors.get(app_id)
+        url = f"{app['API URL']}/logs"
+        params = self._cursor_params(cursor)
+        try:
+            for _ in range(MAX_FETCH_PAGES):
+                with self.session.get(url, params=params, timeout=10, stream=STREAM_LOGS) as response:
+                    if response.status_code != 200:
+                        logging.error(f"Error fetching logs from {app['App Name']}: {response.status_code}")
+                        return
+                    meta = {}
+                    if STREAM_LOGS:
+                        entries = iter_response_entries(response, meta)
+                    else:
+                        entries = envelope_entries(response.json(), meta)
+                    for batch in batched(self._new_entries(entries, cursor), STREAM_BATCH_SIZE):
+                        cursor = batch[-1][1]
+                        self.cursors.stage(app_id, cursor)
+                        yield [log for log, _ in batch]
+                    url, params = self._next_page(response, meta, url, params)
+                if not url:
+                    return
+        except Exception as e:
+            logging.error(f"Exception fetching logs from {app['App Name']}: {str(e)}")
+
+    def _new_entries(self, entries, cursor):
+        """Drop entries already fetched at the window edges and advance the cursor"""
+        after = cursor.get("after")
+        edge = set(cursor.get("seen", []))
+        for log in entries:
+            key = self._log_key(log)
+            seq = self._log_seq(log)
+            # Entries on the watermark are returned again by inclusive sources
+            if key in edge or (after is not None and seq is not None and seq <= after):
+                continue
+            since = cursor.get("since")
+            cursor = self._advance_cursor(cursor, log, key)
+            if cursor.get("since") != since:
+                edge = set(cursor["seen"])
+            else:
+                edge.add(key)
+            yield log, cursor
+
+    def _cursor_params(self, cursor):
+        """Build the query parameters sent for a cursor"""
+        if cursor.get("after") is not None:
+            return {"after": cursor["after"]}
+        if cursor.get("since"):
+            return {"since": cursor["since"]}
+        return {}
+
+    @staticmethod
+    def _next_page(response, meta, url, params):
+        """Return the url and params of the next page, or None when done"""
+        next_url = meta.get("next") or response.links.get("next", {}).get("url")
+        if next_url:
+            # Absolute next-page links already carry the cursor
+            return next_url, None
+        next_cursor = meta.get("next_cursor") or meta.get("cursor") or response.headers.get("X-Next-Cursor")
+        if next_cursor:
+            return url, dict(params or {}, cursor=next_cursor)
+        return None, params
+
+    @staticmethod
+    def _log_key(log):
+        """Return a stable key identifying a log entry"""
+        if isinstance(log, dict):
+            for field in ("id", "sequence", "seq"):
+                if log.get(field) is not None:
+                    return str(log[field])
+            log = json.dumps(log, sort_keys=True)
+        return hashlib.sha1(log.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _log_seq(log):
+        """Return the integer sequence id of a log entry, if any"""
+        if not isinstance(log, dict):
+            return None
+        seq = log.get("sequence", log.get("seq", log.get("id")))
+        return seq if isinstance(seq, int) else None
+
+    @staticmethod
+    def _advance_cursor(cursor, log, key):
+        """Move the high watermark past a fetched log entry"""
+        cursor = dict(cursor)
+        if not isinstance(log, dict):
+            # Plain text entries carry no watermark, only remember recent keys
+            cursor["seen"] = (cursor.get("seen", []) + [key])[-1000:]
+            return cursor
+        seq = MonitoringService._log_seq(log)
+        if seq is not None and seq > (cursor.get("after") or -1):
+            cursor["after"] = seq
+        timestamp = log.get("timestamp")
+        if timestamp:
+            since = cursor.get("since")
+            if since is None or timestamp > since:
+                cursor["since"] = timestamp
+                cursor["seen"] = [key]
+            elif timestamp == since:
+                cursor["seen"] = cursor.get("seen", []) + [key]
+        return cursor
+
+    @staticmethod
+    def _log_text(log):
+        """Return the text of a log entry for analysis"""
+        if isinstance(log, dict):
+            return log.get("message") or json.dumps(log)
+        return log
+
+    @staticmethod
+    def _log_time(log, text):
+        """Return the unix time a log entry was written, None if it has no readable timestamp"""
+        value = log.get("timestamp") if isinstance(log, dict) else parse_timestamp(text)
+        if isinstance(value, (int, float)):
+            # Epoch milliseconds are common in JSON logs
+            return value / 1000 if value > 1e11 else value
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _log_level(log, text):
+        """Return the level of a log entry, from its level field or its text"""
+        if isinstance(log, dict):
+            for field in ("level", "status", "severity"):
+                level = parse_level(str(log.get(field) or "").upper())
+                if level:
+                    return level
+        return parse_level(text)
+
+    @staticmethod
+    def _log_sources(log, message):
+        """Return the sources and IDs of a log entry, counted distinctly per app"""
+        sources = identifiers(message)
+        if isinstance(log, dict):
+            sources += [str(log[field]) for field in ("host", "hostname", "source") if log.get(field)]
+        return sources
+
+    def execute_action(self, app, action):
+        """Execute an automated action decided by the remediation rules"""
+        try:
+            if action["action"] not in ACTIONS:
+                return False
+            # Add the implementation of each action here
+            logging.info(f"{action['description']} for {app['App Name']}")
+            return True
+        except Exception as e:
+            logging.error(f"Error executing action {action['action']}: {str(e)}")
+            return False
+
+    def monitor_app(self, app):
+        """Monitor a single application"""
+        logging.info(f"Monitoring {app['App Name']}...")
+        
+        # Analyze each batch as soon as it has been fetched
+        for logs in self.fetch_log_batches(app):
+            self.process_logs(app, logs)
+        
+        # Only move the fetch cursor once every batch has been handled
+        self.cursors.commit(get_app_id(app))
+        if self.detector:
+            # Logs of the last two polls may still be on their way, older buckets are complete
+            self.check_anomalies([app], 2 * get_frequency(app))
+        if self.correlator:
+            self.report_incidents()
+        if self.archive:
+            self.archive.flush_if_due()
+
+    def process_logs(self, app, logs):
+        """Analyze a batch of logs and act on the results"""
+        counts = Counter(logs_analyzed=len(logs))
+        indexed = []
+        # The whole batch uses one version of the tables, even if they are reloaded meanwhile
+        tables = self.tables.current
+        for log in logs:
+            text = self._log_text(log)
+            written = self._log_time(log, text)
+            log_time = written if written is not None else time.time()
+            message = parse_message(text)
+            log_template = template(message)
+            self.sketches.add(get_app_id(app), log_template, log_time, self._log_sources(log, message))
+            incident = None
+            if self.correlator:
+                # Only the first event of an incident gets AI analysis and acted on
+                analysis = self.log_analyzer.classify(text, tables)
+                keys = correlation_keys(app, analysis["category"], log_template)
+                incident, is_new = self.correlator.add(get_app_id(app), keys, log_time, text)
+                if is_new:
+                    incident.analysis = self.log_analyzer.analyze_log(text, tables)
+                analysis["ai_analysis"] = incident.analysis["ai_analysis"] if incident.analysis else None
+                analysis["incident"] = incident.id
+            else:
+                # Analyze log
+                analysis = self.log_analyzer.analyze_log(text, tables)
+            
+            if not analysis:
+                continue
+            counts[f"severity_{analysis['severity'].lower()}"] += 1
+            level = self._log_level(log, text)
+            # Daily rollups feed the summaries, which never read the logs again
+            self.rollups.record(get_app_id(app), log_time, analysis["severity"],
+                                log_template if level in ("CRITICAL", "ERROR") else None)
+                
+            # Log the analysis
+            logging.info(f"Analysis for {app['App Name']}: {json.dumps(analysis)}")
+            if self.archive:
+                # Archived and partitioned by when the line was logged, which
+                # for backfills and late batches is not when it was analyzed
+                self.archive.append(get_app_id(app), {
+                    **analysis,
+                    "timestamp": datetime.fromtimestamp(written) if written is not None else analysis["timestamp"],
+                    "message": text,
+                    "analysis": analysis["ai_analysis"]
+                })
+            indexed.append((get_app_id(app), analysis["timestamp"], analysis["severity"], analysis["category"], text))
+            if self.detector:
+                anomalies = self.detector.observe(get_app_id(app), log_template, log_time)
+                self.report_anomalies(app, anomalies, counts)
+            if incident and not is_new:
+                counts["correlated"] += 1
+                continue
+            
+            # The remediation rules decide which actions to take, not the AI's prose
+            decision = tables.rules.evaluate(level, log_template, analysis["category"])
+            if decision and decision["auto_resolve"]:
+                for step in resolution_steps(decision["actions"]):
+                    # One run per app and action at a time, with cooldowns and a circuit breaker
+                    outcome = self.remediation.run(get_app_id(app), step["action"],
+                                                   lambda step=step: self.execute_action(app, step))
+                    if outcome != EXECUTED:
+                        counts[f"actions_{outcome}"] += 1
+                    else:
+                        counts["automated_actions"] += 1
+                        # Notify about the automated action
+                        self.email_notifier.send_alert(
+                            app,
+                            f"Automated action taken: {step['action']}",
+                            f"Analysis: {analysis['ai_analysis']}\nAction: {step['description']}"
+                        )
+            
+            # Send notification for medium/high severity issues
+            if analysis["severity"] in ["MEDIUM", "HIGH"]:
+                incident_note = f"\nIncident: #{incident.id}, related events will be grouped into it" if incident else ""
+                self.email_notifier.send_alert(
+                    app,
+                    f"{analysis['severity']} severity issue detected",
+                    f"Analysis: {analysis['ai_analysis']}\nCategory: {analysis['category']}{incident_note}"
+                )
+                counts["alerts_sent"] += 1
+
+        self.rollups.record_actions(get_app_id(app), time.time(), counts["automated_actions"])
+
+        # The whole batch is indexed in one transaction
+        if self.search_index:
+            self.search_index.add(indexed)
+        with self._metrics_lock:
+            self.metrics.update(counts)
+
+    def report_incidents(self):
+        """Log a summary of every incident that has gone quiet"""
+        for incident in self.correlator.expire(time.time()):
+            if incident.events > 1:
+                logging.info(f"Incident #{incident.id} closed: {json.dumps(incident.summary())}")
+
+    def check_anomalies(self, apps, delay):
+        """Score the rate buckets of apps that ended ``delay`` seconds ago, so silent apps are caught too"""
+        counts = Counter()
+        settled = time.time() - delay
+        for app in apps:
+            self.report_anomalies(app, self.detector.tick(settled, [get_app_id(app)]), counts)
+        with self._metrics_lock:
+            self.metrics.update(counts)
+
+    def report_anomalies(self, app, anomalies, counts):
+        """Alert on rate anomalies of an app"""
+        for anomaly in anomalies:
+            counts["anomalies"] += 1
+            decision = self.tables.current.rules.evaluate(template=anomaly["template"], rate=anomaly["kind"])
+            recommended = f"\nRecommended actions: {', '.join(decision['actions'])}" if decision else ""
+            self.email_notifier.send_alert(
+                app,
+                f"{alert_severity(anomaly)} severity rate anomaly detected",
+                f"Anomaly: {describe(anomaly)}{recommended}"
+            )
+            counts["alerts_sent"] += 1
+
+    def drain_metrics(self):
+        """Return the metrics counted since the last call and reset them"""
+        with self._metrics_lock:
+            metrics, self.metrics = self.metrics, Counter()
+        return metrics
+
+    def start_monitoring(self):
+        """Start the monitoring service"""
+        logging.info("Starting monitoring service...")
+        
+        # Schedule monitoring for each app on its own frequency, apps pushing
+        # their logs to the ingestion service are never polled
+        for app in self.apps:
+            if is_push_app(app):
+                continue
+            self.scheduler.add_app(get_app_id(app), app, get_frequency(app))
+        # Summaries go to the polled apps when their days and weeks end
+        self.summaries.start(self.scheduler.apps)
+        
+        # Run continuously, sleeping until the next app is due
+        self.scheduler.run_forever()
+
+    def stop_monitoring(self):
+        """Stop the monitoring service"""
+        self.scheduler.stop()
+        self.summaries.stop()
+        if self.archive:
+            self.archive.close()
@@ -0,0 +1,197 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import Counter, defaultdict
+from aiops.config import CONFIG_PATH, SHARD_COUNT, SHARD_REPORT_INTERVAL, REGISTRY_POLL_INTERVAL
+from aiops.registry import load_apps, get_app_id, get_frequency, is_push_app
+from aiops.sketches import TemplateSketches
+
+
+def shard_for(app_id, shard_count):
+    """Pick the shard owning an app by rendezvous hashing of its id
+
+    The choice only depends on the app id and the shard count, and changing
+    the shard count from n to n + 1 only moves about 1/(n + 1) of the apps.
+    """
+    def weight(shard):
+        digest = hashlib.blake2b(f"{shard}:{app_id}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+    return max(range(shard_count), key=weight)
+
+
+def run_shard(shard_index, commands, results):
+    """Worker process monitoring the apps assigned to one shard"""
+    from aiops.service import MonitoringService
+
+    service = MonitoringService()
+    scheduler_thread = threading.Thread(target=service.scheduler.run_forever, daemon=True)
+    scheduler_thread.start()
+    # Each shard reports on the apps it polls; its sketches are drained to
+    # the coordinator, so the summaries read a copy kept here
+    kept = TemplateSketches()
+    service.summaries.sketches = kept
+    service.summaries.start(service.scheduler.apps)
+    last_report = time.monotonic()
+
+    while True:
+        try:
+            command = commands.get(timeout=SHARD_REPORT_INTERVAL)
+        except queue.Empty:
+            command = None
+
+        if command is not None:
+            if command[0] == "add":
+                _, app_id, app = command
+                # Apps are re-sent when their registry entry changes
+                service.scheduler.add_app(app_id, app, get_frequency(app), replace=True)
+            elif command[0] == "remove":
+                service.scheduler.remove_app(command[1])
+            elif command[0] == "stop":
+                break
+
+        if time.monotonic() - last_report >= SHARD_REPORT_INTERVAL:
+            metrics = service.drain_metrics()
+            if metrics:
+                sketches = service.sketches.drain()
+                kept.merge(sketches)
+                results.put((shard_index, dict(metrics), sketches))
+            last_report = time.monotonic()
+
+    service.stop_monitoring()
+    scheduler_thread.join()
+    results.put((shard_index, dict(service.drain_metrics()), service.sketches.drain()))
+
+
+class ShardCoordinator:
+    """Partition registered apps across worker processes
+
+    Each worker runs its own MonitoringService and scheduler, so regex matching
+    and parsing for different apps run on different cores instead of sharing
+    one GIL. The coordinator follows registry changes, restarts dead workers,
+    rebalances when the shard count changes and merges the metrics and
+    template sketches reported by every shard.
+    """
+
+    def __init__(self, shard_count=SHARD_COUNT, registry_path=CONFIG_PATH):
+        self.shard_count = shard_count or os.cpu_count() or 1
+        self.registry_path = registry_path
+        self.context = multiprocessing.get_context("spawn")
+        self.results = self.context.Queue()
+        self.shards = {}  # shard index -> {"process", "commands"}
+        self.apps = {}  # app id -> app
+        self.assignments = {}  # app id -> shard index
+        self.metrics = Counter()
+        self.shard_metrics = defaultdict(Counter)
+        self.sketches = TemplateSketches()  # template counts and distinct sources of every shard
+        self._registry_mtime = None
+        self._running = False
+
+    def start(self):
+        """Start one worker process per shard and assign the registry"""
+        for shard_index in range(self.shard_count):
+            self._start_shard(shard_index)
+        self.sync_registry()
+
+    def run_forever(self):
+        """Supervise workers until stop() is called"""
+        self._running = True
+        self.start()
+        last_sync = time.monotonic()
+        while self._running:
+            self.collect_metrics(timeout=1)
+            self._restart_dead_shards()
+            if time.monotonic() - last_sync >= REGISTRY_POLL_INTERVAL:
+                self.sync_registry()
+                last_sync = time.monotonic()
+
+    def stop(self):
+        """Stop every worker and merge their final metrics"""
+        self._running = False
+        for shard in self.shards.values():
+            shard["commands"].put(("stop",))
+        for shard in self.shards.values():
+            shard["process"].join()
+        self.collect_metrics()
+        self.shards = {}
+
+    def sync_registry(self, force=False):
+        """Assign added apps and release removed ones after a registry change"""
+        try:
+            mtime = os.path.getmtime(self.registry_path)
+        except OSError:
+            mtime = None
+        if mtime == self._registry_mtime and not force:
+            return
+        self._registry_mtime = mtime
+
+        apps = {get_app_id(app): app for app in load_apps(self.registry_path) if not is_push_app(app)}
+        for app_id in set(self.apps) - set(apps):
+            self._send(self.assignments.pop(app_id), ("remove", app_id))
+        for app_id, app in apps.items():
+            if self.apps.get(app_id) != app:
+                self._assign(app_id, app)
+        self.apps = apps
+
+    def resize(self, shard_count):
+        """Change the number of worker processes and move the affected apps"""
+        for shard_index in range(self.shard_count, shard_count):
+            self._start_shard(shard_index)
+        previous = self.shard_count
+        self.shard_count = shard_count
+        for app_id, app in self.apps.items():
+            if shard_for(app_id, shard_count) != self.assignments.get(app_id):
+                self._assign(app_id, app)
+        for shard_index in range(shard_count, previous):
+            shard = self.shards.pop(shard_index)
+            shard["commands"].put(("stop",))
+            shard["process"].join()
+
+    def collect_metrics(self, timeout=0):
+        """Merge the metrics reported by the shards into the shared totals"""
+        try:
+            while True:
+                shard_index, metrics, sketches = self.results.get(timeout=timeout)
+                self.metrics.update(metrics)
+                self.sketches.merge(sketches)
+                self.shard_metrics[shard_index].update(metrics)
+                timeout = 0
+        except queue.Empty:
+            pass
+
+    def _assign(self, app_id, app):
+        shard_index = shard_for(app_id, self.shard_count)
+        previous = self.assignments.get(app_id)
+        if previous is not None and previous != shard_index and previous in self.shards:
+            self._send(previous, ("remove", app_id))
+        self.assignments[app_id] = shard_index
+        self._send(shard_index, ("add", app_id, app))
+
+    def _send(self, shard_index, command):
+        shard = self.shards.get(shard_index)
+        if shard is not None:
+            shard["commands"].put(command)
+
+    def _start_shard(self, shard_index):
+        commands = self.context.Queue()
+        process = self.context.Process(
+            target=run_shard,
+            args=(shard_index, commands, self.results),
+            name=f"monitor-shard-{shard_index}",
+            daemon=True
+        )
+        process.start()
+        self.shards[shard_index] = {"process": process, "commands": commands}
+
+    def _restart_dead_shards(self):
+        for shard_index, shard in list(self.shards.items()):
+            if shard["process"].is_alive():
+                continue
+            logging.error(f"Shard {shard_index} exited with code {shard['process'].exitcode}, restarting")
+            self._start_shard(shard_index)
+            for app_id, owner in self.assignments.items():
+                if owner == shard_index:
+                    self._send(shard_index, ("add", app_id, self.apps[app_id]))
@@ -0,0 +1,86 @@
+import threading
+from aiops.config import SIMILARITY_THRESHOLD, SIMILARITY_CAPACITY, SIMILARITY_DIMENSIONS
+from aiops.parser import parse_level, parse_message, template
+
+
+class SimilarAnalysisIndex:
+    """Reuse past AI analyses for log lines that read alike
+
+    Lines are reduced to their level and template, then embedded with a
+    stateless character n-gram hashing vectorizer (nothing to fit or
+    download), so the same failure with different hosts, ids or wording
+    details lands close together. Only lines of the same partition (level
+    and category) are compared, so a success line never gets the analysis
+    of a failure that reads alike. Embeddings sit in a fixed-size numpy
+    matrix searched by brute force: one matrix-vector product per lookup, a
+    few milliseconds at full capacity. When full, the oldest analyses are
+    overwritten. numpy and scikit-learn are only loaded on first use.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, capacity=SIMILARITY_CAPACITY,
+                 dimensions=SIMILARITY_DIMENSIONS):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.dimensions = dimensions
+        self.vectorizer = None
+        self.vectors = None
+        self.partitions = None  # partition id of each row
+        self._partition_ids = {}
+        self.analyses = [None] * capacity
+        self.size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        """Build the vectorizer and the embedding matrix, holding the lock"""
+        import numpy as np
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(
+            analyzer="char_wb", ngram_range=(3, 5), n_features=self.dimensions,
+            alternate_sign=False, norm="l2", lowercase=True
+        )
+        self.vectors = np.zeros((self.capacity, self.dimensions), dtype=np.float32)
+        self.partitions = np.full(self.capacity, -1, dtype=np.int32)
+
+    def embed(self, log_entry):
+        """Return the unit-length embedding of a log line, its level included"""
+        with self._lock:
+            if self.vectorizer is None:
+                self._load()
+        text = f"{parse_level(log_entry) or 'INFO'} {template(parse_message(log_entry))}"
+        return self.vectorizer.transform([text]).toarray()[0].astype("float32")
+
+    def partition(self, log_entry, category=None):
+        """Return the partition of a log line: its level and category"""
+        return parse_level(log_entry) or "INFO", category or "UNKNOWN"
+
+    def lookup(self, vector, partition=None):
+        """Return (analysis, similarity) of the closest past line of a partition above the threshold, or None"""
+        with self._lock:
+            partition_id = self._partition_ids.get(partition)
+            if self.size and partition_id is not None:
+                scores = self.vectors[:self.size] @ vector
+                scores[self.partitions[:self.size] != partition_id] = -1
+                best = int(scores.argmax())
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self.analyses[best], float(scores[best])
+            self.misses += 1
+            return None
+
+    def add(self, vector, analysis, partition=None):
+        """Remember the analysis of a line of a partition"""
+        with self._lock:
+            if self.vectors is None:
+                self._load()
+            self.vectors[self._next] = vector
+            self.partitions[self._next] = self._partition_ids.setdefault(partition, len(self._partition_ids))
+            self.analyses[self._next] = analysis
+            self._next = (self._next + 1) % len(self.analyses)
+            self.size = min(self.size + 1, len(self.analyses))
+
+    def stats(self):
+        return {"size": self.size, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,268 @@
+import hashlib
+import heapq
+import math
+import threading
+from array import array
+from aiops.config import (
+    SKETCH_BUCKET_SECONDS, SKETCH_BUCKETS_KEPT, SKETCH_WIDTH, SKETCH_DEPTH, SKETCH_HLL_PRECISION,
+    SKETCH_TOP_TEMPLATES
+)
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash128(key):
+    """Return two independent 64-bit hashes of a string, the same in every process"""
+    digest = hashlib.blake2b(key.encode("utf-8", "replace"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+
+
+class CountMinSketch:
+    """Approximate per-key counts in ``width`` x ``depth`` 64-bit counters
+
+    Estimates never undercount; they overcount by at most about
+    e / width of the total with probability 1 - e^-depth. Sketches of the
+    same shape merge by adding their counters.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = array("Q", bytes(8 * width * depth))
+
+    def _cells(self, key):
+        h1, h2 = _hash128(key)
+        h2 |= 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        for cell in self._cells(key):
+            self.table[cell] += count
+
+    def estimate(self, key):
+        return min(self.table[cell] for cell in self._cells(key))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-min sketches of different shapes cannot be merged")
+        table = self.table
+        for cell, value in enumerate(other.table):
+            if value:
+                table[cell] += value
+
+
+class HyperLogLog:
+    """Approximate distinct count in 2^precision one-byte registers
+
+    The standard error is about 1.04 / sqrt(2^precision), 3% at the default
+    precision of 10 (1 KB). Sketches of the same precision merge by keeping
+    the larger register.
+    """
+
+    def __init__(self, precision=SKETCH_HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = _hash128(value)[0]
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities are counted by the empty registers instead
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLogs of different precisions cannot be merged")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class SpaceSaving:
+    """Approximate top-``k`` heavy hitters of a stream in ``k`` counters
+
+    When a new key arrives and every counter is taken, the smallest counter
+    is handed to it and keeps its count as the new key's possible
+    overestimate (``error``). Any key seen more than total / k times is
+    guaranteed to be tracked. The smallest counter is found with a lazy
+    min-heap, so every update is O(log k).
+    """
+
+    def __init__(self, k=SKETCH_TOP_TEMPLATES):
+        self.k = k
+        self.counters = {}  # key -> [count, error]
+        self._heap = []  # (count, key), entries of keys whose count has changed are stale
+
+    def add(self, key, count=1):
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.k:
+            counter = self.counters[key] = [count, 0]
+        else:
+            floor, smallest = self._smallest()
+            heapq.heappop(self._heap)
+            del self.counters[smallest]
+            counter = self.counters[key] = [floor + count, floor]
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 4 * self.k:
+            self._rebuild()
+
+    def _smallest(self):
+        """Return (count, key) of the smallest counter, dropping stale heap entries above it"""
+        heap = self._heap
+        while True:
+            count, key = heap[0]
+            counter = self.counters.get(key)
+            if counter is not None and counter[0] == count:
+                return count, key
+            heapq.heappop(heap)
+
+    def _rebuild(self):
+        self._heap = [(count, key) for key, (count, _) in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def _floor(self):
+        return self._smallest()[0] if len(self.counters) >= self.k else 0
+
+    def merge(self, other):
+        """Fold in another summary; keys missing on one side are assumed to have its smallest count"""
+        floor, other_floor = self._floor(), other._floor()
+        merged = {}
+        for key in set(self.counters) | set(other.counters):
+            count, error = self.counters.get(key, (floor, floor))
+            other_count, other_error = other.counters.get(key, (other_floor, other_floor))
+            merged[key] = [count + other_count, error + other_error]
+        top = heapq.nlargest(self.k, merged, key=lambda key: merged[key][0])
+        self.counters = {key: merged[key] for key in top}
+        self._rebuild()
+
+    def top(self, n=None):
+        """Return (key, count, error) of the heaviest keys, heaviest first"""
+        ranked = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, count, error) for key, (count, error) in ranked[:n]]
+
+
+class _Bucket:
+    """Sketches of one app over one time bucket"""
+
+    def __init__(self):
+        self.total = 0
+        self.templates = CountMinSketch()
+        self.heavy = SpaceSaving()  # candidate templates to list, counted by the count-min sketch
+        self.sources = HyperLogLog()
+
+    def merge(self, other):
+        self.total += other.total
+        self.templates.merge(other.templates)
+        self.heavy.merge(other.heavy)
+        self.sources.merge(other.sources)
+
+
+class TemplateSketches:
+    """Per-app, per-time-bucket template counts and distinct sources in fixed memory
+
+    Each bucket holds a count-min sketch of template frequencies, a
+    Space-Saving list of the templates worth listing and a HyperLogLog of
+    distinct sources (IPs, request IDs), about 20 KB whatever the
+    cardinality, and at most ``buckets_kept`` buckets are kept per app.
+    Lines kept by sampling are added with the inverse of their sampling
+    rate as ``count``, so estimates stay close to the true counts. Sketches
+    from other shards or processes are folded in with ``merge``.
+    """
+
+    def __init__(self, bucket_seconds=SKETCH_BUCKET_SECONDS, buckets_kept=SKETCH_BUCKETS_KEPT):
+        self.bucket_seconds = bucket_seconds
+        self.buckets_kept = buckets_kept
+        self._lock = threading.Lock()
+        self._apps = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _bucket(self, app_id, start):
+        buckets = self._apps.setdefault(app_id, {})
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = _Bucket()
+            if len(buckets) > self.buckets_kept:
+                del buckets[min(buckets)]
+        return bucket
+
+    def add(self, app_id, template, timestamp, sources=(), count=1):
+        """Count ``count`` lines of a template logged at a unix timestamp by ``sources``"""
+        start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            bucket = self._bucket(app_id, start)
+            bucket.total += count
+            bucket.templates.add(template, count)
+            bucket.heavy.add(template, count)
+            for source in sources:
+                bucket.sources.add(source)
+
+    def merge(self, other):
+        """Fold in the sketches of another TemplateSketches with the same bucket size"""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("Sketches with different bucket sizes cannot be merged")
+        with self._lock:
+            for app_id, buckets in other._apps.items():
+                for start, bucket in buckets.items():
+                    self._bucket(app_id, start).merge(bucket)
+
+    def drain(self):
+        """Return the sketches gathered so far and start over, to ship them to another process"""
+        with self._lock:
+            drained = TemplateSketches(self.bucket_seconds, self.buckets_kept)
+            drained._apps, self._apps = self._apps, {}
+        return drained
+
+    def _buckets(self, app_id, start, end):
+        return [bucket for bucket_start, bucket in self._apps.get(app_id, {}).items()
+                if (start is None or bucket_start + self.bucket_seconds > start)
+                and (end is None or bucket_start <= end)]
+
+    def estimate(self, app_id, template, start=None, end=None):
+        """Estimated lines of a template logged by an app in the buckets overlapping [start, end]"""
+        with self._lock:
+            return sum(bucket.templates.estimate(template) for bucket in self._buckets(app_id, start, end))
+
+    def top_templates(self, app_id, n=10, start=None, end=None):
+        """Return (template, estimated lines) of an app's most frequent templates in [start, end]"""
+        with self._lock:
+            buckets = self._buckets(app_id, start, end)
+            candidates = {template for bucket in buckets for template in bucket.heavy.counters}
+            counts = {template: sum(bucket.templates.estimate(template) for bucket in buckets)
+                      for template in candidates}
+        return heapq.nlargest(n, counts.items(), key=lambda item: item[1])
+
+    def total(self, app_id, start=None, end=None):
+        """Lines of an app in the buckets overlapping [start, end]"""
+        with self._lock:
+            return sum(bucket.total for bucket in self._buckets(app_id, start, end))
+
+    def distinct_sources(self, app_id, start=None, end=None):
+        """Estimated distinct sources of an app in the buckets overlapping [start, end]"""
+        with self._lock:
+            merged = HyperLogLog()
+            for bucket in self._buckets(app_id, start, end):
+                merged.merge(bucket.sources)
+            return merged.count()
+
+    def apps(self):
+        with self._lock:
+            return list(self._apps)
@@ -0,0 +1,203 @@
+import html
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from aiops.config import SUMMARY_REPORTS, SUMMARY_TOP_K, SUMMARY_TOP_ISSUES, SUMMARY_DAYS_KEPT, SUMMARY_CHECK_SECONDS
+from aiops.registry import get_app_id
+from aiops.rules import describe_action
+from aiops.sketches import SpaceSaving
+
+# Recommendations listed in a summary at most
+MAX_RECOMMENDATIONS = 5
+
+
+class _DayRollup:
+    """Counters and top error templates of one app over one day"""
+
+    def __init__(self, k):
+        self.total_logs = 0
+        self.high_severity = 0
+        self.medium_severity = 0
+        self.automated_actions = 0
+        self.issues = SpaceSaving(k)
+
+    def merge(self, other):
+        self.total_logs += other.total_logs
+        self.high_severity += other.high_severity
+        self.medium_severity += other.medium_severity
+        self.automated_actions += other.automated_actions
+        self.issues.merge(other.issues)
+
+
+class IssueRollups:
+    """Daily per-app rollups maintained as logs are analyzed
+
+    Each day of an app costs a few counters and a Space-Saving summary of
+    ``k`` error templates, so a daily or weekly summary is built from at most
+    seven rollups, O(k), without reading any log again.
+    """
+
+    def __init__(self, k=SUMMARY_TOP_K, days_kept=SUMMARY_DAYS_KEPT):
+        self.k = k
+        self.days_kept = days_kept
+        self._lock = threading.Lock()
+        self._apps = {}
+
+    def _day(self, app_id, timestamp):
+        day = datetime.fromtimestamp(timestamp).date()
+        days = self._apps.setdefault(app_id, {})
+        rollup = days.get(day)
+        if rollup is None:
+            rollup = days[day] = _DayRollup(self.k)
+            if len(days) > self.days_kept:
+                del days[min(days)]
+        return rollup
+
+    def record(self, app_id, timestamp, severity, issue=None, count=1):
+        """Count analyzed logs of a severity at a unix timestamp, ``issue`` being an error template"""
+        with self._lock:
+            rollup = self._day(app_id, timestamp)
+            rollup.total_logs += count
+            if severity == "HIGH":
+                rollup.high_severity += count
+            elif severity == "MEDIUM":
+                rollup.medium_severity += count
+            if issue:
+                rollup.issues.add(issue, count)
+
+    def record_actions(self, app_id, timestamp, count):
+        """Count automated actions taken for an app"""
+        if count:
+            with self._lock:
+                self._day(app_id, timestamp).automated_actions += count
+
+    def rollup(self, app_id, first_day, last_day):
+        """Return the merged rollup of an app's days from ``first_day`` to ``last_day``"""
+        merged = _DayRollup(self.k)
+        with self._lock:
+            for day, rollup in self._apps.get(app_id, {}).items():
+                if first_day <= day <= last_day:
+                    merged.merge(rollup)
+        return merged
+
+
+def build_summary(rollup, period, rules=None, top_issues=SUMMARY_TOP_ISSUES, sketched=None):
+    """Build the ``summary_data`` of EmailNotifier.send_summary from a rollup
+
+    Recommendations are the actions the remediation rules take for the top
+    issues. Issues are log templates, escaped as they end up in an HTML email.
+    ``sketched`` is (top templates, distinct sources) from the template
+    sketches, which count every line, sampled or not.
+    """
+    issues = rollup.issues.top(top_issues)
+    recommendations = []
+    for issue, _, _ in issues:
+        decision = rules.evaluate("ERROR", issue) if rules else None
+        for action in decision["actions"] if decision else ():
+            recommendation = describe_action(action)
+            if recommendation not in recommendations:
+                recommendations.append(recommendation)
+    return {
+        "period": period,
+        "total_logs": rollup.total_logs,
+        "high_severity": rollup.high_severity,
+        "medium_severity": rollup.medium_severity,
+        "automated_actions": rollup.automated_actions,
+        "top_issues": [f"{html.escape(issue)} ({count} occurrences)" for issue, count, _ in issues],
+        "recommendations": recommendations[:MAX_RECOMMENDATIONS],
+        **({
+            "top_templates": [f"{html.escape(name)} (~{count} lines)" for name, count in sketched[0]],
+            "distinct_sources": sketched[1]
+        } if sketched else {})
+    }
+
+
+def _periods(day):
+    """Return the daily and weekly periods containing a day as {kind: (first_day, last_day)}"""
+    monday = day - timedelta(days=day.weekday())
+    return {"daily": (day, day), "weekly": (monday, monday + timedelta(days=6))}
+
+
+class SummaryJob:
+    """Send each app a summary when a daily or weekly period ends
+
+    Once started, a background thread checks every app every
+    ``check_seconds``, so apps that have gone quiet get their reports too;
+    the first check after a period ends sends that period's summary.
+    Periods that were already running when the job started are not
+    reported, so a restart does not send partial summaries.
+    """
+
+    def __init__(self, rollups, notifier, tables=None, reports=SUMMARY_REPORTS, check_seconds=SUMMARY_CHECK_SECONDS,
+                 sketches=None):
+        self.rollups = rollups
+        self.sketches = sketches  # TemplateSketches adding template counts and distinct sources to the summaries
+        self.notifier = notifier
+        self.tables = tables
+        self.reports = [kind.strip() for kind in reports.split(",") if kind.strip()]
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._current = {}  # (app id, kind) -> period being gathered
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, apps):
+        """Check the apps returned by ``apps()`` for ended periods until stopped"""
+        if not self.reports or self._thread:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(apps,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, apps):
+        while True:
+            try:
+                for app in apps():
+                    self.send_due(get_app_id(app), app)
+            except Exception as e:
+                logging.error(f"Error checking summaries: {str(e)}")
+            if self._stopped.wait(self.check_seconds):
+                return
+
+    def _sketched(self, app_id, first_day, last_day):
+        """Return (top templates, distinct sources) of a period, None unless the sketches still cover all of it"""
+        if not self.sketches:
+            return None
+        start = datetime.combine(first_day, datetime.min.time()).timestamp()
+        end = datetime.combine(last_day + timedelta(days=1), datetime.min.time()).timestamp() - 1
+        if end - start > self.sketches.bucket_seconds * (self.sketches.buckets_kept - 1):
+            return None
+        return (self.sketches.top_templates(app_id, SUMMARY_TOP_ISSUES, start, end),
+                self.sketches.distinct_sources(app_id, start, end))
+
+    def send_due(self, app_id, app, today=None):
+        """Send the summaries of the periods that ended for an app, returning how many were sent"""
+        today = today or date.today()
+        due = []
+        with self._lock:
+            for kind, period in _periods(today).items():
+                if kind not in self.reports:
+                    continue
+                previous = self._current.get((app_id, kind))
+                self._current[app_id, kind] = period
+                if previous is not None and previous != period:
+                    due.append((kind, previous))
+
+        sent = 0
+        for kind, (first_day, last_day) in due:
+            label = first_day.isoformat() if first_day == last_day else f"{first_day.isoformat()} to {last_day.isoformat()}"
+            rules = self.tables.current.rules if self.tables else None
+            summary_data = build_summary(self.rollups.rollup(app_id, first_day, last_day), f"{kind.title()} {label}", rules,
+                                         sketched=self._sketched(app_id, first_day, last_day))
+            try:
+                if self.notifier.send_summary(app, summary_data):
+                    sent += 1
+            except Exception as e:
+                logging.error(f"Error sending {kind} summary for {app_id}: {str(e)}")
+        return sent
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import threading
+from aiops.config import TABLES_DIR, TABLES_HOT_RELOAD, TABLES_POLL_SECONDS
+from aiops.matcher import ERROR_PATTERNS, APP_LOG_PATTERNS, app_pattern_matcher, error_pattern_matcher
+from aiops.rules import REMEDIATION_RULES, RuleEngine
+
+# Table files and the built-in defaults used when one is missing
+TABLE_FILES = {
+    "error_patterns": ("error_patterns.json", ERROR_PATTERNS),
+    "app_log_patterns": ("app_log_patterns.json", APP_LOG_PATTERNS),
+    "remediation_rules": ("remediation_rules.json", REMEDIATION_RULES),
+}
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def _check_entries(name, table, fields):
+    if not isinstance(table, dict):
+        raise ValueError(f"{name} must map pattern names to entries")
+    for key, info in table.items():
+        missing = [field for field in fields if field not in info]
+        if missing:
+            raise ValueError(f"{name} entry {key!r} is missing {', '.join(missing)}")
+
+
+class Tables:
+    """One version of the pattern and rule tables, compiled and never modified once published"""
+
+    def __init__(self, error_patterns, app_log_patterns, remediation_rules, version=0):
+        _check_entries("error_patterns", error_patterns, ("category", "severity", "automated_actions"))
+        _check_entries("app_log_patterns", app_log_patterns, ("patterns", "severity", "auto_fix"))
+        self.version = version
+        self.error_patterns = error_patterns
+        self.app_log_patterns = app_log_patterns
+        self.remediation_rules = remediation_rules
+        self.error_matcher = error_pattern_matcher(error_patterns)
+        self.app_matcher = app_pattern_matcher(app_log_patterns)
+        self.rules = RuleEngine(remediation_rules)
+
+
+class TableStore:
+    """Pattern and rule tables read from JSON files and reloaded when they change
+
+    A watcher thread checks the files' modification times; a change is
+    loaded and compiled on that thread, then published by replacing
+    ``current`` in one assignment. Readers take ``current`` once per batch
+    (or line) and keep using that version, so in-flight work finishes on the
+    tables it started with. A file that fails to load or validate is logged
+    and the running version stays in force. The files in ``tables/`` are
+    the source of truth; a missing one falls back to the built-in defaults
+    in memory, and nothing is ever written.
+    """
+
+    def __init__(self, directory=TABLES_DIR, poll_seconds=TABLES_POLL_SECONDS):
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stamp = None
+        self.current = Tables(*(default for _, default in TABLE_FILES.values()))
+        self.reload()
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _file_stamp(self):
+        stamp = []
+        for filename, _ in TABLE_FILES.values():
+            try:
+                stat = os.stat(self._path(filename))
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _load(self):
+        tables = []
+        for filename, default in TABLE_FILES.values():
+            try:
+                with open(self._path(filename), 'r') as f:
+                    tables.append(json.load(f))
+            except FileNotFoundError:
+                logging.warning(f"{self._path(filename)} not found, using the built-in defaults")
+                tables.append(default)
+        return Tables(*tables, version=self.current.version + 1)
+
+    def reload(self):
+        """Load and publish the tables if their files changed, returning True if a new version is in force"""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            # A broken file is not retried until it changes again
+            self._stamp = stamp
+            try:
+                tables = self._load()
+            except Exception as e:
+                logging.error(f"Error loading pattern tables, keeping version {self.current.version}: {str(e)}")
+                return False
+            self.current = tables
+        logging.info(f"Pattern tables version {tables.version} loaded from {self.directory}")
+        return True
+
+    def start(self):
+        """Watch the table files for changes in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="table-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.reload()
+            except Exception as e:
+                logging.error(f"Error watching pattern tables: {str(e)}")
+
+
+def shared_tables():
+    """Return the process-wide table store, watching its files when hot reload is on"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TableStore()
+            if TABLES_HOT_RELOAD:
+                _shared.start()
+        return _shared
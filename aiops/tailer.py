@@ -0,0 +1,75 @@
+import logging
+import os
+import re
+import threading
+from watchdog.events import FileSystemEventHandler
+from aiops.segments import follow, live_path
+
+# Live log files and their rotated segments (app.log.1, app.log.2.gz, app.log-20240101.zst)
+_LOG_FILE_RE = re.compile(r"\.log(?:\.\d+|[-.]\d{8,14})?(?:\.gz|\.zst|\.zstd)?$")
+
+
+class LogEventHandler(FileSystemEventHandler):
+    """Publish lines appended to log files, following them across rotations
+
+    Each live file has a cursor (see ``aiops.segments.follow``), so after a
+    rotation, or after downtime when ``cursors`` persists them, reading
+    resumes in the rotated segment it stopped in, compressed or not, and
+    goes on through its successors up to the live file. With a
+    ``journal`` the lines are made durable in it before the cursor is saved.
+    """
+
+    def __init__(self, log_buffer, cursors=None, path=None, journal=None):
+        self.log_buffer = log_buffer
+        self.journal = journal  # optional LineJournal keeping lines durably until analyzed
+        self.cursors = cursors  # optional CursorStore keeping positions between runs
+        self.path = os.path.abspath(path) if path else None  # only follow this live file
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._changed(event.src_path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._changed(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._changed(event.dest_path)
+
+    def _changed(self, path):
+        if _LOG_FILE_RE.search(path):
+            path = live_path(path)
+            if (self.path is None or os.path.abspath(path) == self.path) and os.path.exists(path):
+                self.catch_up(path)
+
+    def catch_up(self, path):
+        """Publish every line logged to ``path`` and its rotated segments since the last read"""
+        with self._lock:
+            key = os.path.abspath(path)
+            cursor = self._positions.get(key)
+            if cursor is None and self.cursors:
+                cursor = self.cursors.get(key) or None
+            try:
+                for lines, cursor in follow(path, cursor):
+                    if lines:
+                        logging.info(f"New log entries detected: {len(lines)}")
+                        if self.journal:
+                            self.journal.append(lines)
+                        # Publish to the analyzer and every dashboard viewer
+                        self.log_buffer.extend(lines)
+                    self._positions[key] = cursor
+            except Exception as e:
+                logging.error(f"Error reading log file: {e}")
+            if self.journal:
+                try:
+                    # One fsync for everything read, before the saved cursor moves past it
+                    self.journal.sync()
+                except Exception as e:
+                    logging.error(f"Error syncing the line journal: {str(e)}")
+                    return
+            if self.cursors and key in self._positions:
+                self.cursors.stage(key, self._positions[key])
+                self.cursors.commit(key)
@@ -1,153 +1,51 @@
 import streamlit as st
-import json
 import time
-from datetime import datetime
-import os
-import requests
+import html
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from aiops.application_monitor import ApplicationMonitor
+from aiops.archive import archived_apps, read_events
+from aiops.search import LogSearchIndex
 
 # Load environment variables
 load_dotenv()
 
-class ApplicationMonitor:
-    def __init__(self):
-        self.applications = {}
-        self.log_patterns = {
-            "database": {
-                "patterns": ["connection failed", "timeout", "deadlock"],
-                "severity": "HIGH",
-                "auto_fix": ["restart_database", "check_connection"]
-            },
-            "memory": {
-                "patterns": ["out of memory", "memory limit exceeded"],
-                "severity": "HIGH",
-                "auto_fix": ["clear_cache", "scale_resources"]
-            },
-            "performance": {
-                "patterns": ["slow response", "high latency"],
-                "severity": "MEDIUM",
-                "auto_fix": ["optimize_query", "scale_resources"]
-            }
-        }
-        
-    def register_application(self, app_data):
-        """Register a new application for monitoring"""
-        app_id = f"app_{len(self.applications) + 1}"
-        self.applications[app_id] = {
-            "basic_info": {
-                "name": app_data["name"],
-                "url": app_data["url"],
-                "environment": app_data["environment"],
-                "registration_date": app_data["registration_date"],
-                "status": app_data["status"]
-            },
-            "client_info": app_data["client"],
-            "technical_info": app_data["technical"],
-            "monitoring_config": app_data["monitoring"],
-            "notes": app_data["notes"],
-            "logs": [],
-            "metrics": {
-                "uptime": 100.0,
-                "response_time": 0,
-                "error_rate": 0.0,
-                "last_check": datetime.now().isoformat()
-            }
-        }
-        return app_id
+TIME_RANGES = {
+    "All Time": None,
+    "Last Hour": timedelta(hours=1),
+    "Last 24 Hours": timedelta(days=1),
+    "Last 7 Days": timedelta(days=7)
+}
 
-    def generate_ai_analysis(self, log_entry, app_id):
-        """Generate AI analysis for a log entry with application context"""
-        app_info = self.applications[app_id]
-        
-        # Enhanced AI analysis based on application context
-        analysis = {
-            "severity": "HIGH" if "error" in log_entry.lower() else "MEDIUM",
-            "analysis": "AI analysis of the log entry",
-            "recommended_actions": ["action1", "action2"],
-            "impact": {
-                "uptime": "High" if "error" in log_entry.lower() else "Low",
-                "performance": "High" if "slow" in log_entry.lower() else "Low",
-                "security": "High" if "security" in log_entry.lower() else "Low"
-            }
-        }
-        
-        # Add SLA compliance check
-        if "error" in log_entry.lower():
-            analysis["sla_compliance"] = "At Risk"
-        else:
-            analysis["sla_compliance"] = "Compliant"
-            
-        return analysis
 
-    def process_log(self, app_id, log_entry):
-        """Process and analyze a log entry with enhanced context"""
-        if app_id not in self.applications:
-            return None
+# Each session has its own monitor, these are cheap reads of it and are not cached across sessions
+def overview_stats(monitor):
+    """Read the overview widgets from a monitor's running aggregates"""
+    stats = monitor.aggregates.snapshot()
+    return {
+        "total_apps": stats["total_apps"],
+        "total_logs": stats["total"],
+        "high_severity": stats["by_severity"].get("HIGH", 0)
+    }
 
-        # Add timestamp and enhanced analysis
-        log_data = {
-            "timestamp": datetime.now().isoformat(),
-            "entry": log_entry,
-            "analysis": self.generate_ai_analysis(log_entry, app_id)
-        }
 
-        # Check for known patterns with application context
-        for category, pattern_data in self.log_patterns.items():
-            for pattern in pattern_data["patterns"]:
-                if pattern in log_entry.lower():
-                    log_data["category"] = category
-                    log_data["severity"] = pattern_data["severity"]
-                    log_data["auto_fix"] = pattern_data["auto_fix"]
-                    break
+@st.cache_resource
+def search_index():
+    """One connection to the full-text index shared by every session"""
+    return LogSearchIndex()
 
-        # Update application metrics
-        self.update_metrics(app_id, log_data)
-        
-        self.applications[app_id]["logs"].append(log_data)
-        return log_data
 
-    def update_metrics(self, app_id, log_data):
-        """Update application metrics based on log analysis"""
-        app = self.applications[app_id]
-        
-        # Update error rate
-        if log_data["analysis"]["severity"] == "HIGH":
-            app["metrics"]["error_rate"] = min(100.0, app["metrics"]["error_rate"] + 0.1)
-        
-        # Update uptime
-        if log_data["analysis"]["severity"] == "HIGH":
-            app["metrics"]["uptime"] = max(0.0, app["metrics"]["uptime"] - 0.1)
-            
-        # Update last check time
-        app["metrics"]["last_check"] = datetime.now().isoformat()
+@st.cache_data(ttl=60, max_entries=16)
+def archived_history(app_ids, start, end, severities):
+    """Read archived events, only the selected apps, days and columns are loaded"""
+    return read_events(list(app_ids) or None, start, end, list(severities) or None,
+                       columns=["timestamp", "app", "severity", "category", "message", "automated_actions"])
+
+
+def recent_high_issues(monitor, limit=10):
+    """Return the latest HIGH severity logs across all apps, newest first"""
+    return list(reversed(monitor.recent_issues))[:limit]
 
-    def get_application_status(self, app_id):
-        """Get current status of an application with enhanced metrics"""
-        if app_id not in self.applications:
-            return None
-            
-        app = self.applications[app_id]
-        return {
-            "basic_info": app["basic_info"],
-            "metrics": app["metrics"],
-            "last_log": app["logs"][-1] if app["logs"] else None,
-            "sla_compliance": self.check_sla_compliance(app_id)
-        }
-        
-    def check_sla_compliance(self, app_id):
-        """Check if application is meeting SLA requirements"""
-        app = self.applications[app_id]
-        metrics = app["metrics"]
-        requirements = app["monitoring_config"]["sla"]
-        
-        compliance = {
-            "uptime": metrics["uptime"] >= requirements["uptime"],
-            "response_time": metrics["response_time"] <= requirements["response_time"],
-            "overall": True
-        }
-        
-        compliance["overall"] = all(compliance.values())
-        return compliance
 
 # Initialize the Streamlit app
 st.set_page_config(page_title="AI-Powered Application Monitor", layout="wide")
@@ -158,7 +56,7 @@ if 'monitor' not in st.session_state:
     st.session_state.monitor = ApplicationMonitor()
 
 # Create tabs for different functionalities
-tab1, tab2, tab3 = st.tabs(["Register Application", "View Logs", "AI Analysis"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["Register Application", "View Logs", "AI Analysis", "History", "Search"])
 
 with tab1:
     st.header("Register New Application")
@@ -273,10 +171,37 @@ with tab2:
                         log_data = st.session_state.monitor.process_log(selected_app, log_message)
                         st.success("Log added and analyzed!")
             
-            # Display logs
-            if app_data["logs"]:
+            # Display one page of logs matching the filters
+            logs = app_data["logs"]
+            if logs:
                 st.subheader("Recent Logs")
-                for log in reversed(app_data["logs"]):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    severity_filter = st.selectbox("Severity", ["All"] + logs.severities())
+                with col2:
+                    category_filter = st.selectbox("Category", ["All"] + logs.categories())
+                with col3:
+                    time_filter = st.selectbox("Time Range", list(TIME_RANGES))
+                with col4:
+                    page_size = st.selectbox("Logs per Page", [10, 25, 50, 100])
+                search = st.text_input("Search Logs")
+                
+                filters = {
+                    "severity": None if severity_filter == "All" else severity_filter,
+                    "category": None if category_filter == "All" else category_filter,
+                    "start": (datetime.now() - TIME_RANGES[time_filter]).isoformat() if TIME_RANGES[time_filter] else None,
+                    "search": search or None
+                }
+                _, total = logs.query(limit=0, **filters)
+                total_pages = max(1, -(-total // page_size))
+                if st.session_state.get("log_page", 1) > total_pages:
+                    st.session_state.log_page = total_pages
+                page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, key="log_page")
+                st.caption(f"{total} matching logs")
+                
+                # Only the visible slice is materialized and rendered
+                page_logs, _ = logs.query(offset=(page - 1) * page_size, limit=page_size, **filters)
+                for log in page_logs:
                     with st.expander(f"{log['timestamp']} - {log['entry']}"):
                         st.write(f"**Severity:** {log['analysis']['severity']}")
                         st.write(f"**Analysis:** {log['analysis']['analysis']}")
@@ -288,27 +213,75 @@ with tab3:
     st.header("AI Analysis Dashboard")
     if st.session_state.monitor.applications:
         # Display overall statistics
-        total_apps = len(st.session_state.monitor.applications)
-        total_logs = sum(len(app["logs"]) for app in st.session_state.monitor.applications.values())
+        stats = overview_stats(st.session_state.monitor)
         
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Applications", total_apps)
+            st.metric("Total Applications", stats["total_apps"])
         with col2:
-            st.metric("Total Logs Analyzed", total_logs)
+            st.metric("Total Logs Analyzed", stats["total_logs"])
+        with col3:
+            st.metric("High Severity Issues", stats["high_severity"])
         
         # Display recent issues
         st.subheader("Recent Issues")
-        for app_id, app_data in st.session_state.monitor.applications.items():
-            for log in app_data["logs"][-5:]:  # Show last 5 logs
-                if log["analysis"]["severity"] == "HIGH":
-                    with st.expander(f"🚨 {app_data['basic_info']['name']} - {log['entry']}"):
-                        st.write(f"**Time:** {log['timestamp']}")
-                        st.write(f"**Analysis:** {log['analysis']['analysis']}")
-                        st.write(f"**Auto-Fix Actions:** {', '.join(log['analysis']['recommended_actions'])}")
-                        if st.button("Execute Auto-Fix", key=f"fix_{log['timestamp']}"):
-                            st.info("Executing automated fixes...")
-                            time.sleep(2)
-                            st.success("Issues resolved automatically!")
+        for app_id, log in recent_high_issues(st.session_state.monitor):
+            app_data = st.session_state.monitor.applications[app_id]
+            with st.expander(f"🚨 {app_data['basic_info']['name']} - {log['entry']}"):
+                st.write(f"**Time:** {log['timestamp']}")
+                st.write(f"**Analysis:** {log['analysis']['analysis']}")
+                st.write(f"**Auto-Fix Actions:** {', '.join(log['analysis']['recommended_actions'])}")
+                if st.button("Execute Auto-Fix", key=f"fix_{app_id}_{log['timestamp']}"):
+                    st.info("Executing automated fixes...")
+                    time.sleep(2)
+                    st.success("Issues resolved automatically!")
+    else:
+        st.info("No applications registered yet. Please register an application first.")
+
+with tab4:
+    st.header("Archived Events")
+    apps = archived_apps()
+    if apps:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            app_filter = st.multiselect("Applications", apps)
+        with col2:
+            date_range = st.date_input("Dates", (datetime.now().date() - timedelta(days=7), datetime.now().date()))
+        with col3:
+            severity_filter = st.multiselect("Severity", ["HIGH", "MEDIUM", "LOW", "UNKNOWN"], default=["HIGH"])
+        
+        # While picking a range only its first date is set, it is both the start and the end
+        dates = date_range if isinstance(date_range, tuple) else (date_range,)
+        start, end = (dates * 2)[:2] if dates else (None, None)
+        events = archived_history(tuple(app_filter), start, end, tuple(severity_filter))
+        st.caption(f"{len(events)} archived events")
+        st.dataframe(events, use_container_width=True, hide_index=True)
     else:
-        st.info("No applications registered yet. Please register an application first.") 
\ No newline at end of file
+        st.info("No archived events yet. The monitoring service archives every log it analyzes.")
+
+with tab5:
+    st.header("Search Logs")
+    index = search_index()
+    query = st.text_input("Search", placeholder='e.g. DB-4821, "connection failed", timeout*')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        search_apps = st.multiselect("Applications", index.apps(), key="search_apps")
+    with col2:
+        search_severities = st.multiselect("Severity", ["HIGH", "MEDIUM", "LOW", "UNKNOWN"], key="search_severities")
+    with col3:
+        search_range = st.selectbox("Time Range", list(TIME_RANGES), key="search_range")
+    
+    started = time.perf_counter()
+    # Control characters mark the matches so the rest of the snippet can be escaped
+    results = index.search(
+        query, search_apps, search_severities,
+        start=datetime.now() - TIME_RANGES[search_range] if TIME_RANGES[search_range] else None,
+        limit=100, highlight=("\x02", "\x03")
+    )
+    st.caption(f"{len(results)} results in {(time.perf_counter() - started) * 1000:.0f} ms")
+    for result in results:
+        snippet = html.escape(result["snippet"]).replace("\x02", "<mark>").replace("\x03", "</mark>")
+        st.markdown(
+            f"**{html.escape(result['app'])}** · {result['timestamp']} · {result['severity']}<br>{snippet}",
+            unsafe_allow_html=True
+        )
@@ -1,7 +1,10 @@
 import streamlit as st
 import json
 import os
+import secrets
+import uuid
 from datetime import datetime
+from aiops.registry import PUSH_LOG_SOURCE, get_app_id
 
 st.set_page_config(page_title="AI Log Monitor - App Registration", layout="wide")
 st.title("📋 Application Registration")
@@ -85,7 +88,7 @@ with tab1:
     with col5:
         log_source = st.selectbox(
             "Log Source*",
-            ["Datadog", "ELK Stack", "CloudWatch", "Custom API", "File System"],
+            ["Datadog", "ELK Stack", "CloudWatch", "Custom API", "File System", PUSH_LOG_SOURCE],
             help="Where are your application logs stored?"
         )
         
@@ -156,6 +159,8 @@ with tab1:
         aws_access_key = st.text_input("AWS Access Key*", type="password")
         aws_secret_key = st.text_input("AWS Secret Key*", type="password")
         aws_region = st.text_input("AWS Region*")
+    elif log_source == PUSH_LOG_SOURCE:
+        st.info("An ingestion token will be generated. Your application POSTs gzip-compressed log batches to /ingest with it.")
 
     # Custom Fields
     st.subheader("Additional Configuration")
@@ -240,9 +245,22 @@ with tab1:
                     "secret_key": aws_secret_key,
                     "region": aws_region
                 }
+            elif log_source == PUSH_LOG_SOURCE:
+                app_data["API Credentials"]["ingest"] = {
+                    "token": secrets.token_urlsafe(32)
+                }
+            # Readable, but unique even for apps sharing a name and environment
+            app_data["App ID"] = f"{get_app_id(app_data)}-{uuid.uuid4().hex[:12]}"
             
             if save_app_data(app_data):
                 st.success("✅ Application registered successfully!")
+                if log_source == PUSH_LOG_SOURCE:
+                    st.write("Send these headers with every batch:")
+                    st.code(
+                        f"X-App-ID: {app_data['App ID']}\n"
+                        f"Authorization: Bearer {app_data['API Credentials']['ingest']['token']}\n"
+                        "Content-Encoding: gzip"
+                    )
                 st.balloons()
             else:
                 st.error("❌ Failed to register application. Please try again.")
@@ -1,4 +1,7 @@
 import time
+from aiops.parser import parse_level, parse_message, template
+from aiops.rules import describe_action
+from aiops.tables import shared_tables
 from utils import analyze_log_line
 
 # Automated actions based on log analysis results
@@ -20,19 +23,45 @@ def auto_scale(app_name, log_message):
     time.sleep(2)
     print(f"{app_name} service scaled.")
 
+# Actions carried out here, any other decided action is only announced
+HANDLERS = {
+    "restart_service": auto_restart,
+    "rollback_deployment": auto_rollback,
+    "scale_service": auto_scale,
+}
+
+def ai_level(analysis_result):
+    # Fallback for lines without a level: the level the model named first
+    for level in ("ERROR", "WARNING"):
+        if level in analysis_result:
+            return level
+    return None
+
 def resolve_error(log):
     log_message = log['message']
     
     try:
-        # Analyze log using the Groq-based LLaMA model
-        analysis_result = analyze_log_line(log_message)
+        # Lines carrying their level are decided by the rules without a network call
+        level = parse_level(str(log.get('level') or "").upper()) or parse_level(log_message)
+        if level is None:
+            # Analyze log using the Groq-based LLaMA model
+            level = ai_level(analyze_log_line(log_message))
 
-        # Extracting key information from the analysis result
-        if "ERROR" in analysis_result:
-            auto_restart(log['app_name'], log_message)
-        elif "WARNING" in analysis_result:
-            auto_scale(log['app_name'], log_message)
-        else:
+        # Remediation rules shared with the monitoring service and the live monitor
+        decision = shared_tables().current.rules.evaluate(level, template(parse_message(log_message)))
+        if decision is None:
             print(f"Informational log: {log_message}")
+            return
+        if not decision["auto_resolve"]:
+            # Rules that do not auto-resolve only recommend their actions
+            actions = ", ".join(describe_action(action) for action in decision["actions"])
+            print(f"Recommended for {log['app_name']} ({decision['rule']}): {actions}. Log: {log_message}")
+            return
+        for action in decision["actions"]:
+            handler = HANDLERS.get(action)
+            if handler:
+                handler(log['app_name'], log_message)
+            else:
+                print(f"{describe_action(action)} for {log['app_name']} due to: {log_message}")
     except Exception as e:
         print(f"Error resolving log: {e}")
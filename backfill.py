@@ -0,0 +1,34 @@
+import argparse
+import json
+import logging
+from aiops.backfill import backfill
+from aiops.config import BACKFILL_WORKERS, BACKFILL_CHUNK_MB, setup_logging
+from aiops.segments import rotated_segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze large existing log files in parallel")
+    parser.add_argument("paths", nargs="+", help="app.log-style files, plain, .gz or .zst, each analyzed on its own")
+    parser.add_argument("--rotated", action="store_true",
+                        help="analyze each file together with its rotated segments, oldest first")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="processes, 0 means one per core")
+    parser.add_argument("--chunk-mb", type=int, default=BACKFILL_CHUNK_MB, help="megabytes scanned per task")
+    parser.add_argument("--top", type=int, default=20, help="most frequent templates listed")
+    parser.add_argument("--report", help="write the reports to this JSON file")
+    args = parser.parse_args()
+
+    setup_logging(console=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reports = {}
+    for path in args.paths:
+        paths = rotated_segments(path) + [path] if args.rotated else [path]
+        reports[path] = backfill(paths, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024, top=args.top)
+        print(json.dumps({path: reports[path]}, indent=2))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
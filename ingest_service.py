@@ -0,0 +1,123 @@
+import asyncio
+import hmac
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from aiops.config import LOG_DIR, INGEST_RETRY_AFTER, SEARCH_API_TOKEN, ANOMALY_BUCKET_SECONDS, setup_logging
+from aiops.ingest import BatchTooLarge, IngestPipeline, PushRegistry, decode_batch, read_body
+from aiops.registry import get_ingest_token
+from aiops.service import MonitoringService
+
+registry = PushRegistry()
+service = MonitoringService()
+pipeline = IngestPipeline(service.process_logs)
+
+
+async def periodic_checks():
+    """Score finished rate buckets of push apps, which catches apps that stopped pushing, and close quiet incidents"""
+    while True:
+        await asyncio.sleep(ANOMALY_BUCKET_SECONDS)
+        if service.detector:
+            # Batches still queued are given one more bucket to be analyzed
+            await run_in_threadpool(service.check_anomalies, registry.apps(), ANOMALY_BUCKET_SECONDS)
+        if service.correlator:
+            await run_in_threadpool(service.report_incidents)
+
+
+@asynccontextmanager
+async def lifespan(_):
+    pipeline.start()
+    service.summaries.start(registry.apps)
+    checker = asyncio.create_task(periodic_checks()) if service.detector or service.correlator else None
+    yield
+    if checker:
+        checker.cancel()
+    pipeline.stop()
+    service.summaries.stop()
+    if service.archive:
+        service.archive.close()
+
+
+app = FastAPI(title="AIOps Log Ingestion", lifespan=lifespan)
+
+
+@app.post("/ingest", status_code=202)
+async def ingest(
+    request: Request,
+    x_app_id: str = Header(...),
+    authorization: str = Header(""),
+    content_encoding: str = Header(""),
+    content_type: str = Header("application/json")
+):
+    """Accept a batch of log events pushed by a registered application"""
+    registered_app = registry.get(x_app_id)
+    token = get_ingest_token(registered_app) if registered_app else None
+    presented = authorization.removeprefix("Bearer ").strip()
+    if not token or not hmac.compare_digest(token, presented):
+        raise HTTPException(status_code=401, detail="Unknown app ID or invalid token")
+
+    try:
+        body = await read_body(request.stream(), request.headers.get("content-length"))
+        events = await run_in_threadpool(decode_batch, body, content_encoding, content_type)
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not events:
+        return {"accepted": 0}
+
+    # Apply backpressure instead of buffering without bound
+    if not pipeline.submit(registered_app, events):
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Analysis pipeline saturated"},
+            headers={"Retry-After": str(INGEST_RETRY_AFTER)}
+        )
+    return {"accepted": len(events)}
+
+
+# Clients served by /search without a token when SEARCH_API_TOKEN is unset
+LOCAL_CLIENTS = ("127.0.0.1", "::1", "localhost")
+
+
+@app.get("/search")
+def search(
+    request: Request,
+    q: str = "",
+    app_id: Optional[List[str]] = Query(None, alias="app"),
+    severity: Optional[List[str]] = Query(None),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=1000),
+    authorization: str = Header("")
+):
+    """Full-text search over analyzed logs, best match first
+
+    Every app's logs are searchable, so without SEARCH_API_TOKEN only local
+    clients are served.
+    """
+    if SEARCH_API_TOKEN:
+        if not hmac.compare_digest(SEARCH_API_TOKEN, authorization.removeprefix("Bearer ").strip()):
+            raise HTTPException(status_code=401, detail="Invalid token")
+    elif not request.client or request.client.host not in LOCAL_CLIENTS:
+        raise HTTPException(status_code=401, detail="Set SEARCH_API_TOKEN to search from other hosts")
+    if not service.search_index:
+        raise HTTPException(status_code=404, detail="Search index disabled")
+    results = service.search_index.search(q, app_id, severity, start, end, limit, highlight=("<mark>", "</mark>"))
+    return {"count": len(results), "results": results}
+
+
+@app.get("/health")
+def health():
+    """Report ingestion queue depth"""
+    return {"status": "ok", "queued_batches": pipeline.batches.qsize()}
+
+
+if __name__ == "__main__":
+    setup_logging(f"{LOG_DIR}/ingest_service.log")
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("INGEST_PORT", "8000")))
@@ -1,310 +1,10 @@
 import streamlit as st
 import time
-import json
-import requests
-import logging
-from datetime import datetime
-import threading
-import queue
-import os
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-import sys
+import html
+from collections import deque
+from aiops.config import LIVE_STREAM_LINES, LIVE_REFRESH_SECONDS, setup_logging
+from aiops.live import LiveLogMonitor
 
-class LogEventHandler(FileSystemEventHandler):
-    def __init__(self, log_queue):
-        self.log_queue = log_queue
-        self.last_position = 0
-        
-    def on_modified(self, event):
-        if event.is_directory:
-            return
-        if event.src_path.endswith('.log'):
-            try:
-                with open(event.src_path, 'r') as f:
-                    # Move to the last read position
-                    f.seek(self.last_position)
-                    # Read new lines
-                    new_lines = f.readlines()
-                    if new_lines:
-                        print(f"New log entries detected: {len(new_lines)}")
-                        for line in new_lines:
-                            self.log_queue.put(line.strip())
-                        # Update the last position
-                        self.last_position = f.tell()
-            except Exception as e:
-                print(f"Error reading log file: {e}")
-                logging.error(f"Error reading log file: {e}")
-
-class LiveLogMonitor:
-    def __init__(self):
-        self.log_queue = queue.Queue()
-        self.observer = None
-        self.monitoring_thread = None
-        self.is_monitoring = False
-        self.applications = {}
-        self.setup_logging()
-        
-    def setup_logging(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('monitor.log'),
-                logging.StreamHandler()
-            ]
-        )
-        
-    def register_application(self, app_data):
-        """Register a new application for monitoring"""
-        app_id = f"app_{len(self.applications) + 1}"
-        self.applications[app_id] = {
-            "name": app_data["name"],
-            "log_path": app_data["log_path"],
-            "environment": app_data["environment"],
-            "status": "inactive",
-            "last_check": datetime.now().isoformat(),
-            "customer": {
-                "name": app_data["customer_name"],
-                "email": app_data["customer_email"],
-                "phone": app_data["customer_phone"],
-                "company": app_data["customer_company"]
-            },
-            "api_credentials": {
-                "api_key": app_data["api_key"],
-                "api_secret": app_data["api_secret"],
-                "endpoint": app_data["api_endpoint"]
-            },
-            "configuration": {
-                "alert_threshold": app_data["alert_threshold"],
-                "retry_attempts": app_data["retry_attempts"],
-                "check_interval": app_data["check_interval"],
-                "auto_resolve": app_data["auto_resolve"],
-                "notifications": app_data["notifications"]
-            },
-            "metrics": {
-                "error_count": 0,
-                "warning_count": 0,
-                "uptime": 100.0
-            }
-        }
-        return app_id
-        
-    def start_monitoring(self, app_id):
-        """Start monitoring an application's logs"""
-        if app_id not in self.applications:
-            return False
-            
-        app = self.applications[app_id]
-        log_path = app["log_path"]
-        
-        if not os.path.exists(log_path):
-            logging.error(f"Log path does not exist: {log_path}")
-            return False
-            
-        # Start file observer
-        event_handler = LogEventHandler(self.log_queue)
-        self.observer = Observer()
-        self.observer.schedule(event_handler, path=log_path, recursive=False)
-        self.observer.start()
-        
-        # Start monitoring thread
-        self.is_monitoring = True
-        self.monitoring_thread = threading.Thread(target=self.monitor_logs, args=(app_id,))
-        self.monitoring_thread.start()
-        
-        return True
-        
-    def stop_monitoring(self):
-        """Stop monitoring logs"""
-        self.is_monitoring = False
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-        if self.monitoring_thread:
-            self.monitoring_thread.join()
-            
-    def monitor_logs(self, app_id):
-        """Monitor logs in real-time"""
-        while self.is_monitoring:
-            try:
-                # Get new log entries
-                while not self.log_queue.empty():
-                    log_entry = self.log_queue.get()
-                    self.process_log(app_id, log_entry)
-                    
-                # Update metrics
-                self.update_metrics(app_id)
-                
-                # Sleep briefly to prevent CPU overload
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logging.error(f"Error in monitoring thread: {e}")
-                
-    def process_log(self, app_id, log_entry):
-        """Process and analyze a log entry with enhanced error handling"""
-        app = self.applications[app_id]
-        
-        # Basic log analysis
-        if "ERROR" in log_entry:
-            app["metrics"]["error_count"] += 1
-            analysis = self.analyze_error(log_entry)
-            
-            if analysis["can_auto_resolve"]:
-                # Add to recent issues
-                app["recent_issues"] = app.get("recent_issues", [])
-                app["recent_issues"].append({
-                    "timestamp": datetime.now().isoformat(),
-                    "error": log_entry,
-                    "resolution": "Auto-resolved",
-                    "resolution_time": analysis["resolution_time"]
-                })
-                
-                # Keep only last 5 issues
-                if len(app["recent_issues"]) > 5:
-                    app["recent_issues"] = app["recent_issues"][-5:]
-                
-                # Attempt auto-resolution
-                self.auto_resolve(app_id, analysis["resolution_steps"])
-                
-        elif "WARNING" in log_entry:
-            app["metrics"]["warning_count"] += 1
-            self.handle_warning(app_id, log_entry)
-            
-        # Update last check time
-        app["last_check"] = datetime.now().isoformat()
-        
-    def handle_error(self, app_id, log_entry):
-        """Handle error log entries"""
-        app = self.applications[app_id]
-        
-        # AI Analysis (placeholder for actual AI implementation)
-        analysis = self.analyze_error(log_entry)
-        
-        # Automated resolution
-        if analysis["can_auto_resolve"]:
-            self.auto_resolve(app_id, analysis["resolution_steps"])
-            
-    def handle_warning(self, app_id, log_entry):
-        """Handle warning log entries"""
-        app = self.applications[app_id]
-        
-        # AI Analysis (placeholder for actual AI implementation)
-        analysis = self.analyze_warning(log_entry)
-        
-        # Send alert if needed
-        if analysis["needs_attention"]:
-            self.send_alert(app_id, log_entry, analysis)
-            
-    def analyze_error(self, log_entry):
-        """Analyze error log entry and determine resolution steps"""
-        if "Database connection failed" in log_entry:
-            return {
-                "can_auto_resolve": True,
-                "resolution_steps": [
-                    "restart_database_service",
-                    "verify_connection",
-                    "clear_connection_pool"
-                ],
-                "severity": "HIGH",
-                "error_type": "database_connection",
-                "resolution_time": "2 minutes"
-            }
-        elif "Memory allocation failed" in log_entry:
-            return {
-                "can_auto_resolve": True,
-                "resolution_steps": [
-                    "clear_memory_cache",
-                    "release_unused_resources",
-                    "restart_memory_manager"
-                ],
-                "severity": "HIGH",
-                "error_type": "memory_error",
-                "resolution_time": "1 minute"
-            }
-        elif "API service unavailable" in log_entry:
-            return {
-                "can_auto_resolve": True,
-                "resolution_steps": [
-                    "restart_api_service",
-                    "reset_load_balancer",
-                    "verify_endpoints"
-                ],
-                "severity": "HIGH",
-                "error_type": "api_error",
-                "resolution_time": "3 minutes"
-            }
-        return {
-            "can_auto_resolve": False,
-            "resolution_steps": [],
-            "severity": "UNKNOWN",
-            "error_type": "unknown",
-            "resolution_time": "N/A"
-        }
-        
-    def analyze_warning(self, log_entry):
-        """Analyze warning log entry (placeholder for AI implementation)"""
-        # This would be replaced with actual AI analysis
-        return {
-            "needs_attention": True,
-            "recommendations": ["monitor_resource_usage", "optimize_performance"],
-            "severity": "MEDIUM"
-        }
-        
-    def auto_resolve(self, app_id, steps):
-        """Automatically resolve issues with simulated actions"""
-        app = self.applications[app_id]
-        
-        for step in steps:
-            if step == "restart_database_service":
-                logging.info(f"Executing: Restarting database service for {app['name']}")
-                time.sleep(2)  # Simulate service restart
-            elif step == "verify_connection":
-                logging.info(f"Executing: Verifying database connection for {app['name']}")
-                time.sleep(1)  # Simulate connection verification
-            elif step == "clear_connection_pool":
-                logging.info(f"Executing: Clearing connection pool for {app['name']}")
-                time.sleep(1)  # Simulate pool clearing
-            elif step == "clear_memory_cache":
-                logging.info(f"Executing: Clearing memory cache for {app['name']}")
-                time.sleep(1)  # Simulate cache clearing
-            elif step == "release_unused_resources":
-                logging.info(f"Executing: Releasing unused resources for {app['name']}")
-                time.sleep(1)  # Simulate resource release
-            elif step == "restart_memory_manager":
-                logging.info(f"Executing: Restarting memory manager for {app['name']}")
-                time.sleep(2)  # Simulate manager restart
-            elif step == "restart_api_service":
-                logging.info(f"Executing: Restarting API service for {app['name']}")
-                time.sleep(2)  # Simulate service restart
-            elif step == "reset_load_balancer":
-                logging.info(f"Executing: Resetting load balancer for {app['name']}")
-                time.sleep(1)  # Simulate balancer reset
-            elif step == "verify_endpoints":
-                logging.info(f"Executing: Verifying API endpoints for {app['name']}")
-                time.sleep(1)  # Simulate endpoint verification
-                
-        logging.info(f"Auto-resolution completed for {app['name']}")
-        app["metrics"]["auto_resolved_issues"] = app["metrics"].get("auto_resolved_issues", 0) + 1
-        
-    def send_alert(self, app_id, log_entry, analysis):
-        """Send alert for issues that need attention"""
-        app = self.applications[app_id]
-        
-        # Simulate sending alert
-        logging.info(f"Alert sent for {app['name']}: {log_entry}")
-        
-    def update_metrics(self, app_id):
-        """Update application metrics"""
-        app = self.applications[app_id]
-        
-        # Update uptime based on error count
-        total_checks = app["metrics"]["error_count"] + app["metrics"]["warning_count"]
-        if total_checks > 0:
-            error_rate = app["metrics"]["error_count"] / total_checks
-            app["metrics"]["uptime"] = max(0, 100 - (error_rate * 100))
-            
 # Streamlit UI
 def main():
     # Set page config
@@ -317,6 +17,7 @@ def main():
     
     # Initialize monitor in session state
     if 'monitor' not in st.session_state:
+        setup_logging('monitor.log', console=True)
         st.session_state.monitor = LiveLogMonitor()
     
     # Custom CSS
@@ -576,11 +277,12 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Quick stats
+    # Quick stats, read from counters maintained at ingest time
     if st.session_state.monitor.applications:
-        total_apps = len(st.session_state.monitor.applications)
-        active_apps = sum(1 for app in st.session_state.monitor.applications.values() if app["status"] == "active")
-        total_errors = sum(app["metrics"]["error_count"] for app in st.session_state.monitor.applications.values())
+        stats = st.session_state.monitor.aggregates.snapshot()
+        total_apps = stats["total_apps"]
+        active_apps = stats["active_apps"]
+        total_errors = stats["by_severity"].get("ERROR", 0)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -774,22 +476,29 @@ def main():
                         st.session_state.monitor.stop_monitoring()
                         st.info("ℹ️ Monitoring stopped")
                 
-                # Live log stream
+                # Live log stream, rendering only what arrived since this
+                # viewer's cursor so viewers never compete with the analyzer
                 st.markdown('<h3 class="sub-header">Live Log Stream</h3>', unsafe_allow_html=True)
-                log_container = st.empty()
+                log_buffer = st.session_state.monitor.log_buffer
+                if 'stream_lines' not in st.session_state:
+                    st.session_state.stream_lines = deque(maxlen=LIVE_STREAM_LINES)
+                    st.session_state.stream_cursor = max(0, log_buffer.head - LIVE_STREAM_LINES)
+                
+                # Skip straight to the visible tail if more lines arrived than fit
+                cursor = max(st.session_state.stream_cursor, log_buffer.head - LIVE_STREAM_LINES)
+                new_lines, st.session_state.stream_cursor, _ = log_buffer.read(cursor)
+                st.session_state.stream_lines.extend(new_lines)
                 
-                while st.session_state.monitor.is_monitoring:
-                    try:
-                        log_entry = st.session_state.monitor.log_queue.get(timeout=1)
-                        with log_container.container():
-                            if "ERROR" in log_entry:
-                                st.markdown(f'<div class="log-entry log-error">{log_entry}</div>', unsafe_allow_html=True)
-                            elif "WARNING" in log_entry:
-                                st.markdown(f'<div class="log-entry log-warning">{log_entry}</div>', unsafe_allow_html=True)
-                            else:
-                                st.markdown(f'<div class="log-entry log-info">{log_entry}</div>', unsafe_allow_html=True)
-                    except queue.Empty:
-                        pass
+                log_html = []
+                for log_entry in st.session_state.stream_lines:
+                    if "ERROR" in log_entry:
+                        css_class = "log-error"
+                    elif "WARNING" in log_entry:
+                        css_class = "log-warning"
+                    else:
+                        css_class = "log-info"
+                    log_html.append(f'<div class="log-entry {css_class}">{html.escape(log_entry)}</div>')
+                st.markdown("".join(log_html), unsafe_allow_html=True)
                         
     with tab3:
         st.markdown('<h2 class="sub-header">📈 Analytics Dashboard</h2>', unsafe_allow_html=True)
@@ -875,8 +584,34 @@ def main():
                             <p style='font-size: 2rem;'>{}</p>
                         </div>
                         """.format("🟢" if app["status"] == "active" else "🔴"), unsafe_allow_html=True)
-                    
+
+                    # Template counts from the sketches, lines dropped by sampling included
+                    st.markdown("### 🧮 Log Templates")
+                    sketches = st.session_state.monitor.sketches
+                    now = time.time()
+                    col1, col2 = st.columns(2)
+                    for col, label, seconds in ((col1, "Last Hour", 3600), (col2, "Last 24 Hours", 86400)):
+                        with col:
+                            top = sketches.top_templates(app_id, 10, now - seconds, now)
+                            st.markdown("""
+                            <div class="config-item">
+                                <p><strong>{}:</strong> ~{} distinct sources</p>
+                                {}
+                            </div>
+                            """.format(
+                                label,
+                                sketches.distinct_sources(app_id, now - seconds, now),
+                                "".join(f"<p>~{count} × {html.escape(template)}</p>" for template, count in top)
+                                or "<p>No logs yet</p>"
+                            ), unsafe_allow_html=True)
+                    st.caption("Approximate counts of every line, including those sampled out before analysis")
+
                     st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Refresh on a timer while monitoring instead of blocking the script
+    if st.session_state.monitor.is_monitoring:
+        time.sleep(LIVE_REFRESH_SECONDS)
+        st.rerun()
                     
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import time
 import json
-from log_monitor import fetch_prometheus_logs, fetch_datadog_logs
+from collections import defaultdict
+from aiops.log_sources import fetch_prometheus_logs, fetch_datadog_logs
 from utils import analyze_log_line
 from auto_resolver import resolve_error
 
@@ -23,18 +24,19 @@ def process_logs(logs):
 def fetch_logs_continuously():
     while True:
         apps = load_apps()
+        prometheus_servers = defaultdict(list)
         
         for app in apps:
-            if app["log_source"] == "Prometheus":
-                # Fetch logs from Prometheus
-                logs = fetch_prometheus_logs(app["prometheus_url"])
-            elif app["log_source"] == "Datadog":
+            if app.get("log_source") == "Prometheus":
+                # Group apps by server so each server is queried in batches
+                prometheus_servers[app["prometheus_url"]].append(app)
+            elif app.get("log_source") == "Datadog":
                 # Fetch logs from Datadog
-                logs = fetch_datadog_logs(app["api_key"], app["app_key"])
-            else:
-                logs = []  # Add logic for other sources if needed
+                process_logs(fetch_datadog_logs(app["api_key"], app["app_key"], app.get("name")))
 
-            process_logs(logs)
+        # Fetch logs for all apps of each Prometheus server at once
+        for prometheus_url, server_apps in prometheus_servers.items():
+            process_logs(fetch_prometheus_logs(prometheus_url, server_apps))
         
         time.sleep(60)  # Poll every minute to fetch new logs
 
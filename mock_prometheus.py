@@ -1,27 +1,129 @@
+import os
+import random
+import re
+import time
 from flask import Flask, jsonify, request
 
 app = Flask(__name__)
 
-@app.route("/api/v1/query")
+# Number of series returned per matched app, raise it to load test the fetcher
+SERIES_PER_APP = int(os.getenv("MOCK_SERIES_PER_APP", "1"))
+# Share of samples that breach alerting thresholds
+FAILURE_RATE = float(os.getenv("MOCK_FAILURE_RATE", "0.1"))
+# Escapes allowed in a PromQL double-quoted string
+_STRING_ESCAPES = {"\\": "\\", '"': '"', "'": "'", "n": "\n", "t": "\t", "r": "\r"}
+# RE2 metacharacters, the only characters an exact-match regex escapes
+_REGEX_META = set("\\.+*?()|[]{}^$")
+
+
+class BadQuery(ValueError):
+    pass
+
+
+def unquote(literal):
+    """Decode a PromQL double-quoted string body, rejecting unknown escapes like Prometheus"""
+    decoded, chars = [], iter(literal)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            if escaped not in _STRING_ESCAPES:
+                raise BadQuery(f"unknown escape sequence \\{escaped} in string")
+            char = _STRING_ESCAPES[escaped]
+        decoded.append(char)
+    return "".join(decoded)
+
+
+def literal_alternatives(regex):
+    """Split an alternation of escaped literals, rejecting anything else"""
+    names, name, chars = [], [], iter(regex)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            if escaped not in _REGEX_META:
+                raise BadQuery(f"invalid escape sequence \\{escaped} in regex")
+            name.append(escaped)
+        elif char == "|":
+            names.append("".join(name))
+            name = []
+        elif char in _REGEX_META:
+            raise BadQuery(f"unexpected regex metacharacter {char!r} in app matcher")
+        else:
+            name.append(char)
+    names.append("".join(name))
+    return names
+
+
+def matched_apps(query):
+    """Extract the label and app names selected by a batched label matcher"""
+    matches = re.findall(r'(\w+)=~"((?:[^"\\]|\\.)*)"', query)
+    # The app matcher is always the last one in the selector
+    if not matches:
+        return "instance", ["localhost"]
+    label, values = matches[-1]
+    return label, literal_alternatives(unquote(values))
+
+
+def sample_value(query):
+    failing = random.random() < FAILURE_RATE
+    if query.startswith("up"):
+        return "0" if failing else "1"
+    if "5.." in query:
+        return f"{random.uniform(0.1, 2.0) if failing else random.uniform(0, 0.01):.4f}"
+    return f"{random.uniform(1.0, 3.0) if failing else random.uniform(0.05, 0.3):.4f}"
+
+
+def series(query):
+    series_count = int(request.values.get("series", SERIES_PER_APP))
+    label, names = matched_apps(query)
+    for name in names:
+        for i in range(series_count):
+            yield {"__name__": query.split("{")[0], label: name, "instance": f"{name}:{9100 + i}"}
+
+
+@app.errorhandler(BadQuery)
+def bad_query(error):
+    # Prometheus answers a query it cannot parse with a 400 and fails the whole batch
+    return jsonify({"status": "error", "errorType": "bad_data", "error": str(error)}), 400
+
+
+@app.route("/api/v1/query", methods=["GET", "POST"])
 def query():
-    query_param = request.args.get("query", "")
-    # Return a dummy response that mimics Prometheus
+    query_param = request.values.get("query", "")
+    now = time.time()
+    # Return a response that mimics Prometheus
     return jsonify({
         "status": "success",
         "data": {
             "resultType": "vector",
+            "result": [
+                {"metric": metric, "value": [now, sample_value(query_param)]}
+                for metric in series(query_param)
+            ]
+        }
+    })
+
+
+@app.route("/api/v1/query_range", methods=["GET", "POST"])
+def query_range():
+    query_param = request.values.get("query", "")
+    start = float(request.values.get("start", time.time() - 3600))
+    end = float(request.values.get("end", time.time()))
+    step = float(request.values.get("step", 60))
+    steps = int((end - start) // step) + 1
+    return jsonify({
+        "status": "success",
+        "data": {
+            "resultType": "matrix",
             "result": [
                 {
-                    "metric": {"__name__": "up", "instance": "localhost:9090"},
-                    "value": [1682064000, "1"]
-                },
-                {
-                    "metric": {"__name__": "up", "instance": "localhost:9091"},
-                    "value": [1682064001, "0"]
+                    "metric": metric,
+                    "values": [[start + i * step, sample_value(query_param)] for i in range(steps)]
                 }
+                for metric in series(query_param)
             ]
         }
     })
 
+
 if __name__ == "__main__":
     app.run(port=9090)
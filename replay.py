@@ -0,0 +1,40 @@
+import argparse
+import json
+import logging
+from datetime import date
+from aiops.config import setup_logging
+from aiops.replay import ReplayMonitor, iter_archive, iter_log_file, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logs through the live monitor to see what it would have done")
+    parser.add_argument("paths", nargs="*", help="app.log-style files, replayed in the given order")
+    parser.add_argument("--archive-app", help="replay this app's archived events instead of files")
+    parser.add_argument("--start", type=date.fromisoformat, help="first archived day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last archived day (YYYY-MM-DD)")
+    parser.add_argument("--speed", type=float, help="replay at N times real time, as fast as possible if omitted")
+    parser.add_argument("--report", help="write the full report, with every alert and remediation, to this JSON file")
+    args = parser.parse_args()
+    if not args.paths and not args.archive_app:
+        parser.error("give log files or --archive-app")
+
+    setup_logging(console=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    monitor = ReplayMonitor()
+    if args.archive_app:
+        app_id = monitor.register_replay(args.archive_app)
+        events = iter_archive([args.archive_app], args.start, args.end)
+    else:
+        app_id = monitor.register_replay(args.paths[0], args.paths[0])
+        events = (event for path in args.paths for event in iter_log_file(path))
+
+    report = replay(monitor, app_id, events, speed=args.speed)
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({**report, "alert_log": monitor.alerts, "remediation_log": monitor.remediations}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
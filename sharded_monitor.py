@@ -0,0 +1,12 @@
+import logging
+from aiops.config import LOG_DIR, setup_logging
+from aiops.sharding import ShardCoordinator
+
+if __name__ == "__main__":
+    setup_logging(f"{LOG_DIR}/sharded_monitor.log")
+    coordinator = ShardCoordinator()
+    try:
+        coordinator.run_forever()
+    except KeyboardInterrupt:
+        coordinator.stop()
+        logging.info(f"Sharded monitor stopped, totals: {dict(coordinator.metrics)}")
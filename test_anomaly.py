@@ -0,0 +1,99 @@
+import importlib.util
+import math
+import random
+import unittest
+from aiops.anomaly import ALL_LINES, RateAnomalyDetector, alert_severity
+
+BUCKET = 60
+
+
+def poisson(rng, rate):
+    """Draw a Poisson count, the noise of independent log lines"""
+    limit, count, product = math.exp(-rate), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class TestRateAnomalyDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = RateAnomalyDetector(bucket_seconds=BUCKET)
+        self.rng = random.Random(7)
+        self.bucket = 0
+
+    def feed(self, rates, buckets=1):
+        """Log about ``rates[template]`` lines per bucket, returning the anomalies raised"""
+        anomalies = []
+        for _ in range(buckets):
+            start = self.bucket * BUCKET
+            for template, rate in rates.items():
+                count = poisson(self.rng, rate)
+                for i in range(count):
+                    anomalies += self.detector.observe("shop", template, start + i * BUCKET / (count + 1))
+            self.bucket += 1
+        anomalies += self.detector.tick(self.bucket * BUCKET)
+        return anomalies
+
+    def test_steady_rates_raise_nothing(self):
+        self.assertEqual(self.feed({"GET <*> 200": 50, "db timeout": 20}, buckets=200), [])
+
+    def test_nothing_is_raised_while_warming_up(self):
+        self.assertEqual(self.feed({"GET <*> 200": 50}, buckets=5), [])
+        self.assertEqual(self.feed({"GET <*> 200": 500}, buckets=3), [])
+
+    def test_spike_is_reported_once_until_it_recovers(self):
+        self.feed({"GET <*> 200": 50, "db timeout": 5}, buckets=60)
+        anomalies = [a for a in self.feed({"GET <*> 200": 50, "db timeout": 80}, buckets=3)
+                     if a["template"] == "db timeout"]
+        self.assertEqual([a["kind"] for a in anomalies], ["spike"])
+        self.assertEqual(alert_severity(anomalies[0]), "MEDIUM")
+        self.feed({"GET <*> 200": 50, "db timeout": 5}, buckets=20)
+        anomalies = [a for a in self.feed({"GET <*> 200": 50, "db timeout": 80})
+                     if a["template"] == "db timeout"]
+        self.assertEqual([a["kind"] for a in anomalies], ["spike"])
+
+    def test_silent_app_is_a_high_drop(self):
+        self.feed({"GET <*> 200": 50}, buckets=60)
+        anomalies = self.feed({}, buckets=2)
+        kinds = {(a["template"], a["kind"]) for a in anomalies}
+        self.assertIn((ALL_LINES, "drop"), kinds)
+        self.assertEqual(alert_severity(next(a for a in anomalies if a["template"] == ALL_LINES)), "HIGH")
+
+    def test_shed_lines_do_not_look_like_a_drop(self):
+        self.feed({"GET <*> 200": 50}, buckets=60)
+        anomalies = []
+        for _ in range(5):
+            # Only a tenth of the lines are analyzed, the rest are shed unanalyzed
+            start = self.bucket * BUCKET
+            for i in range(5):
+                anomalies += self.detector.observe("shop", "GET <*> 200", start + i)
+            anomalies += self.detector.shed("shop", start + 10, 45)
+            self.bucket += 1
+        anomalies += self.detector.tick(self.bucket * BUCKET)
+        self.assertEqual(anomalies, [])
+        # The baseline of the template did not learn the short counts
+        self.assertEqual(self.feed({"GET <*> 200": 50}, buckets=3), [])
+
+    def test_weighted_observations_count_as_sampled_lines(self):
+        self.feed({"GET <*> 200": 50}, buckets=60)
+        anomalies = []
+        for _ in range(5):
+            start = self.bucket * BUCKET
+            for i in range(5):
+                anomalies += self.detector.observe("shop", "GET <*> 200", start + i, 10)
+            self.bucket += 1
+        anomalies += self.detector.tick(self.bucket * BUCKET)
+        self.assertEqual(anomalies, [])
+
+    def test_apps_are_scored_separately(self):
+        self.feed({"GET <*> 200": 50}, buckets=60)
+        self.assertEqual(self.detector.tick(self.bucket * BUCKET + 10 * BUCKET, app_ids={"blog"}), [])
+        anomalies = self.detector.tick(self.bucket * BUCKET + 10 * BUCKET, app_ids={"shop"})
+        self.assertTrue(anomalies)
+        self.assertEqual({a["app_id"] for a in anomalies}, {"shop"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from aiops.correlation import IncidentCorrelator, correlation_keys
+
+SHOP = {"App ID": "shop", "Environment": "Production", "Technical": {"Databases": ["PostgreSQL", "Redis"]}}
+BLOG = {"App ID": "blog", "Environment": "Production", "Technical": {"Databases": "PostgreSQL"}}
+STAGING = {"App ID": "shop-staging", "Environment": "Staging", "Technical": {"Databases": ["PostgreSQL"]}}
+
+
+class TestCorrelationKeys(unittest.TestCase):
+    def test_database_errors_are_keyed_by_database_and_environment(self):
+        self.assertEqual(correlation_keys(SHOP, "Database", "connection refused <*>"),
+                         [("Databases", "Production", "PostgreSQL"), ("Databases", "Production", "Redis")])
+        self.assertEqual(correlation_keys(BLOG, "Database", "anything"), [("Databases", "Production", "PostgreSQL")])
+
+    def test_other_events_are_keyed_by_template(self):
+        self.assertEqual(correlation_keys(SHOP, "Network", "timeout <*>"), [("template", "timeout <*>")])
+        # An app without registered databases falls back to the template
+        self.assertEqual(correlation_keys({"App ID": "x"}, "Database", "db down"), [("template", "db down")])
+
+
+class TestIncidentCorrelator(unittest.TestCase):
+    def setUp(self):
+        self.correlator = IncidentCorrelator(window=300, max_duration=3600)
+
+    def add(self, app, category, template, timestamp):
+        return self.correlator.add(app["App ID"], correlation_keys(app, category, template), timestamp, template)
+
+    def test_apps_sharing_a_database_share_an_incident(self):
+        incident, is_new = self.add(SHOP, "Database", "connection refused", 1000)
+        self.assertTrue(is_new)
+        other, is_new = self.add(BLOG, "Database", "pool exhausted", 1010)
+        self.assertFalse(is_new)
+        self.assertIs(other, incident)
+        self.assertEqual(incident.apps, {"shop": 1, "blog": 1})
+        self.assertEqual(incident.event, "connection refused")
+        # Same database, other environment
+        _, is_new = self.add(STAGING, "Database", "connection refused", 1020)
+        self.assertTrue(is_new)
+
+    def test_quiet_window_closes_the_incident(self):
+        first, _ = self.add(SHOP, "Network", "timeout <*>", 1000)
+        same, is_new = self.add(SHOP, "Network", "timeout <*>", 1299)
+        self.assertIs(same, first)
+        self.assertEqual(self.correlator.expire(1500), [])
+        self.assertEqual(self.correlator.expire(1600), [first])
+        self.assertEqual(first.summary()["events"], 2)
+        second, is_new = self.add(SHOP, "Network", "timeout <*>", 1601)
+        self.assertTrue(is_new)
+        self.assertIsNot(second, first)
+
+    def test_storms_are_cut_after_the_maximum_duration(self):
+        first, _ = self.add(SHOP, "Network", "timeout <*>", 0)
+        for timestamp in range(60, 3601, 60):
+            incident, is_new = self.add(SHOP, "Network", "timeout <*>", timestamp)
+            self.assertFalse(is_new)
+        incident, is_new = self.add(SHOP, "Network", "timeout <*>", 3660)
+        self.assertTrue(is_new)
+        self.assertEqual(self.correlator.expire(3660), [first])
+
+    def test_an_incident_is_closed_once(self):
+        # Keyed by two databases, the incident is open under both keys
+        incident, _ = self.add(SHOP, "Database", "connection refused", 1000)
+        self.assertEqual(self.correlator.expire(2000), [incident])
+        self.assertEqual(self.correlator.expire(3000), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
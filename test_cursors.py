@@ -0,0 +1,85 @@
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+
+APP = {"App ID": "shop", "App Name": "Shop", "API URL": "http://shop.test"}
+
+
+class FakeSource:
+    """A custom log API whose ``since`` and ``after`` filters are inclusive, as many are"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        import requests
+
+        params = params or {}
+        self.requests.append(params)
+        entries = [entry for entry in self.entries
+                   if entry.get("timestamp", "") >= params.get("since", "")
+                   and entry.get("seq", 0) >= params.get("after", 0)]
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.raw = io.BytesIO(json.dumps(entries).encode("utf-8"))
+        return response
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "requests is not installed")
+class TestFetchCursors(unittest.TestCase):
+    def setUp(self):
+        # The service keeps its cursors and other state under the working directory
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cwd = os.getcwd()
+        os.chdir(directory.name)
+        self.addCleanup(os.chdir, cwd)
+        with open("registered_apps.json", 'w') as f:
+            json.dump([], f)
+
+    def poll(self, source, commit=True):
+        """Fetch once with a freshly started service, as after a restart"""
+        from aiops.service import MonitoringService
+
+        service = MonitoringService()
+        service.session = source
+        logs = service.fetch_logs(APP)
+        if commit:
+            service.cursors.commit("shop")
+        return [log["message"] for log in logs]
+
+    def test_timestamp_watermark_drops_refetched_entries(self):
+        source = FakeSource([
+            {"timestamp": "2026-10-19T10:00:00", "message": "a"},
+            {"timestamp": "2026-10-19T10:00:01", "message": "b"},
+            {"timestamp": "2026-10-19T10:00:01", "message": "c"},
+        ])
+        self.assertEqual(self.poll(source), ["a", "b", "c"])
+        source.entries.append({"timestamp": "2026-10-19T10:00:01", "message": "d"})
+        source.entries.append({"timestamp": "2026-10-19T10:00:02", "message": "e"})
+        self.assertEqual(self.poll(source), ["d", "e"])
+        self.assertEqual(source.requests[-1], {"since": "2026-10-19T10:00:01"})
+        self.assertEqual(self.poll(source), [])
+
+    def test_sequence_watermark_drops_refetched_entries(self):
+        source = FakeSource([{"seq": seq, "message": f"line {seq}"} for seq in range(1, 4)])
+        self.assertEqual(self.poll(source), ["line 1", "line 2", "line 3"])
+        source.entries.append({"seq": 4, "message": "line 4"})
+        self.assertEqual(self.poll(source), ["line 4"])
+        self.assertEqual(source.requests[-1], {"after": 3})
+
+    def test_uncommitted_cursor_refetches_after_a_crash(self):
+        source = FakeSource([{"seq": seq, "message": f"line {seq}"} for seq in range(1, 3)])
+        self.assertEqual(self.poll(source, commit=False), ["line 1", "line 2"])
+        # Nothing was committed, so nothing is lost
+        self.assertEqual(self.poll(source), ["line 1", "line 2"])
+        self.assertEqual(self.poll(source), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
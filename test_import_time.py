@@ -0,0 +1,74 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Wall-clock budget for importing the whole headless core in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 0.3
+CORE_MODULES = ["aiops.parser", "aiops.matcher", "aiops.analyzer", "aiops.notifier",
+                "aiops.registry", "aiops.service"]
+HEAVY_MODULES = ["streamlit", "pandas", "numpy", "requests", "watchdog", "smtplib"]
+# Constructing the service may load requests, but nothing only some features need
+SERVICE_BUDGET_SECONDS = 0.5
+SERVICE_HEAVY_MODULES = ["streamlit", "pandas", "numpy", "sklearn", "watchdog"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+SERVICE_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from aiops.service import MonitoringService
+MonitoringService()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe_imports():
+    code = PROBE.format(modules=CORE_MODULES, heavy=HEAVY_MODULES)
+    # Best of three, the first run may pay for writing bytecode
+    results = [json.loads(subprocess.check_output([sys.executable, "-c", code]))
+               for _ in range(3)]
+    return min(results, key=lambda r: r["elapsed"])
+
+
+def probe_service():
+    code = SERVICE_PROBE.format(heavy=SERVICE_HEAVY_MODULES)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+                                                                   os.environ.get("PYTHONPATH")])))
+    # The service creates its state directories, keep them out of the tree
+    with tempfile.TemporaryDirectory() as directory:
+        results = [json.loads(subprocess.check_output([sys.executable, "-c", code], cwd=directory, env=env)
+                              .splitlines()[-1]) for _ in range(3)]
+    return min(results, key=lambda r: r["elapsed"])
+
+
+class TestImportTime(unittest.TestCase):
+    def test_core_skips_heavy_dependencies(self):
+        result = probe_imports()
+        self.assertEqual(result["loaded"], [])
+
+    def test_core_import_budget(self):
+        result = probe_imports()
+        self.assertLess(result["elapsed"], IMPORT_BUDGET_SECONDS)
+
+    @unittest.skipUnless(importlib.util.find_spec("requests"), "requests is not installed")
+    def test_service_construction_budget(self):
+        result = probe_service()
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["elapsed"], SERVICE_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
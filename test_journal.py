@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+import unittest
+from aiops.journal import LineJournal
+
+
+class TestLineJournal(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open(self, segment_bytes=1024 * 1024):
+        journal = LineJournal(self.directory, segment_bytes)
+        self.addCleanup(journal.close)
+        return journal
+
+    def read_all(self, journal, offset):
+        lines = []
+        while True:
+            records, next_offset = journal.read(offset)
+            if not records:
+                return lines, offset
+            lines.extend(line for _, line in records)
+            offset = next_offset
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".log"))
+
+    def test_only_synced_lines_are_read(self):
+        journal = self.open()
+        journal.append(["a", "b"])
+        self.assertEqual(journal.read(0), ([], 0))
+        end = journal.sync()
+        records, next_offset = journal.read(0)
+        self.assertEqual(records, [(0, "a"), (2, "b")])
+        self.assertEqual(next_offset, end)
+
+    def test_restart_resumes_after_the_acknowledged_offset(self):
+        journal = self.open()
+        journal.append([f"line {i}" for i in range(10)])
+        journal.sync()
+        records, _ = journal.read(0)
+        # Lines up to the fifth were analyzed before the crash
+        journal.ack(records[5][0])
+        journal.close()
+
+        journal = self.open()
+        lines, _ = self.read_all(journal, journal.acked)
+        self.assertEqual(lines, [f"line {i}" for i in range(5, 10)])
+
+    def test_torn_line_is_dropped_on_recovery(self):
+        journal = self.open()
+        journal.append(["whole line"])
+        journal.sync()
+        journal.close()
+        # A crash in the middle of writing the next line
+        with open(os.path.join(self.directory, self.segments()[-1]), 'ab') as f:
+            f.write(b"torn li")
+
+        journal = self.open()
+        journal.append(["next line"])
+        journal.sync()
+        self.assertEqual(self.read_all(journal, 0)[0], ["whole line", "next line"])
+
+    def test_segments_roll_and_acknowledged_ones_are_deleted(self):
+        journal = self.open(segment_bytes=100)
+        for i in range(20):
+            journal.append([f"line {i:02d} " + "x" * 20])
+        journal.sync()
+        self.assertGreater(len(self.segments()), 3)
+        lines, end = self.read_all(journal, 0)
+        self.assertEqual(lines, [f"line {i:02d} " + "x" * 20 for i in range(20)])
+        journal.ack(end)
+        self.assertEqual(len(self.segments()), 1)
+
+        journal.close()
+        journal = self.open(segment_bytes=100)
+        self.assertEqual(journal.acked, end)
+        self.assertEqual(self.read_all(journal, journal.acked)[0], [])
+
+    def test_concurrent_appends_are_all_durable(self):
+        journal = self.open(segment_bytes=4096)
+
+        def writer(name):
+            for i in range(200):
+                journal.append([f"{name} {i}"])
+                if i % 10 == 0:
+                    journal.sync()
+
+        threads = [threading.Thread(target=writer, args=(f"writer-{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.sync()
+        lines, _ = self.read_all(journal, 0)
+        self.assertEqual(sorted(lines), sorted(f"writer-{n} {i}" for n in range(4) for i in range(200)))
+
+    def test_blocking_read_wakes_on_sync(self):
+        journal = self.open()
+        timer = threading.Timer(0.05, lambda: (journal.append(["late"]), journal.sync()))
+        timer.start()
+        self.addCleanup(timer.join)
+        records, _ = journal.read(0, timeout=5)
+        self.assertEqual([line for _, line in records], ["late"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from aiops.log_buffer import BroadcastBuffer, PriorityLanes, lane_of
+
+
+def lines(level, count, start=0):
+    return [f"2026-10-19 10:00:00 {level} line {start + i}" for i in range(count)]
+
+
+class TestPriorityLanes(unittest.TestCase):
+    def test_lane_of(self):
+        self.assertEqual([lane_of(line) for line in ("x ERROR y", "FATAL", "CRITICAL", "WARNING", "WARN", "INFO")],
+                         [0, 0, 0, 1, 1, 2])
+
+    def test_errors_are_taken_first(self):
+        queue = PriorityLanes(max_lag=100)
+        queue.extend(lines("INFO", 3) + lines("WARNING", 2) + lines("ERROR", 2))
+        taken = queue.take(4)
+        self.assertEqual([line.split()[2] for line, _ in taken], ["ERROR", "ERROR", "WARNING", "WARNING"])
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.take(10), [(line, 1) for line in lines("INFO", 3)])
+
+    def test_info_is_sampled_then_dropped_under_lag(self):
+        queue = PriorityLanes(max_lag=100, sample_every=10)
+        queue.extend(lines("INFO", 100))
+        self.assertEqual(queue.drain_shed(), {})
+        # At one max_lag waiting, one INFO line in ten is kept and weighs ten
+        queue.extend(lines("INFO", 100, start=100))
+        self.assertEqual(len(queue), 110)
+        self.assertEqual(queue.drain_shed(), {"INFO": 90})
+        self.assertEqual(queue.drain_sampled_out(), 90)
+        weights = [weight for _, weight in queue.take(200)]
+        self.assertEqual(weights.count(10), 10)
+        self.assertEqual(sum(weights), 200)
+
+    def test_shedding_order_under_growing_lag(self):
+        queue = PriorityLanes(max_lag=100, sample_every=10)
+        queue.extend(lines("ERROR", 200))
+        # Past twice max_lag INFO is dropped outright, warnings are sampled
+        queue.extend(lines("INFO", 10) + lines("WARNING", 20))
+        self.assertEqual(queue.drain_shed(), {"INFO": 10, "WARNING": 18})
+        self.assertEqual(queue.drain_sampled_out(), 18)
+        queue.extend(lines("ERROR", 100))
+        # Past three times both are dropped, errors still get in
+        queue.extend(lines("WARNING", 5) + lines("ERROR", 5))
+        self.assertEqual(queue.drain_shed(), {"WARNING": 5})
+        self.assertEqual(queue.drain_sampled_out(), 0)
+        self.assertEqual(queue.stats()["queued"], {"ERROR": 305, "WARNING": 2, "INFO": 0})
+
+    def test_errors_are_bounded_too(self):
+        queue = PriorityLanes(max_lag=10)
+        queue.extend(lines("ERROR", 150))
+        self.assertEqual(len(queue), 100)
+        self.assertEqual(queue.stats()["shed"], {"ERROR": 50})
+
+    def test_oldest_offset_spans_lanes(self):
+        queue = PriorityLanes(max_lag=100)
+        queue.extend(lines("INFO", 1) + lines("ERROR", 1) + lines("WARNING", 1), offsets=[10, 20, 30])
+        self.assertEqual(queue.oldest_offset(), 10)
+        queue.take(2)
+        # The INFO line is still waiting, so nothing after it can be acknowledged
+        self.assertEqual(queue.oldest_offset(), 10)
+        queue.take(1)
+        self.assertIsNone(queue.oldest_offset())
+
+
+class TestBroadcastBuffer(unittest.TestCase):
+    def test_readers_are_independent_and_told_what_they_missed(self):
+        buffer = BroadcastBuffer(capacity=4)
+        fast = slow = 0
+        buffer.extend(range(3))
+        items, fast, dropped = buffer.read(fast)
+        self.assertEqual((items, dropped), ([0, 1, 2], 0))
+        buffer.extend(range(3, 7))
+        items, slow, dropped = buffer.read(slow)
+        self.assertEqual((items, dropped), ([3, 4, 5, 6], 3))
+        self.assertEqual(buffer.read(fast, max_items=2)[:2], ([3, 4], 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import importlib.util
+import io
+import json
+import unittest
+from aiops.log_stream import batched, iter_json_array, iter_ndjson, iter_response_entries
+
+ENTRIES = [
+    {"timestamp": "2026-10-19T10:00:00", "message": "ERROR Connection refused: café ☕"},
+    {"seq": 12345, "message": "INFO done", "tags": ["a", "b"], "nested": {"x": [1, 2]}},
+    "plain text entry",
+    1234567,
+    {"message": "WARNING quote \" and bracket ] inside"},
+]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TrickleStream(io.RawIOBase):
+    """A response body arriving a few bytes at a time"""
+
+    def __init__(self, body, size=3):
+        self.chunks = chunked(body, size)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def streamed_response(body, content_type):
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response.raw = TrickleStream(body)
+    return response
+
+
+class TestJsonArray(unittest.TestCase):
+    def test_every_chunk_size_decodes_the_same(self):
+        body = json.dumps(ENTRIES, ensure_ascii=False).encode("utf-8")
+        for size in range(1, 40):
+            with self.subTest(size=size):
+                # Chunk boundaries fall inside strings, numbers and multi-byte characters
+                self.assertEqual(list(iter_json_array(chunked(body, size))), ENTRIES)
+
+    def test_items_are_yielded_before_the_body_ends(self):
+        def chunks():
+            yield b'[{"message": "first"}, '
+            raise AssertionError("read past the first entry")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"message": "first"})
+
+    def test_envelope_entries_and_meta(self):
+        body = json.dumps({"logs": ENTRIES[:2], "next_cursor": "abc"}).encode("utf-8")
+        meta = {}
+        self.assertEqual(list(iter_json_array(chunked(body, 7), meta)), ENTRIES[:2])
+        self.assertEqual(meta, {"next_cursor": "abc"})
+
+    def test_empty_and_truncated_arrays(self):
+        self.assertEqual(list(iter_json_array([b" [", b" ]"])), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([b'[{"message": "cut']))
+
+
+class TestNdjson(unittest.TestCase):
+    @unittest.skipUnless(importlib.util.find_spec("requests"), "requests is not installed")
+    def test_lines_split_across_chunks(self):
+        body = "\n".join(json.dumps(entry, ensure_ascii=False) for entry in ENTRIES).encode("utf-8")
+        response = streamed_response(body, "application/x-ndjson; charset=utf-8")
+        self.assertEqual(list(iter_response_entries(response)), ENTRIES)
+
+    def test_plain_text_and_blank_lines(self):
+        lines = [b'{"message": "json"}', b"", b"\x1e" + b'{"message": "json-seq"}', b"not json at all"]
+        self.assertEqual(list(iter_ndjson(lines)), [{"message": "json"}, {"message": "json-seq"}, "not json at all"])
+
+    @unittest.skipUnless(importlib.util.find_spec("requests"), "requests is not installed")
+    def test_json_responses_are_decoded_as_arrays(self):
+        response = streamed_response(json.dumps(ENTRIES).encode("utf-8"), "application/json")
+        self.assertEqual(list(iter_response_entries(response)), ENTRIES)
+
+
+class TestBatched(unittest.TestCase):
+    def test_batches(self):
+        self.assertEqual(list(batched(range(7), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(list(batched([], 3)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import json
 import time
-from log_analyzer import LogAnalyzer
-from notifications import EmailNotifier
+from aiops.analyzer import LogAnalyzer
+from aiops.notifier import EmailNotifier
 import logging
 from datetime import datetime
 
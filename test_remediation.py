@@ -0,0 +1,90 @@
+import threading
+import unittest
+from aiops.remediation import COALESCED, COOLDOWN, EXECUTED, FAILED, OPEN, RemediationCoordinator
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRemediationCoordinator(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.coordinator = RemediationCoordinator(cooldown=300, failure_threshold=3, breaker_seconds=900,
+                                                  clock=self.clock)
+
+    def run_action(self, result=True, app_id="shop", action="restart_service"):
+        def execute():
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return self.coordinator.run(app_id, action, execute)
+
+    def test_cooldown_after_success(self):
+        self.assertEqual(self.run_action(), EXECUTED)
+        self.clock.now = 299
+        self.assertEqual(self.run_action(), COOLDOWN)
+        # Other actions and other apps are not held back
+        self.assertEqual(self.run_action(action="clear_cache"), EXECUTED)
+        self.assertEqual(self.run_action(app_id="blog"), EXECUTED)
+        self.clock.now = 300
+        self.assertEqual(self.run_action(), EXECUTED)
+
+    def test_failures_are_not_cooled_down(self):
+        self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(RuntimeError("boom")), FAILED)
+        self.assertEqual(self.coordinator.stats(), {FAILED: 2})
+
+    def test_breaker_opens_then_lets_one_trial_through(self):
+        for _ in range(3):
+            self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(), OPEN)
+        self.clock.now = 899
+        self.assertEqual(self.run_action(), OPEN)
+        # Half-open: the trial fails and the breaker reopens at once
+        self.clock.now = 900
+        self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(), OPEN)
+        # The next trial succeeds and closes it
+        self.clock.now = 1800
+        self.assertEqual(self.run_action(), EXECUTED)
+        self.clock.now = 2100
+        self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(), EXECUTED)
+
+    def test_success_resets_the_failure_count(self):
+        self.run_action(False)
+        self.run_action(False)
+        self.assertEqual(self.run_action(), EXECUTED)
+        self.clock.now = 300
+        self.run_action(False)
+        self.run_action(False)
+        self.assertEqual(self.run_action(False), FAILED)
+        self.assertEqual(self.run_action(), OPEN)
+
+    def test_concurrent_requests_coalesce(self):
+        started, release = threading.Event(), threading.Event()
+
+        def execute():
+            started.set()
+            release.wait(5)
+            return True
+
+        thread = threading.Thread(target=self.coordinator.run, args=("shop", "restart_service", execute))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        self.assertEqual(self.run_action(), COALESCED)
+        self.assertEqual(self.run_action(), COALESCED)
+        release.set()
+        thread.join(5)
+        self.assertEqual(self.coordinator.stats(), {EXECUTED: 1, COALESCED: 2})
+        self.assertEqual(self.run_action(), COOLDOWN)
+
+
+if __name__ == '__main__':
+    unittest.main()
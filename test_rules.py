@@ -0,0 +1,63 @@
+import unittest
+from aiops.anomaly import ALL_LINES
+from aiops.rules import MAX_DISPATCH_KEYS, RuleEngine, resolution_steps
+
+
+class TestRuleEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+
+    def rule(self, *args, **kwargs):
+        decision = self.engine.evaluate(*args, **kwargs)
+        return decision["rule"] if decision else None
+
+    def test_first_matching_rule_wins(self):
+        # Both database rules apply, the more specific one is listed first
+        self.assertEqual(self.rule("ERROR", "Database connection failed: <*>", "Database"), "database_connection")
+        self.assertEqual(self.rule("ERROR", "deadlock detected", "Database"), "database_error")
+        self.assertEqual(self.rule("CRITICAL", "something else", "Network"), "unknown_error")
+
+    def test_templates_match_case_insensitively(self):
+        self.assertEqual(self.rule("ERROR", "MEMORY ALLOCATION FAILED in worker <*>"), "memory_error")
+
+    def test_level_and_category_must_match(self):
+        self.assertIsNone(self.rule("INFO", "Database connection failed", "Database"))
+        self.assertEqual(self.rule("WARNING", "disk at <*>%", "Resources"), "resource_pressure")
+        self.assertEqual(self.rule("WARNING", "disk at <*>%", "Network"), "warning")
+
+    def test_rate_rules_only_see_anomalies(self):
+        self.assertEqual(self.rule(template=ALL_LINES, rate="drop"), "app_silent")
+        self.assertEqual(self.rule(template="db timeout", rate="spike"), "log_storm")
+        self.assertIsNone(self.rule(template="db timeout", rate="drop"))
+        # Log lines never trigger rate rules
+        self.assertNotIn(self.rule("ERROR", ALL_LINES), ("app_silent", "log_storm"))
+
+    def test_decisions(self):
+        decision = self.engine.evaluate("ERROR", "Database connection failed", "Database")
+        self.assertEqual(decision["actions"], ("restart_database_service", "verify_connection", "clear_connection_pool"))
+        self.assertTrue(decision["auto_resolve"])
+        self.assertEqual(decision["severity"], "HIGH")
+        self.assertFalse(self.engine.evaluate("WARNING", "disk", "Resources")["auto_resolve"])
+        self.assertEqual(resolution_steps(["clear_cache"]),
+                         [{"action": "clear_cache", "description": "Clear system cache to free up memory",
+                           "priority": "MEDIUM"}])
+
+    def test_custom_rules_are_validated(self):
+        with self.assertRaises(ValueError):
+            RuleEngine([{"name": "typo", "when": {"levle": ["ERROR"]}, "actions": []}])
+        with self.assertRaises(ValueError):
+            RuleEngine([{"name": "unknown", "when": {}, "actions": ["reboot_the_world"]}])
+        engine = RuleEngine([{"name": "regex chars", "when": {"template": ["a+b (c)"]}, "actions": ["clear_cache"]}])
+        # Template conditions are substrings, not regular expressions
+        self.assertEqual(engine.evaluate("ERROR", "x a+b (c) y")["rule"], "regex chars")
+        self.assertIsNone(engine.evaluate("ERROR", "aab c"))
+
+    def test_dispatch_table_is_bounded(self):
+        for i in range(MAX_DISPATCH_KEYS + 10):
+            self.engine.evaluate("ERROR", "x", f"category {i}")
+        self.assertLessEqual(len(self.engine._dispatch), MAX_DISPATCH_KEYS)
+        self.assertEqual(self.rule("ERROR", "deadlock", "Database"), "database_error")
+
+
+if __name__ == '__main__':
+    unittest.main()
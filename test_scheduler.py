@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from aiops.scheduler import AppScheduler
+
+
+class RecordingJob:
+    def __init__(self, runs=1):
+        self.runs = []
+        self.done = threading.Event()
+        self.expected = runs
+
+    def __call__(self, app):
+        self.runs.append(app["App ID"])
+        if len(self.runs) >= self.expected:
+            self.done.set()
+
+
+class TestAppScheduler(unittest.TestCase):
+    def run_scheduler(self, scheduler, job, timeout=5):
+        thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+        thread.start()
+        self.assertTrue(job.done.wait(timeout))
+        scheduler.stop()
+        thread.join(timeout)
+
+    def test_apps_run_in_due_order(self):
+        job = RecordingJob(runs=6)
+        scheduler = AppScheduler(job, jitter=0)
+        # First runs are due one whole interval after being added
+        with mock.patch("aiops.scheduler.random.uniform", lambda low, high: high):
+            for app_id, interval in (("slow", 0.3), ("fast", 0.1), ("medium", 0.2)):
+                self.assertTrue(scheduler.add_app(app_id, {"App ID": app_id}, interval))
+        self.run_scheduler(scheduler, job)
+        self.assertEqual(list(dict.fromkeys(job.runs)), ["fast", "medium", "slow"])
+
+    def test_first_runs_are_spread_over_one_interval(self):
+        scheduler = AppScheduler(RecordingJob())
+        start = time.monotonic()
+        for i in range(200):
+            scheduler.add_app(f"app-{i}", {"App ID": f"app-{i}"}, 10)
+        dues = sorted(due for due, _, _ in scheduler._heap)
+        self.assertGreaterEqual(dues[0], start)
+        self.assertLessEqual(dues[-1], time.monotonic() + 10)
+        # Not all on one tick
+        self.assertGreater(dues[-1] - dues[0], 5)
+
+    def test_reschedule_stays_within_the_jitter(self):
+        scheduler = AppScheduler(RecordingJob(), jitter=0.1)
+        scheduler.add_app("shop", {"App ID": "shop"}, 60)
+        entry = scheduler._entries["shop"]
+        for _ in range(100):
+            scheduler._heap.clear()
+            due = time.monotonic()
+            scheduler._reschedule("shop", entry, due)
+            (next_due, _, _), = scheduler._heap
+            self.assertGreaterEqual(next_due, due + 60 - 6)
+            self.assertLessEqual(next_due, due + 60 + 6)
+
+    def test_duplicate_ids_are_refused_unless_replacing(self):
+        scheduler = AppScheduler(RecordingJob())
+        self.assertTrue(scheduler.add_app("shop", {"App ID": "shop", "v": 1}, 60))
+        self.assertFalse(scheduler.add_app("shop", {"App ID": "shop", "v": 2}, 60))
+        self.assertEqual(scheduler.apps(), [{"App ID": "shop", "v": 1}])
+        self.assertTrue(scheduler.add_app("shop", {"App ID": "shop", "v": 3}, 60, replace=True))
+        self.assertEqual(scheduler.apps(), [{"App ID": "shop", "v": 3}])
+        self.assertEqual(len(scheduler), 1)
+
+    def test_removed_app_does_not_run(self):
+        job = RecordingJob(runs=3)
+        scheduler = AppScheduler(job, jitter=0)
+        scheduler.add_app("kept", {"App ID": "kept"}, 0.05)
+        scheduler.add_app("removed", {"App ID": "removed"}, 0.05)
+        scheduler.remove_app("removed")
+        self.assertEqual(len(scheduler), 1)
+        self.run_scheduler(scheduler, job)
+        self.assertEqual(set(job.runs), {"kept"})
+
+    def test_removing_a_running_app_leaves_no_stale_entry(self):
+        def job(app):
+            # The app has no heap entry while its job runs
+            scheduler.remove_app(app["App ID"])
+            finished.set()
+
+        finished = threading.Event()
+        scheduler = AppScheduler(job, jitter=0)
+        scheduler.add_app("shop", {"App ID": "shop"}, 0.01)
+        for i in range(3):
+            scheduler.add_app(f"idle-{i}", {"App ID": f"idle-{i}"}, 3600)
+        thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+        thread.start()
+        self.assertTrue(finished.wait(5))
+        scheduler.stop()
+        thread.join(5)
+        self.assertEqual(scheduler._stale, 0)
+        self.assertEqual(sorted(app_id for _, _, app_id in scheduler._heap), ["idle-0", "idle-1", "idle-2"])
+
+    def test_stale_entries_are_compacted(self):
+        scheduler = AppScheduler(RecordingJob())
+        for i in range(10):
+            scheduler.add_app(f"app-{i}", {"App ID": f"app-{i}"}, 60)
+        for i in range(8):
+            scheduler.remove_app(f"app-{i}")
+        # Stale entries never outnumber the live apps
+        self.assertLessEqual(scheduler._stale, len(scheduler))
+        self.assertEqual(len(scheduler._heap), len(scheduler) + scheduler._stale)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from aiops.segments import follow, live_path, rotated_segments
+
+
+class TestFollow(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "app.log")
+
+    def write(self, text, path=None, mode='a'):
+        with open(path or self.path, mode) as f:
+            f.write(text)
+
+    def rotate(self):
+        """Rotate as logrotate does with delaycompress: .1 is compressed to .2.gz, the live file becomes .1"""
+        rotated = f"{self.path}.1"
+        if os.path.exists(rotated):
+            with open(rotated, 'rb') as src, gzip.open(f"{self.path}.2.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        os.rename(self.path, rotated)
+
+    def read(self, cursor=None):
+        lines = []
+        for batch, cursor in follow(self.path, cursor):
+            lines.extend(batch)
+        return lines, cursor
+
+    def test_follows_rotation_through_plain_and_compressed_segments(self):
+        self.write("line 1\nline 2\n")
+        lines, cursor = self.read()
+        self.assertEqual(lines, ["line 1", "line 2"])
+
+        self.write("line 3\n")
+        self.rotate()
+        self.write("line 4\n")
+        self.rotate()
+        self.write("line 5\nline 6 still being writ")
+        self.assertEqual(rotated_segments(self.path), [f"{self.path}.2.gz", f"{self.path}.1"])
+
+        lines, cursor = self.read(cursor)
+        self.assertEqual(lines, ["line 3", "line 4", "line 5"])
+        self.write("ten\n")
+        lines, cursor = self.read(cursor)
+        self.assertEqual(lines, ["line 6 still being written"])
+        self.assertEqual(self.read(cursor)[0], [])
+
+    def test_copytruncate_is_not_read_twice(self):
+        self.write("line 1\nline 2\n")
+        _, cursor = self.read()
+        shutil.copy(self.path, f"{self.path}.1")
+        self.write("line 3\n", mode='w')
+        self.assertEqual(self.read(cursor)[0], ["line 3"])
+
+    def test_segment_gone_reads_everything_left(self):
+        self.write("line 1\n")
+        _, cursor = self.read()
+        self.rotate()
+        self.write("line 2\n")
+        self.rotate()
+        self.write("line 3\n")
+        os.remove(f"{self.path}.2.gz")
+        self.assertEqual(self.read(cursor)[0], ["line 2", "line 3"])
+
+    def test_plain_copy_is_used_while_compressing(self):
+        self.write("old\n", f"{self.path}.1", mode='w')
+        with gzip.open(f"{self.path}.1.gz", 'wb') as f:
+            f.write(b"old\n")
+        self.write("new\n")
+        self.assertEqual(rotated_segments(self.path), [f"{self.path}.1"])
+
+    def test_segment_order_and_live_path(self):
+        for name in ("app.log-20240102.gz", "app.log-20240101", "app.log.3.gz", "app.log.1", "app.log.10.gz",
+                     "app.log.bak", "other.log.1"):
+            self.write("x\n", os.path.join(self.directory, name))
+        names = [os.path.basename(path) for path in rotated_segments(self.path)]
+        self.assertEqual(names, ["app.log-20240101", "app.log-20240102.gz", "app.log.10.gz", "app.log.3.gz", "app.log.1"])
+        for name in names:
+            self.assertEqual(live_path(os.path.join(self.directory, name)), self.path)
+        self.assertEqual(live_path(self.path), self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import queue
+import tempfile
+import unittest
+from collections import Counter
+from aiops.sharding import ShardCoordinator, shard_for
+from aiops.sketches import TemplateSketches
+
+APP_IDS = [f"app-{i}" for i in range(2000)]
+
+
+class TestShardFor(unittest.TestCase):
+    def test_assignment_is_stable_and_balanced(self):
+        shards = Counter(shard_for(app_id, 4) for app_id in APP_IDS)
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertLess(max(shards.values()) - min(shards.values()), len(APP_IDS) // 10)
+        self.assertEqual([shard_for(app_id, 4) for app_id in APP_IDS[:50]],
+                         [shard_for(app_id, 4) for app_id in APP_IDS[:50]])
+
+    def test_adding_a_shard_moves_only_its_share(self):
+        moved = [app_id for app_id in APP_IDS if shard_for(app_id, 4) != shard_for(app_id, 5)]
+        # Only apps landing on the new shard move
+        self.assertEqual({shard_for(app_id, 5) for app_id in moved}, {4})
+        self.assertLess(len(moved), len(APP_IDS) * 0.3)
+
+
+class TestShardCoordinator(unittest.TestCase):
+    """The coordinator's bookkeeping, with queues standing in for the worker processes"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.registry = os.path.join(directory.name, "registered_apps.json")
+        self.coordinator = ShardCoordinator(shard_count=3, registry_path=self.registry)
+        self.coordinator.results = queue.Queue()
+        self.coordinator.shards = {index: {"process": None, "commands": queue.Queue()} for index in range(3)}
+
+    def register(self, *apps):
+        with open(self.registry, 'w') as f:
+            json.dump(list(apps), f)
+        self.coordinator.sync_registry(force=True)
+
+    def commands(self):
+        sent = {}
+        for index, shard in self.coordinator.shards.items():
+            sent[index] = []
+            while not shard["commands"].empty():
+                sent[index].append(shard["commands"].get())
+        return sent
+
+    def test_registry_changes_are_sent_to_the_owning_shard(self):
+        shop = {"App ID": "shop", "App Name": "Shop"}
+        blog = {"App ID": "blog", "App Name": "Blog"}
+        pushed = {"App ID": "pushed", "App Name": "Pushed", "Monitoring": {"Log Source": "Push API"}}
+        self.register(shop, blog, pushed)
+        sent = self.commands()
+        self.assertEqual(sent[shard_for("shop", 3)].count(("add", "shop", shop)), 1)
+        self.assertEqual(sent[shard_for("blog", 3)].count(("add", "blog", blog)), 1)
+        # Push apps are not polled by any shard
+        self.assertNotIn("pushed", self.coordinator.assignments)
+
+        changed = dict(shop, Environment="Production")
+        self.register(changed)
+        sent = self.commands()
+        self.assertIn(("add", "shop", changed), sent[shard_for("shop", 3)])
+        self.assertIn(("remove", "blog"), sent[shard_for("blog", 3)])
+        self.assertEqual(set(self.coordinator.assignments), {"shop"})
+
+    def test_reports_are_merged(self):
+        for index in range(2):
+            sketches = TemplateSketches()
+            sketches.add("shop", "GET <*> 200", 1000, sources=[f"10.0.0.{index}"], count=5)
+            self.coordinator.results.put((index, {"logs_analyzed": 5}, sketches))
+        self.coordinator.collect_metrics()
+        self.assertEqual(self.coordinator.metrics, {"logs_analyzed": 10})
+        self.assertEqual(self.coordinator.shard_metrics[1], {"logs_analyzed": 5})
+        self.assertEqual(self.coordinator.sketches.top_templates("shop"), [("GET <*> 200", 10)])
+        self.assertEqual(self.coordinator.sketches.distinct_sources("shop"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import importlib.util
+import unittest
+from aiops.config import SIMILARITY_THRESHOLD
+from aiops.similarity import SimilarAnalysisIndex
+
+# The same issue logged with different values or wording details, whose analysis may be reused
+SAME_ISSUE = [
+    ("ERROR Connection refused by postgres at 10.0.0.1:5432", "ERROR Connection refused by postgres at 10.0.0.7:5433"),
+    ("ERROR Database connection failed: timeout after 30s", "ERROR Database connection failed: timeout after 5000ms"),
+    ("ERROR OutOfMemoryError: Java heap space in worker-3", "ERROR OutOfMemoryError: Java heap space in worker-12"),
+    ("ERROR Payment service timeout for order 1234", "ERROR Payment service timed out for order 99"),
+    ("WARNING Disk usage at 91% on /var", "WARNING Disk usage at 97% on /data"),
+    ("ERROR Failed to connect to redis: connection refused", "ERROR Failed to connect to redis cache: connection refused"),
+]
+# Lines that read alike but mean something else, whose analyses must not be shared
+DIFFERENT_ISSUE = [
+    ("ERROR Database connection failed", "ERROR Database connection established"),
+    ("ERROR Payment service timeout", "ERROR Payment service completed"),
+    ("ERROR Connection refused by postgres", "ERROR Connection refused by redis"),
+    ("ERROR User login failed", "ERROR User logout failed"),
+    ("ERROR Failed to connect to redis: connection refused", "ERROR Failed to connect to redis: authentication failed"),
+]
+
+
+@unittest.skipUnless(importlib.util.find_spec("sklearn"), "scikit-learn is not installed")
+class TestSimilarityThreshold(unittest.TestCase):
+    def reused(self, first, second, category="Database"):
+        index = SimilarAnalysisIndex()
+        index.add(index.embed(first), "analysis", index.partition(first, category))
+        return index.lookup(index.embed(second), index.partition(second, category)) is not None
+
+    def test_same_issue_is_reused(self):
+        for first, second in SAME_ISSUE:
+            with self.subTest(first=first, second=second):
+                self.assertTrue(self.reused(first, second))
+
+    def test_different_issue_is_not_reused(self):
+        for first, second in DIFFERENT_ISSUE:
+            with self.subTest(first=first, second=second):
+                self.assertFalse(self.reused(first, second))
+
+    def test_other_level_is_not_reused(self):
+        self.assertFalse(self.reused("ERROR Database connection failed", "INFO Database connection failed"))
+
+    def test_other_category_is_not_reused(self):
+        index = SimilarAnalysisIndex()
+        line = "ERROR Connection refused by postgres"
+        index.add(index.embed(line), "analysis", index.partition(line, "Database"))
+        self.assertIsNone(index.lookup(index.embed(line), index.partition(line, "Network")))
+
+    def test_threshold_separates_pairs(self):
+        index = SimilarAnalysisIndex()
+        score = lambda first, second: float(index.embed(first) @ index.embed(second))
+        lowest_same = min(score(*pair) for pair in SAME_ISSUE)
+        highest_different = max(score(*pair) for pair in DIFFERENT_ISSUE)
+        self.assertLess(highest_different, SIMILARITY_THRESHOLD)
+        self.assertGreaterEqual(lowest_same, SIMILARITY_THRESHOLD)
+
+
+if __name__ == '__main__':
+    unittest.main()
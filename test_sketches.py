@@ -0,0 +1,110 @@
+import math
+import pickle
+import random
+import unittest
+from collections import Counter
+from aiops.sketches import CountMinSketch, HyperLogLog, TemplateSketches
+
+
+def skewed_stream(seed, length=20000, keys=3000):
+    rng = random.Random(seed)
+    names = [f"template {i}" for i in range(keys)]
+    weights = [1 / (i + 1) ** 1.1 for i in range(keys)]
+    return rng.choices(names, weights, k=length)
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_never_undercounts(self):
+        stream = skewed_stream(1)
+        sketch = CountMinSketch(width=256, depth=4)
+        for key in stream:
+            sketch.add(key)
+        for key, count in Counter(stream).items():
+            self.assertGreaterEqual(sketch.estimate(key), count)
+        # Overcounts stay within e / width of the total for nearly every key
+        bound = math.e / sketch.width * len(stream)
+        over = [sketch.estimate(key) - count for key, count in Counter(stream).items()]
+        self.assertLess(sum(error > bound for error in over) / len(over), 0.05)
+
+    def test_merge_equals_the_combined_stream(self):
+        first, second = skewed_stream(2), skewed_stream(3)
+        left, right, combined = CountMinSketch(), CountMinSketch(), CountMinSketch()
+        for key in first:
+            left.add(key)
+            combined.add(key)
+        for key in second:
+            right.add(key, 2)
+            combined.add(key, 2)
+        left.merge(right)
+        self.assertEqual(left.table, combined.table)
+
+    def test_shapes_must_match(self):
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=128))
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_count_is_within_the_error_bound(self):
+        for distinct in (10, 1000, 50000):
+            with self.subTest(distinct=distinct):
+                sketch = HyperLogLog(precision=10)
+                for i in range(distinct):
+                    sketch.add(f"10.0.{i // 256}.{i % 256}")
+                    sketch.add(f"10.0.{i // 256}.{i % 256}")  # repeats are not counted again
+                error = 1.04 / math.sqrt(1 << 10)
+                self.assertLessEqual(abs(sketch.count() - distinct), max(1, 3 * error * distinct))
+
+    def test_merge_matches_the_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for i in range(20000):
+            left.add(f"req-{i}")
+            union.add(f"req-{i}")
+        for i in range(10000, 40000):
+            right.add(f"req-{i}")
+            union.add(f"req-{i}")
+        left.merge(right)
+        self.assertEqual(left.registers, union.registers)
+        self.assertEqual(left.count(), union.count())
+
+
+class TestTemplateSketches(unittest.TestCase):
+    def test_top_templates_per_app_and_window(self):
+        sketches = TemplateSketches(bucket_seconds=60, buckets_kept=5)
+        stream = skewed_stream(4, length=5000, keys=200)
+        for i, key in enumerate(stream):
+            sketches.add("shop", key, 1000 + i % 120, sources=[f"ip-{i % 50}"])
+        sketches.add("blog", "other template", 1000)
+        true = Counter(stream)
+        top = sketches.top_templates("shop", 3)
+        self.assertEqual([name for name, _ in top], [name for name, _ in true.most_common(3)])
+        for name, count in top:
+            self.assertGreaterEqual(count, true[name])
+        self.assertEqual(sketches.total("shop"), 5000)
+        self.assertAlmostEqual(sketches.distinct_sources("shop"), 50, delta=3)
+        self.assertEqual(sketches.top_templates("blog"), [("other template", 1)])
+        self.assertEqual(sketches.top_templates("shop", start=2000), [])
+
+    def test_drained_shards_merge_into_the_whole(self):
+        shards = [TemplateSketches(), TemplateSketches()]
+        whole = TemplateSketches()
+        for i, key in enumerate(skewed_stream(5, length=4000, keys=100)):
+            shards[i % 2].add("shop", key, 1000, sources=[f"ip-{i % 300}"])
+            whole.add("shop", key, 1000, sources=[f"ip-{i % 300}"])
+        coordinator = TemplateSketches()
+        for shard in shards:
+            # Shipped to the coordinator as the shard processes do
+            coordinator.merge(pickle.loads(pickle.dumps(shard.drain())))
+            self.assertEqual(shard.apps(), [])
+        self.assertEqual(coordinator.top_templates("shop", 5), whole.top_templates("shop", 5))
+        self.assertEqual(coordinator.distinct_sources("shop"), whole.distinct_sources("shop"))
+
+    def test_old_buckets_are_evicted(self):
+        sketches = TemplateSketches(bucket_seconds=60, buckets_kept=2)
+        for minute in range(3):
+            sketches.add("shop", "template", minute * 60)
+        self.assertEqual(sketches.total("shop"), 2)
+        self.assertEqual(sketches.estimate("shop", "template", start=0, end=59), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import random
+import unittest
+from collections import Counter
+from datetime import date, datetime, timedelta
+from aiops.sketches import TemplateSketches
+from aiops.summary import IssueRollups, SpaceSaving, SummaryJob
+
+
+def skewed_stream(seed, length=50000, keys=2000):
+    rng = random.Random(seed)
+    names = [f"template {i}" for i in range(keys)]
+    weights = [1 / (i + 1) ** 1.2 for i in range(keys)]
+    return rng.choices(names, weights, k=length)
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def send_summary(self, app, summary_data):
+        self.sent.append((app["App ID"], summary_data))
+        return True
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_top_returns_heavy_hitters_with_bounded_error(self):
+        stream = skewed_stream(1)
+        summary = SpaceSaving(50)
+        for key in stream:
+            summary.add(key)
+        true = Counter(stream)
+        self.assertEqual([key for key, _, _ in summary.top(5)], [key for key, _ in true.most_common(5)])
+        for key, count, error in summary.top():
+            self.assertGreaterEqual(count, true[key])
+            self.assertLessEqual(count - error, true[key])
+
+    def test_weighted_adds(self):
+        summary = SpaceSaving(2)
+        summary.add("a", 10)
+        summary.add("b", 3)
+        summary.add("c", 1)
+        # "c" takes over the smallest counter, "b", and inherits its count as error
+        self.assertEqual(summary.top(), [("a", 10, 0), ("c", 4, 3)])
+
+    def test_merge_returns_heavy_hitters_of_both_streams(self):
+        first, second = skewed_stream(2), skewed_stream(3)
+        left, right = SpaceSaving(50), SpaceSaving(50)
+        for key in first:
+            left.add(key)
+        for key in second:
+            right.add(key)
+        left.merge(right)
+        true = Counter(first + second)
+        self.assertEqual([key for key, _, _ in left.top(5)], [key for key, _ in true.most_common(5)])
+        for key, count, error in left.top():
+            self.assertGreaterEqual(count, true[key])
+            self.assertLessEqual(count - error, true[key])
+        # Still usable after merging
+        left.add("new template")
+        self.assertEqual(len(left.counters), 50)
+
+
+class TestSummaryJob(unittest.TestCase):
+    def setUp(self):
+        self.rollups = IssueRollups()
+        self.notifier = RecordingNotifier()
+        self.job = SummaryJob(self.rollups, self.notifier, reports="daily,weekly")
+        self.app = {"App ID": "shop", "App Name": "Shop"}
+
+    def record(self, day, issue, count):
+        timestamp = datetime.combine(day, datetime.min.time()).timestamp() + 3600
+        self.rollups.record("shop", timestamp, "HIGH", issue, count)
+
+    def test_nothing_is_sent_for_the_period_running_at_start(self):
+        tuesday = date(2026, 10, 13)
+        self.record(tuesday, "disk full", 3)
+        self.assertEqual(self.job.send_due("shop", self.app, tuesday), 0)
+        self.assertEqual(self.job.send_due("shop", self.app, tuesday), 0)
+        self.assertEqual(self.notifier.sent, [])
+
+    def test_daily_summary_is_sent_once_when_the_day_ends(self):
+        tuesday = date(2026, 10, 13)
+        self.job.send_due("shop", self.app, tuesday)
+        self.record(tuesday, "disk full", 3)
+        self.assertEqual(self.job.send_due("shop", self.app, tuesday + timedelta(days=1)), 1)
+        self.assertEqual(self.job.send_due("shop", self.app, tuesday + timedelta(days=1)), 0)
+        (app_id, summary_data), = self.notifier.sent
+        self.assertEqual(app_id, "shop")
+        self.assertEqual(summary_data["period"], "Daily 2026-10-13")
+        self.assertEqual(summary_data["total_logs"], 3)
+        self.assertEqual(summary_data["top_issues"], ["disk full (3 occurrences)"])
+
+    def test_weekly_summary_merges_the_week(self):
+        sunday = date(2026, 10, 18)
+        self.job.send_due("shop", self.app, sunday)
+        for offset in range(7):
+            self.record(sunday - timedelta(days=offset), "disk full", 1)
+        self.assertEqual(self.job.send_due("shop", self.app, sunday + timedelta(days=1)), 2)
+        weekly = [data for _, data in self.notifier.sent if data["period"].startswith("Weekly")]
+        self.assertEqual(len(weekly), 1)
+        self.assertEqual(weekly[0]["period"], "Weekly 2026-10-12 to 2026-10-18")
+        self.assertEqual(weekly[0]["total_logs"], 7)
+
+    def test_issues_are_escaped(self):
+        tuesday = date(2026, 10, 13)
+        self.job.send_due("shop", self.app, tuesday)
+        self.record(tuesday, "bad <script> value", 1)
+        self.job.send_due("shop", self.app, tuesday + timedelta(days=1))
+        self.assertEqual(self.notifier.sent[0][1]["top_issues"], ["bad &lt;script&gt; value (1 occurrences)"])
+
+    def test_daily_summary_lists_sketched_templates(self):
+        sketches = TemplateSketches()
+        job = SummaryJob(self.rollups, self.notifier, reports="daily,weekly", sketches=sketches)
+        tuesday = date(2026, 10, 13)
+        job.send_due("shop", self.app, tuesday)
+        noon = datetime.combine(tuesday, datetime.min.time()).timestamp() + 12 * 3600
+        sketches.add("shop", "GET <*> 200", noon, sources=["10.0.0.1", "10.0.0.2"], count=40)
+        sketches.add("shop", "<b>slow</b> query", noon, sources=["10.0.0.1"])
+        sketches.add("shop", "GET <*> 200", noon + 86400, count=5)  # the next day
+        job.send_due("shop", self.app, tuesday + timedelta(days=1))
+        (_, summary_data), = self.notifier.sent
+        self.assertEqual(summary_data["top_templates"],
+                         ["GET &lt;*&gt; 200 (~40 lines)", "&lt;b&gt;slow&lt;/b&gt; query (~1 lines)"])
+        self.assertEqual(summary_data["distinct_sources"], 2)
+
+    def test_weekly_summary_has_no_sketched_templates(self):
+        # The sketches keep about a day of buckets, too few for a week
+        job = SummaryJob(self.rollups, self.notifier, reports="weekly", sketches=TemplateSketches())
+        sunday = date(2026, 10, 18)
+        job.send_due("shop", self.app, sunday)
+        job.send_due("shop", self.app, sunday + timedelta(days=1))
+        (_, summary_data), = self.notifier.sent
+        self.assertNotIn("top_templates", summary_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
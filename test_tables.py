@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+from aiops.config import TABLES_DIR
+from aiops.tables import TABLE_FILES, TableStore
+
+
+class TestTableStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, filename, table):
+        path = os.path.join(self.directory.name, filename)
+        with open(path, 'w') as f:
+            json.dump(table, f)
+        # Make sure the change is seen even within the file system's timestamp resolution
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_committed_tables_are_loaded(self):
+        store = TableStore(TABLES_DIR)
+        for name, (filename, _) in TABLE_FILES.items():
+            with open(os.path.join(TABLES_DIR, filename), 'r') as f:
+                self.assertEqual(getattr(store.current, name), json.load(f))
+
+    def test_missing_files_fall_back_without_writing(self):
+        store = TableStore(self.directory.name)
+        self.assertEqual(os.listdir(self.directory.name), [])
+        for name, (_, default) in TABLE_FILES.items():
+            self.assertEqual(getattr(store.current, name), default)
+
+    def test_changed_file_is_reloaded_and_broken_file_is_ignored(self):
+        store = TableStore(self.directory.name)
+        version = store.current.version
+        patterns = {"disk": {"category": "System", "severity": "HIGH", "automated_actions": []}}
+        self.write("error_patterns.json", patterns)
+        self.assertTrue(store.reload())
+        self.assertEqual(store.current.error_patterns, patterns)
+        self.write("error_patterns.json", {"disk": {"category": "System"}})
+        self.assertFalse(store.reload())
+        self.assertEqual(store.current.version, version + 1)
+        self.assertEqual(store.current.error_patterns, patterns)
+
+
+if __name__ == '__main__':
+    unittest.main()